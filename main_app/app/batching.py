@@ -0,0 +1,283 @@
+"""Модуль пакетной обработки сообщений (micro-batching).
+
+MicroBatcher собирает элементы, поступающие из параллельно выполняющихся
+обработчиков, в пакеты: пакет отправляется на обработку, когда набрано
+max_size элементов или прошло max_delay секунд с момента поступления первого
+элемента. Каждый вызов submit получает результат своего элемента.
+
+process_in_transaction обрабатывает пакет в одной транзакции БД: каждый
+элемент выполняется в собственной сессии, присоединенной к транзакции пакета
+через SAVEPOINT (join_transaction_mode="create_savepoint"). Поэтому
+session.commit() внутри сервисов фиксирует только точку сохранения, отказ
+одного элемента (ValueError) откатывает только его изменения, а данные всего
+пакета фиксируются одним COMMIT.
+
+CircuitBreaker приостанавливает обработку при серии ошибок пакетов (например,
+при недоступности БД): пока он разомкнут, обработчики ждут, занимая слоты
+prefetch, и брокер перестает доставлять новые сообщения вместо того, чтобы
+они отклонялись одно за другим.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy.exc import DataError, IntegrityError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Ошибки одного элемента пакета: повторная обработка дала бы тот же результат
+REJECTIONS = (ValueError, IntegrityError, DataError, ProgrammingError)
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Группировка элементов в пакеты по размеру или времени ожидания.
+
+    Пакеты обрабатываются независимо: следующий пакет собирается, пока
+    предыдущий еще обрабатывается. Количество одновременно ожидающих
+    элементов ограничивается вызывающим кодом (prefetch RabbitMQ).
+    """
+
+    def __init__(
+        self,
+        process: Callable[[list[T]], Awaitable[list[R]]],
+        max_size: int,
+        max_delay: float,
+    ):
+        """
+        Инициализация.
+
+        Args:
+            process: Обработчик пакета; возвращает результаты в порядке элементов
+            max_size: Максимальный размер пакета
+            max_delay: Максимальное ожидание заполнения пакета (в секундах)
+        """
+        self.process = process
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        """
+        Добавить элемент в пакет и дождаться результата его обработки.
+
+        Args:
+            item: Элемент
+
+        Returns:
+            Результат обработки элемента
+
+        Raises:
+            Exception: Ошибка обработки всего пакета
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    async def close(self) -> None:
+        """Отправить на обработку накопленные элементы и дождаться всех пакетов."""
+        self._flush()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _flush(self) -> None:
+        """Отправить накопленные элементы на обработку отдельной задачей."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        """
+        Обработать пакет и передать результаты ожидающим вызовам submit.
+
+        Args:
+            batch: Элементы пакета и их futures
+        """
+        try:
+            results = await self.process([item for item, _ in batch])
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Ошибка любого типа передается ожидающим submit, иначе они не завершатся
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class CircuitBreaker:
+    """
+    Размыкатель цепи для защиты недоступного ресурса от нагрузки.
+
+    После failure_threshold ошибок подряд цепь размыкается на reset_timeout
+    секунд. Затем пропускается один пробный вызов: успех замыкает цепь,
+    ошибка снова размыкает ее.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        Инициализация.
+
+        Args:
+            failure_threshold: Количество ошибок подряд для размыкания цепи
+            reset_timeout: Время до пробного вызова (в секундах)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._changed = asyncio.Event()
+
+    @property
+    def is_open(self) -> bool:
+        """Цепь разомкнута (вызовы ожидают в wait)."""
+        return self._opened_at is not None
+
+    async def wait(self) -> None:
+        """Дождаться замыкания цепи или права на пробный вызов."""
+        while self._opened_at is not None:
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining <= 0 and not self._probing:
+                self._probing = True
+                return
+            changed = self._changed
+            try:
+                await asyncio.wait_for(
+                    changed.wait(), remaining if remaining > 0 else None
+                )
+            except TimeoutError:
+                pass
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[R]],
+        *args: Any,
+        is_failure: Callable[[BaseException], bool] = lambda error: True,
+    ) -> R:
+        """
+        Выполнить вызов и зафиксировать его исход один раз.
+
+        Пакет учитывается одним вызовом, сколько бы сообщений ни ожидали его
+        результата.
+
+        Args:
+            func: Вызываемая корутина (например, обработка пакета)
+            *args: Аргументы вызова
+            is_failure: Считается ли ошибка сбоем ресурса; прочие ошибки
+                пробрасываются без учета
+
+        Returns:
+            Результат вызова
+        """
+        try:
+            result = await func(*args)
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def record_success(self) -> None:
+        """Зафиксировать успешный вызов: цепь замыкается."""
+        if self._opened_at is not None:
+            logger.info("Circuit breaker closed")
+        self._failures = 0
+        self._opened_at = None
+        self._notify()
+
+    def record_failure(self) -> None:
+        """Зафиксировать ошибку: при достижении порога цепь размыкается."""
+        self._failures += 1
+        if self._failures < self.failure_threshold:
+            return
+        if self._opened_at is None:
+            logger.warning(
+                "Circuit breaker opened for %s s after %s failures",
+                self.reset_timeout,
+                self._failures,
+            )
+        self._opened_at = time.monotonic()
+        self._notify()
+
+    def _notify(self) -> None:
+        """Разбудить ожидающие вызовы после изменения состояния."""
+        self._probing = False
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+async def process_in_transaction(
+    engine: AsyncEngine,
+    handler: Callable[[AsyncSession, Any], Awaitable[Any]],
+    items: list[Any],
+) -> list[Any]:
+    """
+    Обработать пакет элементов в одной транзакции БД.
+
+    Каждый элемент выполняется в своей точке сохранения. Отказ элемента
+    (ValueError, нарушение ограничения БД или ошибка в данных и запросе
+    элемента - DataError, ProgrammingError) откатывает только его изменения
+    и возвращается в результатах; остальные ошибки прерывают обработку, и
+    транзакция пакета откатывается целиком.
+
+    Args:
+        engine: Движок базы данных
+        handler: Обработчик одного элемента (session, item)
+        items: Элементы пакета
+
+    Returns:
+        list[Any]: Для каждого элемента результат обработчика или ошибка
+            отказа (экземпляр Exception)
+
+    Raises:
+        Exception: Ошибка, прервавшая обработку пакета (транзакция откатывается)
+    """
+    results: list[Any] = []
+    async with engine.connect() as connection:
+        async with connection.begin() as transaction:
+            for item in items:
+                async with AsyncSession(
+                    bind=connection,
+                    join_transaction_mode="create_savepoint",
+                    expire_on_commit=False,
+                ) as session:
+                    try:
+                        result = await handler(session, item)
+                        await session.commit()
+                        results.append(result)
+                    except REJECTIONS as e:
+                        await session.rollback()
+                        results.append(e)
+            await transaction.commit()
+
+    logger.debug(
+        "Пакет обработан: size=%s, rejected=%s",
+        len(items),
+        sum(isinstance(result, Exception) for result in results),
+    )
+    return results
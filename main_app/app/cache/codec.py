@@ -0,0 +1,290 @@
+"""Модуль сериализации данных кэша (кодеки).
+
+Значение в Redis начинается с байта формата: старшие 4 бита - версия схемы
+кэшируемых данных (SCHEMA_VERSION), младшие 4 бита - идентификатор кодека.
+Благодаря этому чтение не зависит от текущей настройки CACHE_CODEC: запись,
+сделанная любым доступным кодеком, читается корректно, а записи другой
+версии схемы считаются поврежденными и удаляются вызывающим кодом.
+Значения без байта формата (JSON, записанный до появления кодеков) относятся
+к версии схемы 1 и также не читаются: в них нет полей, добавленных позже.
+
+Кодеки:
+- json: стандартная библиотека (по умолчанию, без дополнительных зависимостей);
+- orjson: сериализация в одном вызове C-расширения, datetime поддерживается
+  нативно (зависимость orjson);
+- msgpack: компактный бинарный формат (зависимость msgpack); требует
+  REDIS_DECODE_RESPONSES=false, так как значение не является текстом UTF-8.
+
+Установка дополнительных кодеков: ``uv sync --extra fast-cache``.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any
+
+from app.cache.settings import cache_settings
+from app.redis_client import RedisSettings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависит от окружения
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - зависит от окружения
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Версия схемы кэшируемых данных (увеличивается при несовместимом изменении
+# состава полей; допустимы значения 1-6)
+# 2 - в данные продукции добавлено поле sku
+SCHEMA_VERSION = 2
+
+
+def _default(value: Any) -> Any:
+    """Преобразовать значение, не поддерживаемое кодеком, в JSON-совместимое."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+class CacheCodec(ABC):
+    """
+    Базовый кодек данных кэша.
+
+    Кодек без dumps или loads не создается (TypeError при регистрации).
+
+    Attributes:
+        name: Имя кодека (значение CACHE_CODEC)
+        codec_id: Идентификатор кодека в байте формата (1-15)
+        binary: Значения не являются текстом UTF-8 (требуется
+            REDIS_DECODE_RESPONSES=false)
+    """
+
+    name = ""
+    codec_id = 0
+    binary = False
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """
+        Сериализовать данные (без байта формата).
+
+        Args:
+            data: Данные (dict, list, скаляры, datetime)
+
+        Returns:
+            bytes: Сериализованные данные
+
+        Raises:
+            TypeError: Если данные не сериализуемы
+        """
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Any:
+        """
+        Десериализовать данные (без байта формата).
+
+        Args:
+            payload: Сериализованные данные
+
+        Returns:
+            Any: Данные (datetime возвращаются строками ISO 8601)
+
+        Raises:
+            ValueError: Если данные повреждены
+        """
+
+
+class JsonCodec(CacheCodec):
+    """Кодек на стандартном модуле json."""
+
+    name = "json"
+    codec_id = 1
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, default=_default, separators=(",", ":")).encode()
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class OrjsonCodec(CacheCodec):
+    """Кодек на orjson (datetime сериализуется без промежуточных вызовов)."""
+
+    name = "orjson"
+    codec_id = 2
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, payload: bytes) -> Any:
+        return orjson.loads(payload)
+
+
+class MsgpackCodec(CacheCodec):
+    """Кодек на msgpack (datetime сохраняется строкой ISO 8601)."""
+
+    name = "msgpack"
+    codec_id = 3
+    binary = True
+
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, default=_default)
+
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload)
+
+
+_codecs: dict[int, CacheCodec] = {JsonCodec.codec_id: JsonCodec()}
+if orjson is not None:
+    _codecs[OrjsonCodec.codec_id] = OrjsonCodec()
+if msgpack is not None:
+    _codecs[MsgpackCodec.codec_id] = MsgpackCodec()
+
+
+def get_codec(name: str, decode_responses: bool = False) -> CacheCodec:
+    """
+    Получить кодек по имени.
+
+    Если библиотека кодека не установлена, используется json.
+
+    Args:
+        name: Имя кодека (json, orjson, msgpack)
+        decode_responses: Декодирует ли клиент Redis ответы в str
+            (REDIS_DECODE_RESPONSES)
+
+    Returns:
+        CacheCodec: Кодек
+
+    Raises:
+        ValueError: Если имя кодека неизвестно или бинарный кодек выбран
+            при декодировании ответов Redis в str
+    """
+    known = {cls.name: cls for cls in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+    if name not in known:
+        raise ValueError(f"Unknown cache codec: {name}")
+
+    available = _codecs.get(known[name].codec_id)
+    if available is None:
+        logger.warning(
+            "Кодек кэша %s недоступен (не установлен), используется json", name
+        )
+        return _codecs[JsonCodec.codec_id]
+    if available.binary and decode_responses:
+        # Клиент Redis не смог бы декодировать значения: каждое чтение
+        # завершалось бы UnicodeDecodeError
+        raise ValueError(
+            f"Cache codec {name} writes binary values and requires "
+            "REDIS_DECODE_RESPONSES=false"
+        )
+    return available
+
+
+codec = get_codec(cache_settings.codec, RedisSettings.from_env().decode_responses)
+
+# Кодек для JSON-ответов и байты формата значений, которые уже являются JSON
+_json_codec = _codecs.get(OrjsonCodec.codec_id, _codecs[JsonCodec.codec_id])
+_json_headers = frozenset(
+    (SCHEMA_VERSION << 4) | codec_id
+    for codec_id in (JsonCodec.codec_id, OrjsonCodec.codec_id)
+)
+# Первые байты значений без байта формата (JSON до появления кодеков)
+_legacy_headers = frozenset(b"{[")
+
+
+def encode(data: Any, cache_codec: CacheCodec | None = None) -> bytes:
+    """
+    Сериализовать данные для записи в кэш с байтом формата.
+
+    Args:
+        data: Данные для сохранения
+        cache_codec: Кодек (по умолчанию из настройки CACHE_CODEC)
+
+    Returns:
+        bytes: Значение для записи в Redis
+
+    Raises:
+        TypeError: Если данные не сериализуемы
+    """
+    cache_codec = cache_codec or codec
+    header = (SCHEMA_VERSION << 4) | cache_codec.codec_id
+    return bytes((header,)) + cache_codec.dumps(data)
+
+
+def decode(raw: bytes | str) -> Any:
+    """
+    Десериализовать значение из кэша.
+
+    Args:
+        raw: Значение из Redis (str при REDIS_DECODE_RESPONSES=true)
+
+    Returns:
+        Any: Данные (datetime возвращаются строками ISO 8601)
+
+    Raises:
+        ValueError: Если значение повреждено, записано другой версией схемы
+            или недоступным кодеком
+    """
+    if isinstance(raw, str):
+        raw = raw.encode()
+    if not raw:
+        raise ValueError("Empty cache value")
+
+    header = raw[0]
+    if header in _legacy_headers:
+        raise ValueError("Unsupported cache schema version: 1 (no format byte)")
+    if header >> 4 != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported cache schema version: {header >> 4}")
+    cache_codec = _codecs.get(header & 0x0F)
+    if cache_codec is None:
+        raise ValueError(f"Unsupported cache codec: {header & 0x0F}")
+    return cache_codec.loads(raw[1:])
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Сериализовать данные в JSON для тела HTTP-ответа.
+
+    Используется orjson, если он установлен, иначе стандартный json;
+    datetime записываются в формате ISO 8601 (как в ответах Pydantic).
+
+    Args:
+        data: Данные (dict, list, скаляры, datetime)
+
+    Returns:
+        bytes: JSON
+
+    Raises:
+        TypeError: Если данные не сериализуемы
+    """
+    return _json_codec.dumps(data)
+
+
+def to_json(raw: bytes | str) -> bytes:
+    """
+    Получить JSON значения из кэша без промежуточного разбора.
+
+    Значения кодеков json и orjson уже являются JSON: возвращаются данные
+    после байта формата. Значения других кодеков десериализуются и
+    сериализуются в JSON.
+
+    Args:
+        raw: Значение из Redis (str при REDIS_DECODE_RESPONSES=true)
+
+    Returns:
+        bytes: JSON
+
+    Raises:
+        ValueError: Если значение повреждено, записано другой версией схемы
+            или недоступным кодеком
+    """
+    if isinstance(raw, str):
+        raw = raw.encode()
+    if raw and raw[0] in _json_headers:
+        return raw[1:]
+    return dumps_json(decode(raw))
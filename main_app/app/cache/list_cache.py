@@ -0,0 +1,276 @@
+"""Модуль для кэширования страниц списков (query-result cache) в Redis.
+
+Ключ страницы строится из нормализованных параметров запроса (фильтры,
+пагинация) и номера версии списка сущности:
+
+    {entity}:list:v{version}:{sha1(параметры)}
+
+Любое изменение сущности увеличивает счетчик ``{entity}:list:version``
+(INCR), после чего все ранее закэшированные страницы перестают читаться и
+удаляются по короткому TTL. Инвалидация стоит одну команду и не требует
+перебора ключей.
+
+Все операции асинхронные (redis.asyncio) и работают в режиме fail-open.
+CachedPaginator читает страницы списков сервисов через этот кэш.
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.codec import decode, encode
+from app.pagination import Paginator, TotalMode, resolve_total_mode
+
+logger = logging.getLogger(__name__)
+
+LIST_CACHE_TTL = 30
+
+T = TypeVar("T")
+
+
+def _version_key(entity: str) -> str:
+    """Ключ счетчика версии списка сущности."""
+    return f"{entity}:list:version"
+
+
+def make_list_cache_key(entity: str, version: int, params: dict) -> str:
+    """
+    Построить ключ кэша страницы списка.
+
+    Параметры со значением None отбрасываются, порядок параметров не влияет
+    на ключ.
+
+    Args:
+        entity: Имя сущности (products, users)
+        version: Текущая версия списка сущности
+        params: Параметры запроса страницы
+
+    Returns:
+        str: Ключ Redis
+    """
+    normalized = {name: value for name, value in params.items() if value is not None}
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"{entity}:list:v{version}:{digest}"
+
+
+async def get_list_from_cache(
+    redis_client: aioredis.Redis, entity: str, params: dict
+) -> tuple[int | None, dict | None]:
+    """
+    Получение страницы списка из кэша Redis.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        entity: Имя сущности (products, users)
+        params: Параметры запроса страницы
+
+    Returns:
+        tuple[int | None, dict | None]: Версия списка, под которой страницу
+            нужно сохранить после чтения из БД (None, если Redis недоступен),
+            и данные страницы (None при промахе)
+    """
+    try:
+        version = int(await redis_client.get(_version_key(entity)) or 0)
+        key = make_list_cache_key(entity, version, params)
+        cached_data = await redis_client.get(key)
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при получении списка из кэша: %s",
+            e,
+        )
+        return None, None
+
+    if cached_data is None:
+        logger.debug("Cache miss для списка: entity=%s, key=%s", entity, key)
+        return version, None
+
+    try:
+        page_data = decode(cached_data)
+    except ValueError as e:
+        logger.error(
+            "Ошибка десериализации списка из кэша: key=%s, error=%s",
+            key,
+            e,
+        )
+        # Удаляем поврежденные данные из кэша
+        try:
+            await redis_client.delete(key)
+        except (redis.ConnectionError, redis.TimeoutError):
+            pass
+        return version, None
+
+    logger.debug("Cache hit для списка: entity=%s, key=%s", entity, key)
+    return version, page_data
+
+
+async def set_list_to_cache(
+    redis_client: aioredis.Redis,
+    entity: str,
+    version: int,
+    params: dict,
+    page_data: dict,
+    ttl: int = LIST_CACHE_TTL,
+) -> None:
+    """
+    Сохранение страницы списка в кэш Redis с коротким TTL.
+
+    Страница сохраняется под версией, прочитанной до запроса к БД: если
+    список был изменен во время запроса, запись окажется под устаревшей
+    версией и не будет прочитана.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        entity: Имя сущности (products, users)
+        version: Версия списка, полученная из get_list_from_cache
+        params: Параметры запроса страницы
+        page_data: Данные страницы для сохранения
+        ttl: Время жизни ключа в секундах (по умолчанию 30 секунд)
+    """
+    key = make_list_cache_key(entity, version, params)
+
+    try:
+        payload = encode(page_data)
+        await redis_client.setex(key, ttl, payload)
+        logger.debug("Страница списка сохранена в кэш: key=%s, ttl=%s", key, ttl)
+    except (TypeError, ValueError) as e:
+        logger.error(
+            "Ошибка сериализации списка для кэша: key=%s, error=%s",
+            key,
+            e,
+        )
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при сохранении списка в кэш: %s",
+            e,
+        )
+
+
+async def invalidate_list_cache(redis_client: aioredis.Redis, entity: str) -> None:
+    """
+    Инвалидация всех закэшированных страниц списка сущности.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        entity: Имя сущности (products, users)
+    """
+    try:
+        version = await redis_client.incr(_version_key(entity))
+        logger.info("Кэш списков инвалидирован: entity=%s, version=%s", entity, version)
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при инвалидации кэша списков: %s",
+            e,
+        )
+
+
+class CachedPaginator(Paginator[T]):
+    """
+    Страницы списка сущности с кэшированием в Redis (cache-aside).
+
+    Результат (записи, общее количество и курсор следующей страницы)
+    кэшируется по нормализованным параметрам запроса и инвалидируется
+    invalidate_list_cache при любом изменении сущности.
+    """
+
+    def __init__(
+        self,
+        repository: Any,
+        entity: str,
+        to_cache: Callable[[T], dict],
+        from_cache: Callable[[dict], Any],
+        redis_client: aioredis.Redis | None = None,
+    ):
+        """
+        Инициализация.
+
+        Args:
+            repository: Репозиторий сущности
+            entity: Имя сущности в ключах кэша (products, users)
+            to_cache: Преобразование записи в данные для кэша
+            from_cache: Преобразование данных кэша в объект чтения
+            redis_client: Клиент Redis (None - без кэширования)
+        """
+        super().__init__(repository)
+        self.entity = entity
+        self.to_cache = to_cache
+        self.from_cache = from_cache
+        self.redis_client = redis_client
+
+    async def get_page(
+        self,
+        session: AsyncSession,
+        count: int,
+        page: int = 1,
+        cursor: str | None = None,
+        total_mode: TotalMode | None = None,
+        **kwargs,
+    ) -> tuple[list[Any], int | None, str | None]:
+        """
+        Получить страницу для ответа списка с кэшированием.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            page: Номер страницы (игнорируется, если передан курсор)
+            cursor: Курсор из предыдущего ответа (keyset пагинация)
+            total_mode: Режим подсчета общего количества (по умолчанию
+                exact для страниц по номеру и none для курсора)
+            **kwargs: Фильтры репозитория
+
+        Returns:
+            Список записей (объекты чтения при попадании в кэш), общее
+            количество (None для режима none) и курсор следующей страницы
+
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        total_mode = resolve_total_mode(total_mode, cursor)
+        params = {
+            "count": count,
+            "page": None if cursor else page,
+            "cursor": cursor,
+            "total_mode": str(total_mode),
+            **kwargs,
+        }
+        version = None
+        if self.redis_client:
+            version, cached_page = await get_list_from_cache(
+                self.redis_client, self.entity, params
+            )
+            if cached_page is not None:
+                items = [self.from_cache(data) for data in cached_page["items"]]
+                return items, cached_page["total"], cached_page["next_cursor"]
+
+        items, total, next_cursor = await super().get_page(
+            session, count, page, cursor, total_mode, **kwargs
+        )
+
+        if version is not None:
+            try:
+                await set_list_to_cache(
+                    self.redis_client,
+                    self.entity,
+                    version,
+                    params,
+                    {
+                        "items": [self.to_cache(item) for item in items],
+                        "total": total,
+                        "next_cursor": next_cursor,
+                    },
+                )
+            except (ValueError, TypeError, redis.RedisError) as e:
+                # Логируем ошибку, но не блокируем возврат данных
+                logger.warning(
+                    "Не удалось сохранить список в кэш: entity=%s, error=%s",
+                    self.entity,
+                    e,
+                )
+
+        return items, total, next_cursor
@@ -0,0 +1,273 @@
+"""Модуль кэша в памяти процесса (L1) перед Redis.
+
+Самые востребованные записи product:{id} и user:{id} хранятся в ограниченном
+LRU-словаре процесса с коротким TTL, поэтому попадание не требует обращения
+к Redis и разбора JSON.
+
+Согласованность между репликами поддерживается через Redis pub/sub: при
+изменении или удалении записи ее ключ публикуется в канал
+INVALIDATION_CHANNEL, и каждая реплика удаляет ключ из своего L1. TTL записи
+ограничивает устаревание, если сообщение было потеряно.
+
+L1 включается настройкой CACHE_L1_ENABLED; слушатель канала запускается
+хуком on_startup веб-приложения.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+import redis
+import redis.asyncio as aioredis
+from litestar import Litestar
+
+from app.cache.settings import cache_settings
+from app.cache.stats import record_cache_request
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Пауза перед повторной подпиской после потери соединения (в секундах)
+RESUBSCRIBE_DELAY = 1.0
+
+# Максимальное ожидание сообщения канала за один вызов (в секундах)
+LISTEN_TIMEOUT = 1.0
+
+
+class LocalCache:
+    """
+    Ограниченный LRU-кэш в памяти процесса с TTL записей.
+
+    Значения возвращаются без копирования: вызывающий код не должен их
+    изменять.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Инициализация кэша.
+
+        Args:
+            max_size: Максимальное количество записей
+            ttl: Время жизни записи в секундах
+            clock: Источник монотонного времени
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """
+        Получить значение по ключу.
+
+        Args:
+            key: Ключ записи
+
+        Returns:
+            Значение или None, если записи нет или ее TTL истек
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Сохранить значение, вытеснив давно не использованные записи.
+
+        Args:
+            key: Ключ записи
+            value: Значение
+        """
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """
+        Удалить запись.
+
+        Args:
+            key: Ключ записи
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Удалить все записи."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Количество записей (включая еще не удаленные просроченные)."""
+        return len(self._entries)
+
+
+local_cache: LocalCache | None = (
+    LocalCache(cache_settings.l1_max_size, cache_settings.l1_ttl)
+    if cache_settings.l1_enabled
+    else None
+)
+
+
+def is_local_enabled() -> bool:
+    """
+    Проверить, включен ли L1.
+
+    Returns:
+        bool: True, если L1 включен
+    """
+    return local_cache is not None
+
+
+def get_local(key: str, entity: str) -> Any | None:
+    """
+    Получить значение из L1 с учетом попадания в метриках.
+
+    Args:
+        key: Ключ кэша
+        entity: Сущность для метрик (product, user)
+
+    Returns:
+        Значение или None (промах или L1 выключен)
+    """
+    if local_cache is None:
+        return None
+    value = local_cache.get(key)
+    record_cache_request("l1", entity, hit=value is not None)
+    return value
+
+
+def set_local(key: str, value: Any) -> None:
+    """
+    Сохранить значение в L1 (если L1 включен).
+
+    Args:
+        key: Ключ кэша
+        value: Значение
+    """
+    if local_cache is not None:
+        local_cache.set(key, value)
+
+
+async def publish_invalidation(redis_client: aioredis.Redis, key: str) -> None:
+    """
+    Удалить ключ из L1 этого процесса и оповестить остальные реплики.
+
+    Инвалидация публикуется и при выключенном L1: изменения могут выполнять
+    процессы без L1 (RabbitMQ consumer, TaskIQ worker), а L1 включен у
+    реплик веб-приложения.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        key: Ключ кэша
+    """
+    if local_cache is not None:
+        local_cache.delete(key)
+    try:
+        await redis_client.publish(INVALIDATION_CHANNEL, key)
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при публикации инвалидации: key=%s, error=%s",
+            key,
+            e,
+        )
+
+
+def queue_invalidation(pipe: aioredis.client.Pipeline, key: str) -> None:
+    """
+    Удалить ключ из L1 этого процесса и добавить публикацию в конвейер.
+
+    Пакетные изменения публикуют инвалидации вместе с остальными командами
+    конвейера, а не отдельным round-trip на каждый ключ.
+
+    Args:
+        pipe: Конвейер Redis, выполняемый вызывающим кодом
+        key: Ключ кэша
+    """
+    if local_cache is not None:
+        local_cache.delete(key)
+    pipe.publish(INVALIDATION_CHANNEL, key)
+
+
+async def listen_for_invalidations(redis_client: aioredis.Redis) -> None:
+    """
+    Удалять из L1 ключи, опубликованные в канале инвалидации.
+
+    При потере соединения или другой ошибке Redis L1 очищается (сообщения
+    могли быть пропущены), и подписка возобновляется. Работает до отмены задачи.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+    """
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            logger.info("Подписка на инвалидацию L1: channel=%s", INVALIDATION_CHANNEL)
+            while True:
+                # get_message с таймаутом ожидает сообщение во всех
+                # поддерживаемых версиях redis-py, не нагружая цикл
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=LISTEN_TIMEOUT
+                )
+                if message is None or local_cache is None:
+                    continue
+                key = message["data"]
+                if isinstance(key, bytes):
+                    key = key.decode()
+                local_cache.delete(key)
+        except redis.RedisError as e:
+            logger.warning("Потеряна подписка на инвалидацию L1: %s", e)
+            if local_cache is not None:
+                local_cache.clear()
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+        finally:
+            try:
+                await pubsub.aclose()
+            except redis.RedisError:
+                pass
+
+
+async def start_invalidation_listener(app: Litestar) -> None:
+    """
+    Запустить слушатель инвалидации L1 (хук on_startup, после init_redis).
+
+    Args:
+        app: Экземпляр приложения Litestar
+    """
+    if local_cache is None:
+        return
+    app.state.cache_invalidation_task = asyncio.create_task(
+        listen_for_invalidations(app.state.redis_client)
+    )
+
+
+async def stop_invalidation_listener(app: Litestar) -> None:
+    """
+    Остановить слушатель инвалидации L1 (хук on_shutdown).
+
+    Args:
+        app: Экземпляр приложения Litestar
+    """
+    task = getattr(app.state, "cache_invalidation_task", None)
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
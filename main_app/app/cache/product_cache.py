@@ -1,16 +1,35 @@
-"""Модуль для управления кэшем продукции в Redis."""
+"""Модуль для управления кэшем продукции в Redis.
+
+Все операции асинхронные (redis.asyncio) и работают в режиме fail-open:
+недоступность Redis или превышение таймаута не прерывают основную логику.
+Если включен кэш процесса (L1, см. app.cache.local_cache), чтение сначала
+обращается к нему, а изменения публикуют инвалидацию для остальных реплик.
+"""
 
-import json
 import logging
+from collections.abc import Iterable
 
 import redis
+import redis.asyncio as aioredis
+
+from app.cache.codec import decode, dumps_json, encode, to_json
+from app.cache.local_cache import (
+    get_local,
+    is_local_enabled,
+    publish_invalidation,
+    queue_invalidation,
+    set_local,
+)
+from app.cache.stats import record_cache_request
 
 logger = logging.getLogger(__name__)
 
 
-def get_product_from_cache(redis_client: redis.Redis, product_id: int) -> dict | None:
+async def get_product_from_cache(
+    redis_client: aioredis.Redis, product_id: int
+) -> dict | None:
     """
-    Получение данных продукции из кэша Redis.
+    Получение данных продукции из кэша (L1, затем Redis).
 
     Args:
         redis_client: Клиент Redis для выполнения операций
@@ -22,23 +41,86 @@ def get_product_from_cache(redis_client: redis.Redis, product_id: int) -> dict |
     """
     key = f"product:{product_id}"
 
+    local_data = get_local(key, "product")
+    if local_data is not None:
+        return local_data
+
     try:
-        cached_data = redis_client.get(key)
+        cached_data = await redis_client.get(key)
+        record_cache_request("redis", "product", hit=cached_data is not None)
         if cached_data is None:
             logger.debug("Cache miss для продукции: product_id=%s", product_id)
             return None
 
-        product_data = json.loads(cached_data)
+        product_data = decode(cached_data)
         logger.info("Cache hit для продукции: product_id=%s", product_id)
+        set_local(key, product_data)
         return product_data
 
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при получении продукции из кэша: %s",
+            e,
+        )
+        return None
+    except ValueError as e:
+        logger.error(
+            "Ошибка десериализации данных продукции из кэша: product_id=%s, error=%s",
+            product_id,
+            e,
+        )
+        # Удаляем поврежденные данные из кэша
+        try:
+            await redis_client.delete(key)
+        except (redis.ConnectionError, redis.TimeoutError):
+            pass
+        return None
+
+
+async def get_product_json_from_cache(
+    redis_client: aioredis.Redis, product_id: int
+) -> bytes | None:
+    """
+    Получение данных продукции из кэша в виде готового JSON ответа.
+
+    Значение кодеков json и orjson возвращается без разбора (см.
+    app.cache.codec.to_json), поэтому попадание не требует построения
+    объектов и валидации схемы ответа.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        product_id: Идентификатор продукции
+
+    Returns:
+        bytes | None: JSON с данными продукции (поля ProductResponse), если
+                      найден в кэше, иначе None
+    """
+    key = f"product:{product_id}"
+
+    local_data = get_local(key, "product")
+    if local_data is not None:
+        return dumps_json(local_data)
+
+    try:
+        cached_data = await redis_client.get(key)
+        record_cache_request("redis", "product", hit=cached_data is not None)
+        if cached_data is None:
+            logger.debug("Cache miss для продукции: product_id=%s", product_id)
+            return None
+
+        body = to_json(cached_data)
+        logger.info("Cache hit для продукции: product_id=%s", product_id)
+        if is_local_enabled():
+            set_local(key, decode(cached_data))
+        return body
+
+    except (redis.ConnectionError, redis.TimeoutError) as e:
         logger.warning(
             "Ошибка подключения к Redis при получении продукции из кэша: %s",
             e,
         )
         return None
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         logger.error(
             "Ошибка десериализации данных продукции из кэша: product_id=%s, error=%s",
             product_id,
@@ -46,14 +128,14 @@ def get_product_from_cache(redis_client: redis.Redis, product_id: int) -> dict |
         )
         # Удаляем поврежденные данные из кэша
         try:
-            redis_client.delete(key)
-        except redis.ConnectionError:
+            await redis_client.delete(key)
+        except (redis.ConnectionError, redis.TimeoutError):
             pass
         return None
 
 
-def set_product_to_cache(
-    redis_client: redis.Redis,
+async def set_product_to_cache(
+    redis_client: aioredis.Redis,
     product_id: int,
     product_data: dict,
     ttl: int = 600,
@@ -70,14 +152,15 @@ def set_product_to_cache(
     key = f"product:{product_id}"
 
     try:
-        json_data = json.dumps(product_data)
-        redis_client.setex(key, ttl, json_data)
+        payload = encode(product_data)
+        await redis_client.setex(key, ttl, payload)
+        set_local(key, product_data)
         logger.info(
             "Данные продукции сохранены в кэш: product_id=%s, ttl=%s секунд",
             product_id,
             ttl,
         )
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, redis.TimeoutError) as e:
         logger.warning(
             "Ошибка подключения к Redis при сохранении продукции в кэш: %s",
             e,
@@ -92,8 +175,138 @@ def set_product_to_cache(
         # Не выбрасываем исключение, чтобы не блокировать основную логику
 
 
-def update_product_in_cache(
-    redis_client: redis.Redis,
+async def get_products_from_cache(
+    redis_client: aioredis.Redis, product_ids: Iterable[int]
+) -> dict[int, dict]:
+    """
+    Получение данных нескольких продуктов из кэша Redis одной командой MGET.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        product_ids: Идентификаторы продукции (повторы допускаются)
+
+    Returns:
+        dict[int, dict]: Словарь {ID продукции: данные} только для найденных
+                         в кэше продуктов
+    """
+    products: dict[int, dict] = {}
+    ids = []
+    for product_id in dict.fromkeys(product_ids):
+        local_data = get_local(f"product:{product_id}", "product")
+        if local_data is not None:
+            products[product_id] = local_data
+        else:
+            ids.append(product_id)
+    if not ids:
+        return products
+    keys = [f"product:{product_id}" for product_id in ids]
+
+    try:
+        values = await redis_client.mget(keys)
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при получении продукции из кэша: %s",
+            e,
+        )
+        return products
+
+    found = 0
+    corrupted_keys = []
+    for product_id, key, cached_data in zip(ids, keys, values):
+        if cached_data is None:
+            continue
+        found += 1
+        try:
+            products[product_id] = decode(cached_data)
+            set_local(key, products[product_id])
+        except ValueError as e:
+            logger.error(
+                "Ошибка десериализации данных продукции из кэша: product_id=%s, error=%s",
+                product_id,
+                e,
+            )
+            corrupted_keys.append(key)
+
+    record_cache_request("redis", "product", hit=True, amount=found)
+    record_cache_request("redis", "product", hit=False, amount=len(ids) - found)
+    logger.debug(
+        "Пакетное чтение продукции из кэша: hits=%s, misses=%s",
+        found,
+        len(ids) - found,
+    )
+
+    if corrupted_keys:
+        # Удаляем поврежденные данные из кэша
+        try:
+            await redis_client.delete(*corrupted_keys)
+        except (redis.ConnectionError, redis.TimeoutError):
+            pass
+    return products
+
+
+async def set_products_to_cache(
+    redis_client: aioredis.Redis,
+    products: dict[int, dict],
+    ttl: int = 600,
+    only_missing: bool = False,
+) -> None:
+    """
+    Сохранение данных нескольких продуктов в кэш Redis за один round-trip.
+
+    Команды SETEX (или SET NX EX при only_missing) отправляются одним
+    конвейером (pipeline без транзакции).
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        products: Словарь {ID продукции: данные для сохранения}
+        ttl: Время жизни ключей в секундах (по умолчанию 10 минут = 600 секунд)
+        only_missing: Записывать только отсутствующие ключи, не перезаписывая
+            значения, сохраненные после чтения данных (прогрев кэша)
+    """
+    payloads = {}
+    for product_id, product_data in products.items():
+        try:
+            payloads[product_id] = encode(product_data)
+        except (TypeError, ValueError) as e:
+            logger.error(
+                "Ошибка сериализации данных продукции для кэша: product_id=%s, error=%s",
+                product_id,
+                e,
+            )
+    if not payloads:
+        return
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for product_id, payload in payloads.items():
+                key = f"product:{product_id}"
+                if only_missing:
+                    pipe.set(key, payload, ex=ttl, nx=True)
+                else:
+                    pipe.setex(key, ttl, payload)
+            results = await pipe.execute()
+        if only_missing:
+            # В L1 попадают только записанные значения
+            written = [product_id for product_id, ok in zip(payloads, results) if ok]
+        else:
+            written = list(payloads)
+        for product_id in written:
+            set_local(f"product:{product_id}", products[product_id])
+        logger.info(
+            "Данные продукции сохранены в кэш: count=%s, ttl=%s секунд",
+            len(written),
+            ttl,
+        )
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при сохранении продукции в кэш: %s",
+            e,
+        )
+        # Не выбрасываем исключение, чтобы не блокировать основную логику
+
+
+async def update_product_in_cache(
+    redis_client: aioredis.Redis,
     product_id: int,
     product_data: dict,
     ttl: int = 600,
@@ -101,9 +314,9 @@ def update_product_in_cache(
     """
     Обновление данных продукции в кэше Redis с TTL.
 
-    При обновлении продукции данные обновляются в кэше (в отличие от пользователей,
-    где происходит инвалидация). Это обеспечивает актуальность данных без
-    необходимости повторного запроса к БД.
+    При обновлении продукции данные обновляются в кэше (политики write-through
+    и write-behind, см. app.cache.write_policy). Это обеспечивает актуальность
+    данных без необходимости повторного запроса к БД.
 
     Args:
         redis_client: Клиент Redis для выполнения операций
@@ -114,15 +327,15 @@ def update_product_in_cache(
     key = f"product:{product_id}"
 
     try:
-        json_data = json.dumps(product_data)
+        payload = encode(product_data)
         # setex работает как set, если ключа нет - он будет создан
-        redis_client.setex(key, ttl, json_data)
+        await redis_client.setex(key, ttl, payload)
         logger.info(
             "Данные продукции обновлены в кэше: product_id=%s, ttl=%s секунд",
             product_id,
             ttl,
         )
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, redis.TimeoutError) as e:
         logger.warning(
             "Ошибка подключения к Redis при обновлении продукции в кэше: %s",
             e,
@@ -136,8 +349,13 @@ def update_product_in_cache(
         )
         # Не выбрасываем исключение, чтобы не блокировать основную логику
 
+    # Остальные реплики удаляют устаревшую запись из L1
+    await publish_invalidation(redis_client, key)
+
 
-def delete_product_from_cache(redis_client: redis.Redis, product_id: int) -> None:
+async def delete_product_from_cache(
+    redis_client: aioredis.Redis, product_id: int
+) -> None:
     """
     Удаление данных продукции из кэша Redis.
 
@@ -148,12 +366,46 @@ def delete_product_from_cache(redis_client: redis.Redis, product_id: int) -> Non
     key = f"product:{product_id}"
 
     try:
-        deleted = redis_client.delete(key)
+        deleted = await redis_client.delete(key)
         if deleted:
             logger.info("Данные продукции удалены из кэша: product_id=%s", product_id)
         else:
             logger.debug("Ключ продукции не найден в кэше: product_id=%s", product_id)
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при удалении продукции из кэша: %s",
+            e,
+        )
+        # Не выбрасываем исключение, чтобы не блокировать основную логику
+
+    await publish_invalidation(redis_client, key)
+
+
+async def delete_products_from_cache(
+    redis_client: aioredis.Redis, product_ids: Iterable[int]
+) -> None:
+    """
+    Удаление данных нескольких продуктов из кэша Redis за один round-trip.
+
+    Команды DEL и публикации инвалидации L1 отправляются одним конвейером
+    (pipeline без транзакции).
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        product_ids: Идентификаторы продукции
+    """
+    keys = [f"product:{product_id}" for product_id in set(product_ids)]
+    if not keys:
+        return
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.delete(key)
+                queue_invalidation(pipe, key)
+            await pipe.execute()
+        logger.info("Данные продукции удалены из кэша: count=%s", len(keys))
+    except (redis.ConnectionError, redis.TimeoutError) as e:
         logger.warning(
             "Ошибка подключения к Redis при удалении продукции из кэша: %s",
             e,
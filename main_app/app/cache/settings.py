@@ -0,0 +1,108 @@
+"""Модуль настроек кэширования."""
+
+import os
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class WritePolicy(StrEnum):
+    """
+    Политика обновления кэша записи после изменения сущности в БД.
+
+    Attributes:
+        INVALIDATE: Удалить ключ (следующее чтение загрузит данные из БД)
+        WRITE_THROUGH: Записать свежие данные в кэш до ответа на запрос
+        WRITE_BEHIND: Записать свежие данные в кэш в фоне, не задерживая ответ
+    """
+
+    INVALIDATE = "invalidate"
+    WRITE_THROUGH = "write_through"
+    WRITE_BEHIND = "write_behind"
+
+
+@dataclass(frozen=True)
+class CacheSettings:
+    """
+    Настройки стратегий кэширования сущностей.
+
+    Attributes:
+        stampede_lock: Использовать распределенную блокировку Redis при промахе
+            кэша (защита от одновременной загрузки ключа несколькими репликами)
+        stampede_lock_timeout: Время жизни блокировки и максимальное время
+            ожидания заполнения кэша другой репликой (в секундах)
+        stampede_poll_interval: Интервал опроса кэша при ожидании (в секундах)
+        l1_enabled: Использовать кэш в памяти процесса (L1) перед Redis
+        l1_max_size: Максимальное количество записей L1 (вытеснение LRU)
+        l1_ttl: Время жизни записи L1 (в секундах), ограничивает устаревание
+            при потере сообщения об инвалидации
+        codec: Кодек сериализации значений кэша (json, orjson, msgpack)
+        product_write_policy: Обновление кэша продукции после создания и
+            изменения (см. WritePolicy)
+        user_write_policy: Обновление кэша пользователей после создания и
+            изменения (см. WritePolicy)
+        warmup_top_n: Количество самых заказываемых продуктов, загружаемых
+            в кэш при прогреве
+        warmup_on_startup: Прогревать кэш продукции при запуске приложения
+    """
+
+    stampede_lock: bool = False
+    stampede_lock_timeout: float = 5.0
+    stampede_poll_interval: float = 0.05
+    l1_enabled: bool = False
+    l1_max_size: int = 1000
+    l1_ttl: float = 5.0
+    codec: str = "json"
+    product_write_policy: WritePolicy = WritePolicy.WRITE_THROUGH
+    user_write_policy: WritePolicy = WritePolicy.WRITE_THROUGH
+    warmup_top_n: int = 1000
+    warmup_on_startup: bool = False
+
+    @classmethod
+    def from_env(cls) -> "CacheSettings":
+        """
+        Создание настроек из переменных окружения.
+
+        Используются переменные:
+        - CACHE_STAMPEDE_LOCK (по умолчанию false)
+        - CACHE_STAMPEDE_LOCK_TIMEOUT (по умолчанию 5 секунд)
+        - CACHE_STAMPEDE_POLL_INTERVAL (по умолчанию 0.05 секунды)
+        - CACHE_L1_ENABLED (по умолчанию false)
+        - CACHE_L1_MAX_SIZE (по умолчанию 1000)
+        - CACHE_L1_TTL (по умолчанию 5 секунд)
+        - CACHE_CODEC (по умолчанию json)
+        - CACHE_PRODUCT_WRITE_POLICY (по умолчанию write_through)
+        - CACHE_USER_WRITE_POLICY (по умолчанию write_through)
+        - CACHE_WARMUP_TOP_N (по умолчанию 1000)
+        - CACHE_WARMUP_ON_STARTUP (по умолчанию false)
+
+        Returns:
+            CacheSettings: Настройки кэширования
+
+        Raises:
+            ValueError: Если задана неизвестная политика записи
+        """
+        return cls(
+            stampede_lock=os.getenv("CACHE_STAMPEDE_LOCK", "false").lower() == "true",
+            stampede_lock_timeout=float(
+                os.getenv("CACHE_STAMPEDE_LOCK_TIMEOUT", "5.0")
+            ),
+            stampede_poll_interval=float(
+                os.getenv("CACHE_STAMPEDE_POLL_INTERVAL", "0.05")
+            ),
+            l1_enabled=os.getenv("CACHE_L1_ENABLED", "false").lower() == "true",
+            l1_max_size=int(os.getenv("CACHE_L1_MAX_SIZE", "1000")),
+            l1_ttl=float(os.getenv("CACHE_L1_TTL", "5.0")),
+            codec=os.getenv("CACHE_CODEC", "json").lower(),
+            product_write_policy=WritePolicy(
+                os.getenv("CACHE_PRODUCT_WRITE_POLICY", "write_through").lower()
+            ),
+            user_write_policy=WritePolicy(
+                os.getenv("CACHE_USER_WRITE_POLICY", "write_through").lower()
+            ),
+            warmup_top_n=int(os.getenv("CACHE_WARMUP_TOP_N", "1000")),
+            warmup_on_startup=os.getenv("CACHE_WARMUP_ON_STARTUP", "false").lower()
+            == "true",
+        )
+
+
+cache_settings = CacheSettings.from_env()
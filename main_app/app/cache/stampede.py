@@ -0,0 +1,141 @@
+"""Модуль защиты от лавинообразных промахов кэша (cache stampede).
+
+Когда популярный ключ истекает, все одновременные запросы получают промах и
+идут в БД. Здесь собраны два уровня защиты:
+
+- SingleFlight: одновременные загрузки одного ключа внутри процесса
+  объединяются в одну, остальные запросы ждут ее результат;
+- load_with_lock: опциональная распределенная блокировка Redis
+  (SET NX PX), чтобы ключ загружала одна реплика, а остальные дожидались
+  появления значения в кэше.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Снятие блокировки только ее владельцем (сравнение токена и удаление атомарно)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Объединение одновременных загрузок по ключу внутри процесса.
+
+    Первый вызов для ключа запускает загрузку отдельной задачей, остальные
+    вызовы до ее завершения получают тот же результат (или исключение).
+    Отмена ожидающего запроса не отменяет загрузку для остальных.
+    """
+
+    def __init__(self):
+        """Инициализация пустого реестра выполняющихся загрузок."""
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, load: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполнить загрузку ключа или присоединиться к уже выполняющейся.
+
+        Args:
+            key: Ключ загрузки (например, ключ кэша)
+            load: Функция загрузки значения
+
+        Returns:
+            T: Результат загрузки
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            logger.debug("Single-flight: ожидание загрузки ключа %s", key)
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Удалить завершенную загрузку из реестра."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+
+async def load_with_lock(
+    redis_client: aioredis.Redis,
+    key: str,
+    load: Callable[[], Awaitable[T]],
+    read_cached: Callable[[], Awaitable[T | None]],
+    lock_timeout: float = 5.0,
+    poll_interval: float = 0.05,
+) -> T:
+    """
+    Загрузить значение при промахе кэша под распределенной блокировкой Redis.
+
+    Реплика, получившая блокировку lock:{key}, выполняет загрузку (которая
+    должна сохранить значение в кэш). Остальные опрашивают кэш до появления
+    значения, снятия блокировки или истечения lock_timeout, после чего
+    загружают значение сами.
+    При недоступности Redis загрузка выполняется без блокировки.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        key: Ключ кэша
+        load: Функция загрузки значения из источника (с сохранением в кэш)
+        read_cached: Функция чтения значения из кэша
+        lock_timeout: Время жизни блокировки и максимальное время ожидания
+            (в секундах)
+        poll_interval: Интервал опроса кэша (в секундах)
+
+    Returns:
+        T: Загруженное или прочитанное из кэша значение
+    """
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+
+    try:
+        acquired = await redis_client.set(
+            lock_key, token, nx=True, px=int(lock_timeout * 1000)
+        )
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning("Ошибка подключения к Redis при получении блокировки: %s", e)
+        return await load()
+
+    if acquired:
+        try:
+            return await load()
+        finally:
+            try:
+                await redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                # Блокировка снимется сама по истечении TTL
+                logger.warning(
+                    "Ошибка подключения к Redis при снятии блокировки: %s", e
+                )
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + lock_timeout
+    while loop.time() < deadline:
+        await asyncio.sleep(poll_interval)
+        cached = await read_cached()
+        if cached is not None:
+            return cached
+        try:
+            if not await redis_client.exists(lock_key):
+                # Блокировка снята, но значение не сохранено (например, записи нет в БД)
+                break
+        except (redis.ConnectionError, redis.TimeoutError):
+            break
+    else:
+        logger.warning("Истекло ожидание заполнения кэша другой репликой: key=%s", key)
+    return await load()
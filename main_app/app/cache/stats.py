@@ -0,0 +1,65 @@
+"""Модуль метрик попаданий в кэш (экспортируются в /metrics)."""
+
+from app.metrics import Counter, Gauge, register
+
+CACHE_REQUESTS = register(
+    Counter(
+        "cache_requests_total",
+        "Обращения к кэшу сущностей по уровням (tier: l1, redis) и результату",
+    )
+)
+
+
+def record_cache_request(tier: str, entity: str, hit: bool, amount: int = 1) -> None:
+    """
+    Учесть обращение к уровню кэша.
+
+    Args:
+        tier: Уровень кэша (l1 - память процесса, redis)
+        entity: Сущность (product, user)
+        hit: Найдено ли значение
+        amount: Количество обращений (для пакетных чтений)
+    """
+    if amount:
+        CACHE_REQUESTS.inc(
+            amount, tier=tier, entity=entity, result="hit" if hit else "miss"
+        )
+
+
+def hit_ratio(tier: str) -> float:
+    """
+    Доля попаданий уровня кэша с момента запуска процесса.
+
+    Args:
+        tier: Уровень кэша (l1, redis)
+
+    Returns:
+        float: Доля попаданий от 0 до 1 (0, если обращений не было)
+    """
+    hits = misses = 0.0
+    for key, value in CACHE_REQUESTS.values.items():
+        labels = dict(key)
+        if labels.get("tier") != tier:
+            continue
+        if labels.get("result") == "hit":
+            hits += value
+        else:
+            misses += value
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+register(
+    Gauge(
+        "cache_l1_hit_ratio",
+        "Доля попаданий в кэш процесса (L1)",
+        lambda: hit_ratio("l1"),
+    )
+)
+register(
+    Gauge(
+        "cache_redis_hit_ratio",
+        "Доля попаданий в Redis",
+        lambda: hit_ratio("redis"),
+    )
+)
@@ -1,16 +1,33 @@
-"""Модуль для управления кэшем пользователей в Redis."""
+"""Модуль для управления кэшем пользователей в Redis.
+
+Все операции асинхронные (redis.asyncio) и работают в режиме fail-open:
+недоступность Redis или превышение таймаута не прерывают основную логику.
+Если включен кэш процесса (L1, см. app.cache.local_cache), чтение сначала
+обращается к нему, а изменения публикуют инвалидацию для остальных реплик.
+"""
 
-import json
 import logging
 
 import redis
+import redis.asyncio as aioredis
+
+from app.cache.codec import decode, dumps_json, encode, to_json
+from app.cache.local_cache import (
+    get_local,
+    is_local_enabled,
+    publish_invalidation,
+    set_local,
+)
+from app.cache.stats import record_cache_request
 
 logger = logging.getLogger(__name__)
 
 
-def get_user_from_cache(redis_client: redis.Redis, user_id: int) -> dict | None:
+async def get_user_from_cache(
+    redis_client: aioredis.Redis, user_id: int
+) -> dict | None:
     """
-    Получение данных пользователя из кэша Redis.
+    Получение данных пользователя из кэша (L1, затем Redis).
 
     Args:
         redis_client: Клиент Redis для выполнения операций
@@ -22,23 +39,29 @@ def get_user_from_cache(redis_client: redis.Redis, user_id: int) -> dict | None:
     """
     key = f"user:{user_id}"
 
+    local_data = get_local(key, "user")
+    if local_data is not None:
+        return local_data
+
     try:
-        cached_data = redis_client.get(key)
+        cached_data = await redis_client.get(key)
+        record_cache_request("redis", "user", hit=cached_data is not None)
         if cached_data is None:
             logger.debug("Cache miss для пользователя: user_id=%s", user_id)
             return None
 
-        user_data = json.loads(cached_data)
+        user_data = decode(cached_data)
         logger.info("Cache hit для пользователя: user_id=%s", user_id)
+        set_local(key, user_data)
         return user_data
 
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, redis.TimeoutError) as e:
         logger.warning(
             "Ошибка подключения к Redis при получении пользователя из кэша: %s",
             e,
         )
         return None
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         logger.error(
             "Ошибка десериализации данных пользователя из кэша: user_id=%s, error=%s",
             user_id,
@@ -46,14 +69,70 @@ def get_user_from_cache(redis_client: redis.Redis, user_id: int) -> dict | None:
         )
         # Удаляем поврежденные данные из кэша
         try:
-            redis_client.delete(key)
-        except redis.ConnectionError:
+            await redis_client.delete(key)
+        except (redis.ConnectionError, redis.TimeoutError):
             pass
         return None
 
 
-def set_user_to_cache(
-    redis_client: redis.Redis,
+async def get_user_json_from_cache(
+    redis_client: aioredis.Redis, user_id: int
+) -> bytes | None:
+    """
+    Получение данных пользователя из кэша в виде готового JSON ответа.
+
+    Значение кодеков json и orjson возвращается без разбора (см.
+    app.cache.codec.to_json).
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        user_id: Идентификатор пользователя
+
+    Returns:
+        bytes | None: JSON с данными пользователя (поля UserResponse), если
+                      найден в кэше, иначе None
+    """
+    key = f"user:{user_id}"
+
+    local_data = get_local(key, "user")
+    if local_data is not None:
+        return dumps_json(local_data)
+
+    try:
+        cached_data = await redis_client.get(key)
+        record_cache_request("redis", "user", hit=cached_data is not None)
+        if cached_data is None:
+            logger.debug("Cache miss для пользователя: user_id=%s", user_id)
+            return None
+
+        body = to_json(cached_data)
+        logger.info("Cache hit для пользователя: user_id=%s", user_id)
+        if is_local_enabled():
+            set_local(key, decode(cached_data))
+        return body
+
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при получении пользователя из кэша: %s",
+            e,
+        )
+        return None
+    except ValueError as e:
+        logger.error(
+            "Ошибка десериализации данных пользователя из кэша: user_id=%s, error=%s",
+            user_id,
+            e,
+        )
+        # Удаляем поврежденные данные из кэша
+        try:
+            await redis_client.delete(key)
+        except (redis.ConnectionError, redis.TimeoutError):
+            pass
+        return None
+
+
+async def set_user_to_cache(
+    redis_client: aioredis.Redis,
     user_id: int,
     user_data: dict,
     ttl: int = 3600,
@@ -70,14 +149,15 @@ def set_user_to_cache(
     key = f"user:{user_id}"
 
     try:
-        json_data = json.dumps(user_data)
-        redis_client.setex(key, ttl, json_data)
+        payload = encode(user_data)
+        await redis_client.setex(key, ttl, payload)
+        set_local(key, user_data)
         logger.info(
             "Данные пользователя сохранены в кэш: user_id=%s, ttl=%s секунд",
             user_id,
             ttl,
         )
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, redis.TimeoutError) as e:
         logger.warning(
             "Ошибка подключения к Redis при сохранении пользователя в кэш: %s",
             e,
@@ -92,7 +172,55 @@ def set_user_to_cache(
         # Не выбрасываем исключение, чтобы не блокировать основную логику
 
 
-def delete_user_from_cache(redis_client: redis.Redis, user_id: int) -> None:
+async def update_user_in_cache(
+    redis_client: aioredis.Redis,
+    user_id: int,
+    user_data: dict,
+    ttl: int = 3600,
+) -> None:
+    """
+    Обновление данных пользователя в кэше Redis с TTL.
+
+    Используется политиками write-through и write-behind: после изменения
+    данные записываются в кэш, как для продукции (см.
+    app.cache.product_cache.update_product_in_cache).
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        user_id: Идентификатор пользователя
+        user_data: Словарь с обновленными данными пользователя
+        ttl: Время жизни ключа в секундах (по умолчанию 1 час = 3600 секунд)
+    """
+    key = f"user:{user_id}"
+
+    try:
+        payload = encode(user_data)
+        # setex работает как set, если ключа нет - он будет создан
+        await redis_client.setex(key, ttl, payload)
+        logger.info(
+            "Данные пользователя обновлены в кэше: user_id=%s, ttl=%s секунд",
+            user_id,
+            ttl,
+        )
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        logger.warning(
+            "Ошибка подключения к Redis при обновлении пользователя в кэше: %s",
+            e,
+        )
+        # Не выбрасываем исключение, чтобы не блокировать основную логику
+    except (TypeError, ValueError) as e:
+        logger.error(
+            "Ошибка сериализации данных пользователя для обновления кэша: user_id=%s, error=%s",
+            user_id,
+            e,
+        )
+        # Не выбрасываем исключение, чтобы не блокировать основную логику
+
+    # Остальные реплики удаляют устаревшую запись из L1
+    await publish_invalidation(redis_client, key)
+
+
+async def delete_user_from_cache(redis_client: aioredis.Redis, user_id: int) -> None:
     """
     Удаление данных пользователя из кэша Redis.
 
@@ -103,14 +231,17 @@ def delete_user_from_cache(redis_client: redis.Redis, user_id: int) -> None:
     key = f"user:{user_id}"
 
     try:
-        deleted = redis_client.delete(key)
+        deleted = await redis_client.delete(key)
         if deleted:
             logger.info("Данные пользователя удалены из кэша: user_id=%s", user_id)
         else:
             logger.debug("Ключ пользователя не найден в кэше: user_id=%s", user_id)
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, redis.TimeoutError) as e:
         logger.warning(
             "Ошибка подключения к Redis при удалении пользователя из кэша: %s",
             e,
         )
         # Не выбрасываем исключение, чтобы не блокировать основную логику
+
+    # Остальные реплики удаляют устаревшую запись из L1
+    await publish_invalidation(redis_client, key)
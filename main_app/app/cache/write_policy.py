@@ -0,0 +1,119 @@
+"""Модуль применения политик записи в кэш (write-through, write-behind).
+
+Сервисы вызывают apply_write_policy после фиксации транзакции, поэтому в кэш
+попадают только сохраненные данные. При write-behind запись выполняется
+фоновой задачей процесса. Операции с одним ключом выполняются в порядке
+вызова: новая запись или удаление сначала дожидается фоновой записи этого
+ключа, поэтому устаревшие данные не перезаписывают свежие и не возвращают
+удаленную запись. Незавершенные записи дожидаются при остановке приложения
+(хук on_shutdown flush_pending_writes).
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+import redis
+from litestar import Litestar
+
+from app.cache.settings import WritePolicy
+
+logger = logging.getLogger(__name__)
+
+# Последняя фоновая запись write-behind по ключу кэша
+_pending_writes: dict[str, asyncio.Task] = {}
+
+
+async def _run_cache_write(operation: Callable[[], Awaitable[None]], key: str) -> None:
+    """
+    Выполнить операцию с кэшем, не пробрасывая ошибки.
+
+    Args:
+        operation: Операция с кэшем
+        key: Ключ кэша (для журнала)
+    """
+    try:
+        await operation()
+    except (ValueError, TypeError, redis.RedisError) as e:
+        # Логируем ошибку, но не блокируем основную логику
+        logger.warning("Не удалось обновить кэш: key=%s, error=%s", key, e)
+
+
+async def apply_write_policy(
+    policy: WritePolicy,
+    key: str,
+    write: Callable[[], Awaitable[None]],
+    invalidate: Callable[[], Awaitable[None]] | None = None,
+) -> None:
+    """
+    Обновить кэш записи согласно политике.
+
+    Args:
+        policy: Политика записи
+        key: Ключ кэша (для журнала)
+        write: Запись свежих данных в кэш
+        invalidate: Удаление ключа из кэша (None - удалять нечего, например
+            после создания записи)
+    """
+    if policy == WritePolicy.WRITE_BEHIND:
+        previous = _pending_writes.get(key)
+        task = asyncio.create_task(_write_behind(previous, write, key))
+        _pending_writes[key] = task
+        task.add_done_callback(lambda _: _forget_write(key, task))
+        return
+
+    await wait_for_pending_writes(key)
+    if policy == WritePolicy.INVALIDATE:
+        if invalidate is not None:
+            await _run_cache_write(invalidate, key)
+        return
+    await _run_cache_write(write, key)
+
+
+async def _write_behind(
+    previous: asyncio.Task | None,
+    write: Callable[[], Awaitable[None]],
+    key: str,
+) -> None:
+    """
+    Выполнить фоновую запись после предыдущей фоновой записи того же ключа.
+
+    Args:
+        previous: Предыдущая фоновая запись ключа (None - нет)
+        write: Запись свежих данных в кэш
+        key: Ключ кэша
+    """
+    if previous is not None:
+        await previous
+    await _run_cache_write(write, key)
+
+
+def _forget_write(key: str, task: asyncio.Task) -> None:
+    """Удалить завершенную фоновую запись, если за ней не запланирована новая."""
+    if _pending_writes.get(key) is task:
+        del _pending_writes[key]
+
+
+async def wait_for_pending_writes(key: str | None = None) -> None:
+    """
+    Дождаться завершения фоновых записей write-behind.
+
+    Args:
+        key: Ключ кэша (None - все ключи)
+    """
+    if key is None:
+        tasks = list(_pending_writes.values())
+    else:
+        tasks = [_pending_writes[key]] if key in _pending_writes else []
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def flush_pending_writes(app: Litestar) -> None:
+    """
+    Дождаться фоновых записей в кэш (хук on_shutdown, до close_redis).
+
+    Args:
+        app: Экземпляр приложения Litestar
+    """
+    await wait_for_pending_writes()
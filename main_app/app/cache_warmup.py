@@ -0,0 +1,127 @@
+"""Модуль прогрева кэша продукции.
+
+В ключи product:{id} загружаются N самых заказываемых продуктов (см.
+ProductService.warm_up_cache), чтобы после деплоя или очистки Redis страницы
+популярных продуктов не обращались к БД до прогрева кэша трафиком.
+
+Прогрев выполняется:
+- по расписанию задачей TaskIQ warm_up_product_cache (app.scheduler);
+- при запуске веб-приложения, если CACHE_WARMUP_ON_STARTUP=true (в фоне,
+  запуск приложения не задерживается);
+- вручную из командной строки:
+
+    uv run python -m app.cache_warmup
+    uv run python -m app.cache_warmup --limit 500
+"""
+
+import argparse
+import asyncio
+import logging
+
+import redis
+import redis.asyncio as aioredis
+from litestar import Litestar
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.cache.settings import cache_settings
+from app.database import async_session_factory, dispose_engine
+from app.redis_client import create_redis_pool
+from app.repositories.product_repository import ProductRepository
+from app.services.product_service import ProductService
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_product_cache(
+    redis_client: aioredis.Redis, limit: int | None = None
+) -> int:
+    """
+    Прогреть кэш продукции в отдельной сессии базы данных.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+        limit: Количество продуктов (по умолчанию CACHE_WARMUP_TOP_N)
+
+    Returns:
+        int: Количество загруженных продуктов
+    """
+    product_service = ProductService(ProductRepository(), redis_client)
+    async with async_session_factory() as session:
+        return await product_service.warm_up_cache(
+            session, limit or cache_settings.warmup_top_n
+        )
+
+
+async def _warm_up_in_background(redis_client: aioredis.Redis) -> None:
+    """
+    Прогреть кэш при запуске приложения, не прерывая его работу при ошибке.
+
+    Args:
+        redis_client: Клиент Redis для выполнения операций
+    """
+    try:
+        await warm_up_product_cache(redis_client)
+    except (SQLAlchemyError, redis.RedisError) as e:
+        logger.warning("Не удалось прогреть кэш продукции при запуске: %s", e)
+
+
+async def start_cache_warmup(app: Litestar) -> None:
+    """
+    Запустить прогрев кэша в фоне (хук on_startup, после init_redis).
+
+    Выполняется, только если включен CACHE_WARMUP_ON_STARTUP.
+
+    Args:
+        app: Экземпляр приложения Litestar
+    """
+    if not cache_settings.warmup_on_startup:
+        return
+    app.state.cache_warmup_task = asyncio.create_task(
+        _warm_up_in_background(app.state.redis_client)
+    )
+
+
+async def stop_cache_warmup(app: Litestar) -> None:
+    """
+    Отменить незавершенный прогрев кэша (хук on_shutdown).
+
+    Args:
+        app: Экземпляр приложения Litestar
+    """
+    task = getattr(app.state, "cache_warmup_task", None)
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def main() -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Прогрев кэша продукции")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=cache_settings.warmup_top_n,
+        help="Количество самых заказываемых продуктов",
+    )
+    args = parser.parse_args()
+
+    redis_client = aioredis.Redis(connection_pool=create_redis_pool())
+    try:
+        count = await warm_up_product_cache(redis_client, args.limit)
+        logger.info("Кэш продукции прогрет: %s продуктов", count)
+    finally:
+        await redis_client.aclose()
+        await redis_client.connection_pool.aclose()
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(main())
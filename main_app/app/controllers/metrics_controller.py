@@ -0,0 +1,21 @@
+"""Контроллер для экспорта метрик приложения."""
+
+from litestar import Controller, MediaType, get
+
+from app.metrics import render_metrics
+
+
+class MetricsController(Controller):
+    """Контроллер для экспорта метрик в формате Prometheus."""
+
+    path = "/metrics"
+
+    @get(media_type=MediaType.TEXT, include_in_schema=False)
+    async def get_metrics(self) -> str:
+        """
+        Получить метрики приложения.
+
+        Returns:
+            str: Метрики в текстовом формате Prometheus
+        """
+        return render_metrics()
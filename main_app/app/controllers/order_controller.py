@@ -1,11 +1,9 @@
 from litestar import Controller, delete, get, post, put
 from litestar.params import Parameter
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.exceptions import NotFoundException
-from app.models import Order
+from app.pagination import TotalMode
 from app.schemas.order_schema import (
     OrderCreate,
     OrderListResponse,
@@ -43,13 +41,7 @@ class OrderController(Controller):
         order = await order_service.get_by_id(db_session, order_id)
         if not order:
             raise NotFoundException(detail=f"Order with ID {order_id} not found")
-        # Убеждаемся, что items загружены перед валидацией Pydantic
-        stmt = (
-            select(Order).where(Order.id == order.id).options(selectinload(Order.items))
-        )
-        result = await db_session.execute(stmt)
-        order_with_items = result.scalar_one()
-        return OrderResponse.model_validate(order_with_items)
+        return OrderResponse.model_validate(order)
 
     @get()
     async def get_all_orders(
@@ -68,6 +60,16 @@ class OrderController(Controller):
         status: str | None = Parameter(
             default=None, description="Фильтр по статусу заказа"
         ),
+        cursor: str | None = Parameter(
+            default=None,
+            description="Курсор следующей страницы из предыдущего ответа "
+            "(keyset пагинация, параметр page игнорируется)",
+        ),
+        total_mode: TotalMode | None = Parameter(
+            default=None,
+            description="Подсчет общего количества: exact, approximate или none "
+            "(по умолчанию exact для page и none для cursor)",
+        ),
     ) -> OrderListResponse:
         """
         Получить список заказов с пагинацией и фильтрацией.
@@ -78,9 +80,14 @@ class OrderController(Controller):
             page: Номер страницы (начинается с 1)
             user_id: Фильтр по ID пользователя
             status: Фильтр по статусу заказа
+            cursor: Курсор следующей страницы (keyset пагинация)
+            total_mode: Режим подсчета общего количества
 
         Returns:
             OrderListResponse: Список заказов и общее количество
+
+        Raises:
+            HTTPException: Если курсор поврежден
         """
         filters = {}
         if user_id is not None:
@@ -88,12 +95,19 @@ class OrderController(Controller):
         if status:
             filters["status"] = status
 
-        orders = await order_service.get_by_filter(db_session, count, page, **filters)
-        total = await order_service.count(db_session, **filters)
+        try:
+            orders, total, next_cursor = await order_service.get_page(
+                db_session, count, page, cursor, total_mode, **filters
+            )
+        except ValueError as e:
+            from litestar.exceptions import HTTPException
+
+            raise HTTPException(status_code=400, detail=str(e))
 
         return OrderListResponse(
             orders=[OrderResponse.model_validate(order) for order in orders],
             total=total,
+            next_cursor=next_cursor,
         )
 
     @post()
@@ -118,15 +132,7 @@ class OrderController(Controller):
         """
         try:
             order = await order_service.create(db_session, data)
-            # Убеждаемся, что items загружены перед валидацией Pydantic
-            stmt = (
-                select(Order)
-                .where(Order.id == order.id)
-                .options(selectinload(Order.items))
-            )
-            result = await db_session.execute(stmt)
-            order_with_items = result.scalar_one()
-            return OrderResponse.model_validate(order_with_items)
+            return OrderResponse.model_validate(order)
         except ValueError as e:
             from litestar.exceptions import HTTPException
 
@@ -157,15 +163,7 @@ class OrderController(Controller):
         """
         try:
             order = await order_service.update(db_session, order_id, data)
-            # Убеждаемся, что items загружены перед валидацией Pydantic
-            stmt = (
-                select(Order)
-                .where(Order.id == order.id)
-                .options(selectinload(Order.items))
-            )
-            result = await db_session.execute(stmt)
-            order_with_items = result.scalar_one()
-            return OrderResponse.model_validate(order_with_items)
+            return OrderResponse.model_validate(order)
         except ValueError as e:
             error_message = str(e)
             if "not found" in error_message.lower():
@@ -1,8 +1,10 @@
-from litestar import Controller, delete, get, post, put
+from litestar import Controller, Response, delete, get, post, put
+from litestar.enums import MediaType
 from litestar.params import Parameter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import NotFoundException
+from app.pagination import TotalMode
 from app.schemas.product_schema import (
     ProductCreate,
     ProductListResponse,
@@ -23,24 +25,27 @@ class ProductController(Controller):
         product_service: ProductService,
         db_session: AsyncSession,
         product_id: int = Parameter(gt=0, description="ID продукта"),
-    ) -> ProductResponse:
+    ) -> Response[ProductResponse]:
         """
         Получить продукт по ID.
+
+        Тело ответа формируется сервисом: при попадании в кэш - без
+        построения объектов и валидации ProductResponse.
         Args:
             product_service: Сервис для работы с продуктами
             db_session: Сессия базы данных
             product_id: ID продукта (int)
 
         Returns:
-            ProductResponse: Данные продукта
+            Response[ProductResponse]: Данные продукта
 
         Raises:
             NotFoundException: Если продукт не найден
         """
-        product = await product_service.get_by_id(db_session, product_id)
-        if not product:
+        body = await product_service.get_json_by_id(db_session, product_id)
+        if body is None:
             raise NotFoundException(detail=f"Product with ID {product_id} not found")
-        return ProductResponse.model_validate(product)
+        return Response(content=body, media_type=MediaType.JSON)
 
     @get()
     async def get_all_products(
@@ -62,6 +67,16 @@ class ProductController(Controller):
         max_price: float | None = Parameter(
             default=None, ge=0, description="Максимальная цена"
         ),
+        cursor: str | None = Parameter(
+            default=None,
+            description="Курсор следующей страницы из предыдущего ответа "
+            "(keyset пагинация, параметр page игнорируется)",
+        ),
+        total_mode: TotalMode | None = Parameter(
+            default=None,
+            description="Подсчет общего количества: exact, approximate или none "
+            "(по умолчанию exact для page и none для cursor)",
+        ),
     ) -> ProductListResponse:
         """
         Получить список продуктов с пагинацией и фильтрацией.
@@ -73,9 +88,14 @@ class ProductController(Controller):
             name: Фильтр по названию продукта
             min_price: Минимальная цена
             max_price: Максимальная цена
+            cursor: Курсор следующей страницы (keyset пагинация)
+            total_mode: Режим подсчета общего количества
 
         Returns:
             ProductListResponse: Список продуктов и общее количество
+
+        Raises:
+            HTTPException: Если курсор поврежден
         """
         filters = {}
         if name:
@@ -85,14 +105,19 @@ class ProductController(Controller):
         if max_price is not None:
             filters["max_price"] = max_price
 
-        products = await product_service.get_by_filter(
-            db_session, count, page, **filters
-        )
-        total = await product_service.count(db_session, **filters)
+        try:
+            products, total, next_cursor = await product_service.get_page(
+                db_session, count, page, cursor, total_mode, **filters
+            )
+        except ValueError as e:
+            from litestar.exceptions import HTTPException
+
+            raise HTTPException(status_code=400, detail=str(e))
 
         return ProductListResponse(
             products=[ProductResponse.model_validate(product) for product in products],
             total=total,
+            next_cursor=next_cursor,
         )
 
     @post()
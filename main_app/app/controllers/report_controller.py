@@ -5,11 +5,17 @@ from datetime import date
 from litestar import Controller, get
 from litestar.exceptions import ValidationException
 from litestar.params import Parameter
-from sqlalchemy.ext.asyncio import AsyncSession
+from litestar.response import Stream
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.schemas.report_schema import ReportResponse
+from app.schemas.report_schema import ReportExportFormat, ReportResponse
 from app.services.report_service import ReportService
 
+EXPORT_MEDIA_TYPES = {
+    ReportExportFormat.NDJSON: ("ndjson", "application/x-ndjson"),
+    ReportExportFormat.CSV: ("csv", "text/csv"),
+}
+
 
 class ReportController(Controller):
     """Контроллер для управления отчетами."""
@@ -43,3 +49,57 @@ class ReportController(Controller):
 
         reports = await report_service.get_report_by_date(db_session, report_date)
         return [ReportResponse.model_validate(report) for report in reports]
+
+    @get("/export")
+    async def export_reports(
+        self,
+        report_service: ReportService,
+        session_factory: async_sessionmaker[AsyncSession],
+        start_date: date = Parameter(description="Начальная дата (включительно)"),
+        end_date: date = Parameter(description="Конечная дата (включительно)"),
+        export_format: ReportExportFormat = Parameter(
+            query="format",
+            default=ReportExportFormat.NDJSON,
+            description="Формат выгрузки: ndjson или csv",
+        ),
+    ) -> Stream:
+        """
+        Потоково выгрузить отчеты за диапазон дат (NDJSON или CSV).
+
+        Ответ передается частями (chunked transfer encoding), строки читаются
+        из БД серверным курсором, поэтому память воркера не растет с объемом
+        выгрузки.
+
+        Args:
+            report_service: Сервис для работы с отчетами
+            session_factory: Фабрика сессий (сессия открывается на время передачи)
+            start_date: Начальная дата (включительно)
+            end_date: Конечная дата (включительно)
+            export_format: Формат выгрузки
+
+        Returns:
+            Stream: Потоковый ответ с отчетами
+
+        Raises:
+            ValidationException: Если начальная дата позже конечной
+        """
+        if start_date > end_date:
+            raise ValidationException(detail="start_date must not be after end_date")
+
+        async def content():
+            async with session_factory() as session:
+                async for chunk in report_service.export_reports(
+                    session, start_date, end_date, export_format
+                ):
+                    yield chunk
+
+        extension, media_type = EXPORT_MEDIA_TYPES[export_format]
+        return Stream(
+            content(),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="reports_{start_date}_{end_date}.{extension}"'
+                )
+            },
+        )
@@ -1,9 +1,11 @@
-from litestar import Controller, delete, get, post, put
+from litestar import Controller, Response, delete, get, post, put
 from litestar.di import Provide
+from litestar.enums import MediaType
 from litestar.params import Parameter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import NotFoundException
+from app.pagination import TotalMode
 from app.schemas.user_schema import (
     UserCreate,
     UserListResponse,
@@ -24,24 +26,27 @@ class UserController(Controller):
         user_service: UserService,
         db_session: AsyncSession,
         user_id: int = Parameter(gt=0, description="ID пользователя"),
-    ) -> UserResponse:
+    ) -> Response[UserResponse]:
         """
         Получить пользователя по ID.
+
+        Тело ответа формируется сервисом: при попадании в кэш - без
+        построения объектов и валидации UserResponse.
         Args:
             user_service: Сервис для работы с пользователями
             db_session: Сессия базы данных
             user_id: ID пользователя (int)
 
         Returns:
-            UserResponse: Данные пользователя
+            Response[UserResponse]: Данные пользователя
 
         Raises:
             NotFoundException: Если пользователь не найден
         """
-        user = await user_service.get_by_id(db_session, user_id)
-        if not user:
+        body = await user_service.get_json_by_id(db_session, user_id)
+        if body is None:
             raise NotFoundException(detail=f"User with ID {user_id} not found")
-        return UserResponse.model_validate(user)
+        return Response(content=body, media_type=MediaType.JSON)
 
     @get()
     async def get_all_users(
@@ -54,24 +59,58 @@ class UserController(Controller):
         page: int = Parameter(
             default=1, ge=1, description="Номер страницы (начинается с 1)"
         ),
+        username: str | None = Parameter(
+            default=None, description="Фильтр по имени пользователя"
+        ),
+        email: str | None = Parameter(default=None, description="Фильтр по email"),
+        cursor: str | None = Parameter(
+            default=None,
+            description="Курсор следующей страницы из предыдущего ответа "
+            "(keyset пагинация, параметр page игнорируется)",
+        ),
+        total_mode: TotalMode | None = Parameter(
+            default=None,
+            description="Подсчет общего количества: exact, approximate или none "
+            "(по умолчанию exact для page и none для cursor)",
+        ),
     ) -> UserListResponse:
         """
-        Получить список пользователей с пагинацией.
+        Получить список пользователей с пагинацией и фильтрацией.
         Args:
             user_service: Сервис для работы с пользователями
             db_session: Сессия базы данных
             count: Количество записей на странице (1-100)
             page: Номер страницы (начинается с 1)
+            username: Фильтр по имени пользователя
+            email: Фильтр по email
+            cursor: Курсор следующей страницы (keyset пагинация)
+            total_mode: Режим подсчета общего количества
 
         Returns:
             UserListResponse: Список пользователей и общее количество (задание со звездочкой)
+
+        Raises:
+            HTTPException: Если курсор поврежден
         """
-        users = await user_service.get_by_filter(db_session, count, page)
-        total = await user_service.count(db_session)
+        filters = {}
+        if username:
+            filters["username"] = username
+        if email:
+            filters["email"] = email
+
+        try:
+            users, total, next_cursor = await user_service.get_page(
+                db_session, count, page, cursor, total_mode, **filters
+            )
+        except ValueError as e:
+            from litestar.exceptions import HTTPException
+
+            raise HTTPException(status_code=400, detail=str(e))
 
         return UserListResponse(
             users=[UserResponse.model_validate(user) for user in users],
             total=total,
+            next_cursor=next_cursor,
         )
 
     @post()
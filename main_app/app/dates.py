@@ -0,0 +1,17 @@
+"""Модуль вспомогательных функций для работы с датами."""
+
+from datetime import date, datetime, time, timedelta
+
+
+def day_range(day: date) -> tuple[datetime, datetime]:
+    """
+    Получить полуоткрытый интервал [начало дня, начало следующего дня).
+
+    Args:
+        day: Дата
+
+    Returns:
+        tuple[datetime, datetime]: Начало дня и начало следующего дня
+    """
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
@@ -0,0 +1,398 @@
+"""Модуль повторной обработки и карантина сообщений RabbitMQ.
+
+Необработанное сообщение не возвращается в начало очереди (nack с requeue
+зацикливает «ядовитые» сообщения и нагружает недоступную БД), а копируется в
+служебную очередь, после чего исходное сообщение подтверждается:
+
+- временная ошибка (недоступность БД, исчерпание пула, deadlock) - очередь
+  повтора {queue}.retry.{attempt}. Срок жизни копии (expiration) растет
+  экспоненциально с номером попытки, по его истечении RabbitMQ возвращает
+  сообщение в исходную очередь через dead-letter exchange очереди повтора.
+  Номер попытки передается заголовком x-attempts; у каждой попытки своя
+  очередь, поэтому короткие задержки не ждут длинных в голове очереди;
+- «ядовитое» сообщение (некорректные данные) или исчерпание попыток
+  (RABBITMQ_RETRY_MAX_ATTEMPTS) - очередь карантина {queue}.dlq с причиной в
+  заголовке x-error.
+
+Сообщения из карантина возвращаются в исходную очередь командой:
+
+    uv run python -m app.dead_letter order
+    uv run python -m app.dead_letter product_update --limit 100
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from aiormq.abc import DeliveredMessage
+from aiormq.exceptions import AMQPError
+from faststream import BaseMiddleware
+from faststream.rabbit import RabbitBroker, RabbitQueue
+from faststream.rabbit.annotations import RabbitMessage
+from pydantic import ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Количество неудачных попыток обработки сообщения
+ATTEMPTS_HEADER = "x-attempts"
+# Причина помещения сообщения в карантин
+ERROR_HEADER = "x-error"
+# Ошибки публикации: протокол AMQP, соединение с брокером, немаршрутизируемое
+# сообщение и закрытый канал (RuntimeError)
+PUBLISH_ERRORS = (AMQPError, OSError, RuntimeError)
+
+
+@dataclass(frozen=True)
+class RetrySettings:
+    """
+    Настройки повторной обработки сообщений.
+
+    Attributes:
+        max_attempts: Количество попыток обработки до помещения в карантин
+        base_delay_ms: Задержка перед первым повтором (в миллисекундах)
+        max_delay_ms: Максимальная задержка перед повтором (в миллисекундах)
+    """
+
+    max_attempts: int = 5
+    base_delay_ms: int = 1000
+    max_delay_ms: int = 60_000
+
+    @classmethod
+    def from_env(cls) -> "RetrySettings":
+        """
+        Создание настроек из переменных окружения.
+
+        Используются переменные RABBITMQ_RETRY_MAX_ATTEMPTS,
+        RABBITMQ_RETRY_BASE_DELAY_MS и RABBITMQ_RETRY_MAX_DELAY_MS.
+
+        Returns:
+            RetrySettings: Настройки повторной обработки
+        """
+        return cls(
+            max_attempts=max(1, int(os.getenv("RABBITMQ_RETRY_MAX_ATTEMPTS", "5"))),
+            base_delay_ms=int(os.getenv("RABBITMQ_RETRY_BASE_DELAY_MS", "1000")),
+            max_delay_ms=int(os.getenv("RABBITMQ_RETRY_MAX_DELAY_MS", "60000")),
+        )
+
+    def delay_ms(self, attempt: int) -> int:
+        """
+        Задержка перед повтором после attempt неудачных попыток.
+
+        Args:
+            attempt: Номер неудачной попытки (с 1)
+
+        Returns:
+            int: Задержка в миллисекундах (base_delay_ms * 2^(attempt-1), не
+                больше max_delay_ms)
+        """
+        return min(self.max_delay_ms, self.base_delay_ms * 2 ** (attempt - 1))
+
+
+retry_settings = RetrySettings.from_env()
+
+
+def retry_queue(queue: str, attempt: int) -> RabbitQueue:
+    """
+    Очередь повтора после attempt неудачных попыток.
+
+    Args:
+        queue: Имя исходной очереди
+        attempt: Номер неудачной попытки
+
+    Returns:
+        RabbitQueue: Очередь, возвращающая просроченные сообщения в исходную
+    """
+    return RabbitQueue(
+        f"{queue}.retry.{attempt}",
+        durable=True,
+        arguments={
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": queue,
+        },
+    )
+
+
+def dead_letter_queue(queue: str) -> RabbitQueue:
+    """
+    Очередь карантина.
+
+    Args:
+        queue: Имя исходной очереди
+
+    Returns:
+        RabbitQueue: Очередь карантина {queue}.dlq
+    """
+    return RabbitQueue(f"{queue}.dlq", durable=True)
+
+
+def get_attempts(message: RabbitMessage) -> int:
+    """
+    Количество неудачных попыток обработки сообщения.
+
+    Args:
+        message: Сообщение RabbitMQ
+
+    Returns:
+        int: Значение заголовка x-attempts (0 для новой доставки)
+    """
+    return int(message.headers.get(ATTEMPTS_HEADER, 0))
+
+
+async def declare_queues(
+    broker: RabbitBroker,
+    queues: Iterable[str],
+    settings: RetrySettings = retry_settings,
+) -> None:
+    """
+    Объявить очереди повтора и карантина.
+
+    Args:
+        broker: Брокер RabbitMQ
+        queues: Имена исходных очередей
+        settings: Настройки повторной обработки
+    """
+    for queue in queues:
+        for attempt in range(1, settings.max_attempts):
+            await broker.declare_queue(retry_queue(queue, attempt))
+        await broker.declare_queue(dead_letter_queue(queue))
+
+
+async def _republish(
+    broker: RabbitBroker,
+    message: RabbitMessage,
+    queue: str,
+    headers: dict[str, Any],
+    expiration: timedelta | None = None,
+) -> None:
+    """
+    Опубликовать копию сообщения (тело и свойства) в очередь.
+
+    Args:
+        broker: Брокер RabbitMQ
+        message: Исходное сообщение
+        queue: Имя очереди
+        headers: Заголовки копии
+        expiration: Срок жизни копии в очереди
+
+    Raises:
+        RuntimeError: Если очередь не существует (брокер вернул сообщение)
+    """
+    result = await broker.publish(
+        message.body,
+        queue,
+        headers=headers,
+        correlation_id=message.correlation_id,
+        reply_to=message.reply_to or None,
+        content_type=message.content_type or None,
+        expiration=expiration,
+        persist=True,
+        mandatory=True,
+    )
+    if isinstance(result, DeliveredMessage):
+        raise RuntimeError(f"Message returned as unroutable: queue={queue}")
+
+
+async def _move(
+    broker: RabbitBroker,
+    message: RabbitMessage,
+    queue: str,
+    headers: dict[str, Any],
+    expiration: timedelta | None = None,
+) -> bool:
+    """
+    Переместить сообщение в служебную очередь.
+
+    Публикуется копия сообщения, исходное подтверждается. Если копию
+    опубликовать не удалось (в том числе если брокер вернул ее как
+    немаршрутизируемую), исходное сообщение возвращается в очередь
+    (nack с requeue) и не теряется.
+
+    Args:
+        broker: Брокер RabbitMQ
+        message: Исходное сообщение
+        queue: Имя служебной очереди
+        headers: Заголовки копии
+        expiration: Срок жизни копии в очереди
+
+    Returns:
+        bool: True, если сообщение перемещено
+    """
+    try:
+        await _republish(broker, message, queue, headers, expiration)
+    except PUBLISH_ERRORS as e:
+        logger.error("Failed to move message to %s: %s", queue, e)
+        await message.nack(requeue=True)
+        return False
+    await message.ack()
+    return True
+
+
+async def dead_letter(
+    broker: RabbitBroker, message: RabbitMessage, queue: str, error: BaseException
+) -> None:
+    """
+    Поместить сообщение в карантин и подтвердить исходное.
+
+    Args:
+        broker: Брокер RabbitMQ
+        message: Сообщение RabbitMQ
+        queue: Имя исходной очереди
+        error: Причина
+    """
+    reason = f"{type(error).__name__}: {error}"
+    if await _move(
+        broker,
+        message,
+        dead_letter_queue(queue).name,
+        {**message.headers, ERROR_HEADER: reason[:1000]},
+    ):
+        logger.error("Message from %s quarantined: %s", queue, reason)
+
+
+async def retry_later(
+    broker: RabbitBroker,
+    message: RabbitMessage,
+    queue: str,
+    error: BaseException,
+    settings: RetrySettings = retry_settings,
+) -> None:
+    """
+    Запланировать повтор обработки с экспоненциальной задержкой.
+
+    После settings.max_attempts неудачных попыток сообщение помещается в
+    карантин.
+
+    Args:
+        broker: Брокер RabbitMQ
+        message: Сообщение RabbitMQ
+        queue: Имя исходной очереди
+        error: Ошибка обработки
+        settings: Настройки повторной обработки
+    """
+    attempt = get_attempts(message) + 1
+    if attempt >= settings.max_attempts:
+        await dead_letter(broker, message, queue, error)
+        return
+
+    delay_ms = settings.delay_ms(attempt)
+    if await _move(
+        broker,
+        message,
+        retry_queue(queue, attempt).name,
+        {**message.headers, ATTEMPTS_HEADER: attempt},
+        expiration=timedelta(milliseconds=delay_ms),
+    ):
+        logger.warning(
+            "Message from %s scheduled for retry: attempt=%s, delay=%s ms, error=%s",
+            queue,
+            attempt,
+            delay_ms,
+            error,
+        )
+
+
+class DeadLetterMiddleware(BaseMiddleware):
+    """
+    Карантин сообщений, не дошедших до подтверждения в обработчике.
+
+    Перехватывает ошибки разбора тела сообщения (ValidationError) и
+    непредвиденные ошибки обработчика: при ручном подтверждении такое
+    сообщение осталось бы неподтвержденным до закрытия канала.
+    Некорректные данные помещаются в карантин, остальные ошибки -
+    в очередь повтора.
+    """
+
+    async def consume_scope(self, call_next, msg: RabbitMessage) -> Any:
+        """
+        Обработать сообщение, направив необработанные ошибки в служебные очереди.
+
+        Args:
+            call_next: Следующий обработчик цепочки
+            msg: Сообщение RabbitMQ
+
+        Returns:
+            Результат обработчика
+        """
+        try:
+            return await call_next(msg)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # При любой ошибке сообщение осталось бы неподтвержденным
+            queue = msg.raw_message.routing_key
+            if msg.committed or queue.endswith(".dlq"):
+                raise
+            broker = self.context.get("broker")
+            if isinstance(e, ValidationError):
+                await dead_letter(broker, msg, queue, e)
+            else:
+                await retry_later(broker, msg, queue, e)
+
+
+async def replay(broker: RabbitBroker, queue: str, limit: int | None = None) -> int:
+    """
+    Вернуть сообщения из карантина в исходную очередь.
+
+    Счетчик попыток и причина карантина удаляются из заголовков.
+
+    Args:
+        broker: Подключенный брокер RabbitMQ
+        queue: Имя исходной очереди
+        limit: Максимальное количество сообщений (None - все)
+
+    Returns:
+        int: Количество возвращенных сообщений
+    """
+    subscriber = broker.subscriber(dead_letter_queue(queue), persistent=False)
+    await subscriber.start()
+    replayed = 0
+    try:
+        while limit is None or replayed < limit:
+            message = await subscriber.get_one(timeout=1)
+            if message is None:
+                break
+            headers = {
+                key: value
+                for key, value in message.headers.items()
+                if key not in (ATTEMPTS_HEADER, ERROR_HEADER)
+            }
+            await _republish(broker, message, queue, headers)
+            await message.ack()
+            replayed += 1
+    finally:
+        await subscriber.stop()
+    return replayed
+
+
+async def main() -> None:
+    """Точка входа командной строки."""
+    # Импорт здесь: модуль consumer регистрирует подписчиков при импорте
+    from app.rabbitmq_consumer import get_rabbitmq_url
+
+    parser = argparse.ArgumentParser(
+        description="Возврат сообщений из карантина в исходную очередь"
+    )
+    parser.add_argument("queue", help="Имя исходной очереди (например, order)")
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Максимальное количество сообщений"
+    )
+    args = parser.parse_args()
+
+    broker = RabbitBroker(get_rabbitmq_url())
+    await broker.connect()
+    try:
+        count = await replay(broker, args.queue, args.limit)
+        logger.info("Сообщения возвращены из %s.dlq: %s", args.queue, count)
+    finally:
+        await broker.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(main())
@@ -1,8 +1,8 @@
-import redis
-from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as aioredis
+from litestar.datastructures import State
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.database import async_session_factory
-from app.redis_client import get_redis_client
 from app.repositories.order_repository import OrderRepository
 from app.repositories.product_repository import ProductRepository
 from app.repositories.report_repository import ReportRepository
@@ -13,17 +13,21 @@ from app.services.report_service import ReportService
 from app.services.user_service import UserService
 
 
-def provide_redis_client() -> redis.Redis:
+def provide_redis_client(state: State) -> aioredis.Redis:
     """
     Провайдер клиента Redis.
 
-    Создает и возвращает клиент Redis с использованием настроек из переменных окружения.
-    Клиент создается при каждом запросе (stateless).
+    Возвращает общий асинхронный клиент Redis, созданный при запуске приложения
+    (см. app.redis_client.init_redis). Клиент использует пул соединений,
+    поэтому при обработке запроса новое подключение не создается.
+
+    Args:
+        state: Состояние приложения Litestar
 
     Returns:
-        redis.Redis: Экземпляр клиента Redis
+        aioredis.Redis: Экземпляр клиента Redis
     """
-    return get_redis_client()
+    return state.redis_client
 
 
 async def provide_db_session() -> AsyncSession:
@@ -43,6 +47,20 @@ async def provide_db_session() -> AsyncSession:
             await session.close()
 
 
+def provide_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Провайдер фабрики сессий базы данных.
+
+    Нужен для потоковых ответов: тело ответа отправляется после завершения
+    обработчика и закрытия db_session, поэтому генератор ответа открывает
+    собственную сессию.
+
+    Returns:
+        async_sessionmaker[AsyncSession]: Фабрика асинхронных сессий
+    """
+    return async_session_factory
+
+
 async def provide_user_repository(db_session: AsyncSession) -> UserRepository:
     """
     Провайдер репозитория пользователей.
@@ -57,7 +75,9 @@ async def provide_user_repository(db_session: AsyncSession) -> UserRepository:
 
 
 async def provide_user_service(
-    user_repository: UserRepository, redis_client: redis.Redis
+    user_repository: UserRepository,
+    redis_client: aioredis.Redis,
+    session_factory: async_sessionmaker[AsyncSession],
 ) -> UserService:
     """
     Провайдер сервиса пользователей.
@@ -65,11 +85,12 @@ async def provide_user_service(
     Args:
         user_repository: Репозиторий пользователей (внедряется через DI)
         redis_client: Клиент Redis для кэширования (внедряется через DI)
+        session_factory: Фабрика сессий для загрузки промахов кэша (внедряется через DI)
 
     Returns:
         UserService: Экземпляр сервиса пользователей
     """
-    return UserService(user_repository, redis_client)
+    return UserService(user_repository, redis_client, session_factory=session_factory)
 
 
 async def provide_product_repository(db_session: AsyncSession) -> ProductRepository:
@@ -86,7 +107,9 @@ async def provide_product_repository(db_session: AsyncSession) -> ProductReposit
 
 
 async def provide_product_service(
-    product_repository: ProductRepository, redis_client: redis.Redis
+    product_repository: ProductRepository,
+    redis_client: aioredis.Redis,
+    session_factory: async_sessionmaker[AsyncSession],
 ) -> ProductService:
     """
     Провайдер сервиса продуктов.
@@ -94,11 +117,14 @@ async def provide_product_service(
     Args:
         product_repository: Репозиторий продуктов (внедряется через DI)
         redis_client: Клиент Redis для кэширования (внедряется через DI)
+        session_factory: Фабрика сессий для загрузки промахов кэша (внедряется через DI)
 
     Returns:
         ProductService: Экземпляр сервиса продуктов
     """
-    return ProductService(product_repository, redis_client)
+    return ProductService(
+        product_repository, redis_client, session_factory=session_factory
+    )
 
 
 async def provide_order_repository(db_session: AsyncSession) -> OrderRepository:
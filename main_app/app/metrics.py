@@ -0,0 +1,159 @@
+"""Модуль для сбора метрик приложения в текстовом формате Prometheus."""
+
+from collections.abc import Callable
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Гистограмма длительностей (в секундах) с накопительными бакетами."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """
+        Инициализация гистограммы.
+
+        Args:
+            name: Имя метрики
+            description: Описание метрики
+            buckets: Верхние границы бакетов в секундах
+        """
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Зарегистрировать наблюдение.
+
+        Args:
+            value: Значение (длительность в секундах)
+        """
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[index] += 1
+
+    def render(self) -> list[str]:
+        """Сформировать строки метрики в формате Prometheus."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for bound, bucket_count in zip(self.buckets, self.bucket_counts):
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {bucket_count}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.sum}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+class Counter:
+    """Монотонно возрастающий счетчик с необязательными метками."""
+
+    def __init__(self, name: str, description: str):
+        """
+        Инициализация счетчика.
+
+        Args:
+            name: Имя метрики
+            description: Описание метрики
+        """
+        self.name = name
+        self.description = description
+        self.values: dict[tuple[tuple[str, str], ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        Увеличить значение счетчика.
+
+        Args:
+            amount: Величина приращения
+            **labels: Метки значения
+        """
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        """Получить текущее значение счетчика для указанных меток."""
+        return self.values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> list[str]:
+        """Сформировать строки метрики в формате Prometheus."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+        for key, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Gauge:
+    """Метрика-показатель, значение которой вычисляется при экспорте."""
+
+    def __init__(self, name: str, description: str, getter: Callable[[], float]):
+        """
+        Инициализация показателя.
+
+        Args:
+            name: Имя метрики
+            description: Описание метрики
+            getter: Функция, возвращающая текущее значение
+        """
+        self.name = name
+        self.description = description
+        self.getter = getter
+
+    def render(self) -> list[str]:
+        """Сформировать строки метрики в формате Prometheus."""
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {self.getter()}",
+        ]
+
+
+_registry: dict[str, Histogram | Counter | Gauge] = {}
+
+
+def register(metric: Histogram | Counter | Gauge) -> Histogram | Counter | Gauge:
+    """
+    Зарегистрировать метрику для экспорта (повторная регистрация заменяет ее).
+
+    Args:
+        metric: Метрика
+
+    Returns:
+        Зарегистрированная метрика
+    """
+    _registry[metric.name] = metric
+    return metric
+
+
+def render_metrics() -> str:
+    """
+    Сформировать все зарегистрированные метрики в формате Prometheus.
+
+    Returns:
+        str: Текст для ответа эндпоинта /metrics
+    """
+    lines: list[str] = []
+    for metric in _registry.values():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(key: tuple[tuple[str, str], ...]) -> str:
+    """Сформировать строку меток в формате Prometheus."""
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in key) + "}"
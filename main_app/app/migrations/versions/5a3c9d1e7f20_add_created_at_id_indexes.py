@@ -0,0 +1,31 @@
+"""add created_at, id indexes for keyset pagination
+
+Revision ID: 5a3c9d1e7f20
+Revises: bf507bdc6f82
+Create Date: 2026-10-16 10:12:41.508233
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5a3c9d1e7f20'
+down_revision: Union[str, Sequence[str], None] = 'bf507bdc6f82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('idx_products_created_at_id', 'products', ['created_at', 'id'], unique=False)
+    op.create_index('idx_orders_created_at_id', 'orders', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_orders_created_at_id', table_name='orders')
+    op.drop_index('idx_products_created_at_id', table_name='products')
+    op.drop_index('idx_users_created_at_id', table_name='users')
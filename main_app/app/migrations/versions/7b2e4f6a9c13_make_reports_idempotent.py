@@ -0,0 +1,53 @@
+"""make reports unique per date and order, add report watermarks
+
+Revision ID: 7b2e4f6a9c13
+Revises: 5a3c9d1e7f20
+Create Date: 2026-10-16 11:02:17.245871
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4f6a9c13'
+down_revision: Union[str, Sequence[str], None] = '5a3c9d1e7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Удаляем дубликаты отчетов, оставляя самый ранний
+    op.execute(
+        """
+        DELETE FROM reports r
+        USING reports d
+        WHERE r.report_at = d.report_at
+          AND r.order_id = d.order_id
+          AND r.id > d.id
+        """
+    )
+    # Пересоздаем существующий индекс уникальным и превращаем его в ограничение
+    op.drop_index('idx_report_at_order_id', table_name='reports')
+    op.create_index('idx_report_at_order_id', 'reports', ['report_at', 'order_id'], unique=True)
+    op.execute(
+        'ALTER TABLE reports ADD CONSTRAINT idx_report_at_order_id '
+        'UNIQUE USING INDEX idx_report_at_order_id'
+    )
+
+    op.create_table('report_watermarks',
+    sa.Column('report_at', sa.Date(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('report_at')
+    )
+    op.create_index('idx_orders_updated_at', 'orders', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_orders_updated_at', table_name='orders')
+    op.drop_table('report_watermarks')
+    op.drop_constraint('idx_report_at_order_id', 'reports', type_='unique')
+    op.create_index('idx_report_at_order_id', 'reports', ['report_at', 'order_id'], unique=False)
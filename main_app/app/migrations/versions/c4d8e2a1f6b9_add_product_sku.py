@@ -0,0 +1,29 @@
+"""add products.sku natural key for bulk catalog upserts
+
+Revision ID: c4d8e2a1f6b9
+Revises: 7b2e4f6a9c13
+Create Date: 2026-10-16 14:21:05.318742
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2a1f6b9'
+down_revision: Union[str, Sequence[str], None] = '7b2e4f6a9c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('sku', sa.String(), nullable=True))
+    op.create_unique_constraint('products_sku_key', 'products', ['sku'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('products_sku_key', 'products', type_='unique')
+    op.drop_column('products', 'sku')
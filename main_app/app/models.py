@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey, Index
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -28,6 +28,9 @@ class User(Base):
     addresses = relationship("Address", back_populates="user")
     orders = relationship("Order", back_populates="user")
 
+    # Составной индекс для keyset пагинации (ORDER BY created_at DESC, id DESC)
+    __table_args__ = (Index("idx_users_created_at_id", "created_at", "id"),)
+
 
 class Address(Base):
     __tablename__ = "addresses"
@@ -60,6 +63,8 @@ class Product(Base):
         autoincrement=True,
     )
     name: Mapped[str] = mapped_column(nullable=False)
+    # Артикул - естественный ключ для загрузки каталога (upsert по sku)
+    sku: Mapped[Optional[str]] = mapped_column(nullable=True, unique=True)
     description: Mapped[str] = mapped_column(nullable=True)
     price: Mapped[float] = mapped_column(nullable=False)
     stock_quantity: Mapped[int] = mapped_column(nullable=False, default=0)
@@ -71,6 +76,9 @@ class Product(Base):
     # связь с элементами заказов
     order_items = relationship("OrderItem", back_populates="product")
 
+    # Составной индекс для keyset пагинации (ORDER BY created_at DESC, id DESC)
+    __table_args__ = (Index("idx_products_created_at_id", "created_at", "id"),)
+
 
 class OrderItem(Base):
     """Промежуточная таблица для связи Order и Product (many-to-many)."""
@@ -122,6 +130,13 @@ class Order(Base):
     )
     reports = relationship("Report", back_populates="order")
 
+    # Составной индекс для keyset пагинации (ORDER BY created_at DESC, id DESC)
+    # и индекс для инкрементального формирования отчетов по измененным заказам
+    __table_args__ = (
+        Index("idx_orders_created_at_id", "created_at", "id"),
+        Index("idx_orders_updated_at", "updated_at"),
+    )
+
 
 class Report(Base):
     __tablename__ = "reports"
@@ -140,4 +155,16 @@ class Report(Base):
     # Связь с заказом
     order = relationship("Order", back_populates="reports")
 
-    __table_args__ = (Index("idx_report_at_order_id", "report_at", "order_id"),)
+    # Уникальность отчета по заказу за дату (повторный запуск обновляет отчет)
+    __table_args__ = (
+        UniqueConstraint("report_at", "order_id", name="idx_report_at_order_id"),
+    )
+
+
+class ReportWatermark(Base):
+    """Отметка времени последнего формирования отчетов за дату."""
+
+    __tablename__ = "report_watermarks"
+
+    report_at: Mapped[date] = mapped_column(primary_key=True)
+    processed_at: Mapped[datetime] = mapped_column(nullable=False)
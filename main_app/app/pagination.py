@@ -0,0 +1,300 @@
+"""Модуль для keyset (cursor) пагинации списков."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from enum import StrEnum
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import Select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+
+class TotalMode(StrEnum):
+    """
+    Способ подсчета общего количества записей в ответе списка.
+
+    Attributes:
+        EXACT: Точное значение (оконная функция в запросе страницы)
+        APPROXIMATE: Оценка по статистике PostgreSQL (pg_class.reltuples)
+            для списков без фильтров, иначе точное значение
+        NONE: Не считать общее количество
+    """
+
+    EXACT = "exact"
+    APPROXIMATE = "approximate"
+    NONE = "none"
+
+
+def resolve_total_mode(total_mode: TotalMode | None, cursor: str | None) -> TotalMode:
+    """
+    Определить режим подсчета общего количества, если клиент его не указал.
+
+    Курсор используется для обхода списка страница за страницей, поэтому
+    по умолчанию точный COUNT выполняется только для страниц по номеру
+    (общее количество клиент получает с первой страницы).
+
+    Args:
+        total_mode: Режим из запроса или None
+        cursor: Курсор из запроса или None
+
+    Returns:
+        TotalMode: Режим из запроса, иначе NONE для курсора и EXACT для страниц
+    """
+    if total_mode is not None:
+        return total_mode
+    return TotalMode.NONE if cursor else TotalMode.EXACT
+
+
+def encode_cursor(created_at: datetime, entity_id: int) -> str:
+    """
+    Сформировать непрозрачный курсор по ключу сортировки (created_at, id).
+
+    Args:
+        created_at: Дата создания последней записи страницы
+        entity_id: ID последней записи страницы
+
+    Returns:
+        str: Курсор в формате base64url
+    """
+    payload = json.dumps([created_at.isoformat(), entity_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Разобрать курсор, полученный от клиента.
+
+    Args:
+        cursor: Курсор в формате base64url
+
+    Returns:
+        tuple[datetime, int]: Ключ сортировки (created_at, id)
+
+    Raises:
+        ValueError: Если курсор поврежден
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, entity_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(entity_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def apply_keyset(
+    stmt: Select,
+    created_at_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+) -> Select:
+    """
+    Применить keyset пагинацию к запросу (сортировка по убыванию created_at, id).
+
+    Вместо OFFSET используется условие (created_at, id) < (:created_at, :id),
+    которое обслуживается составным индексом, поэтому стоимость любой страницы
+    одинакова.
+
+    Args:
+        stmt: Исходный запрос с фильтрами
+        created_at_column: Колонка created_at модели
+        id_column: Колонка id модели
+        limit: Максимальное количество записей
+        after: Ключ последней записи предыдущей страницы
+
+    Returns:
+        Select: Запрос с условием поиска, сортировкой и лимитом
+    """
+    if after is not None:
+        stmt = stmt.where(tuple_(created_at_column, id_column) < tuple_(*after))
+    return stmt.order_by(created_at_column.desc(), id_column.desc()).limit(limit)
+
+
+async def estimate_row_count(session: AsyncSession, table_name: str) -> int | None:
+    """
+    Оценить количество строк таблицы по статистике планировщика PostgreSQL.
+
+    Значение pg_class.reltuples обновляется VACUUM/ANALYZE и читается без
+    сканирования таблицы.
+
+    Args:
+        session: Асинхронная сессия базы данных
+        table_name: Имя таблицы
+
+    Returns:
+        int | None: Оценка количества строк или None, если оценка недоступна
+            (не PostgreSQL или статистика еще не собрана)
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+
+    result = await session.execute(
+        text(
+            "SELECT reltuples::bigint FROM pg_class "
+            "WHERE oid = to_regclass(:table_name)"
+        ),
+        {"table_name": table_name},
+    )
+    estimate = result.scalar_one_or_none()
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
+
+
+class Paginator(Generic[T]):
+    """
+    Страницы списка сущности по номеру или курсору с общим количеством.
+
+    Общая логика сервисов списков. Репозиторий сущности предоставляет
+    get_by_filter, get_by_filter_with_total, get_by_cursor, count и
+    estimate_count; записи списка имеют поля created_at и id.
+    """
+
+    def __init__(self, repository: Any):
+        """
+        Инициализация.
+
+        Args:
+            repository: Репозиторий сущности
+        """
+        self.repository = repository
+
+    async def get_by_filter_with_total(
+        self,
+        session: AsyncSession,
+        count: int,
+        page: int,
+        total_mode: TotalMode = TotalMode.EXACT,
+        **kwargs,
+    ) -> tuple[list[T], int | None]:
+        """
+        Получить страницу по номеру и общее количество в выбранном режиме.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            page: Номер страницы (начинается с 1)
+            total_mode: Режим подсчета общего количества
+            **kwargs: Фильтры репозитория
+
+        Returns:
+            Список записей и общее количество (None для режима none)
+        """
+        if total_mode != TotalMode.EXACT:
+            items = await self.repository.get_by_filter(session, count, page, **kwargs)
+            return items, await self.get_total(session, total_mode, **kwargs)
+
+        return await self.repository.get_by_filter_with_total(
+            session, count, page, **kwargs
+        )
+
+    async def get_total(
+        self,
+        session: AsyncSession,
+        total_mode: TotalMode = TotalMode.EXACT,
+        **kwargs,
+    ) -> int | None:
+        """
+        Получить общее количество записей в выбранном режиме.
+
+        Приблизительная оценка используется только для списка без фильтров;
+        если она недоступна, выполняется точный COUNT.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            total_mode: Режим подсчета общего количества
+            **kwargs: Фильтры репозитория
+
+        Returns:
+            Общее количество (None для режима none)
+        """
+        if total_mode == TotalMode.NONE:
+            return None
+        if total_mode == TotalMode.APPROXIMATE and not kwargs:
+            estimate = await self.repository.estimate_count(session)
+            if estimate is not None:
+                return estimate
+        return await self.repository.count(session, **kwargs)
+
+    async def get_by_cursor(
+        self, session: AsyncSession, count: int, cursor: str | None = None, **kwargs
+    ) -> tuple[list[T], str | None]:
+        """
+        Получить страницу по курсору (keyset пагинация).
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            cursor: Курсор из предыдущего ответа (None - первая страница)
+            **kwargs: Фильтры репозитория
+
+        Returns:
+            Список записей и курсор следующей страницы (None, если страница последняя)
+
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        after = decode_cursor(cursor) if cursor else None
+        # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+        items = await self.repository.get_by_cursor(session, count + 1, after, **kwargs)
+        if len(items) <= count:
+            return items, None
+
+        items = items[:count]
+        return items, encode_cursor(items[-1].created_at, items[-1].id)
+
+    async def get_page(
+        self,
+        session: AsyncSession,
+        count: int,
+        page: int = 1,
+        cursor: str | None = None,
+        total_mode: TotalMode | None = None,
+        **kwargs,
+    ) -> tuple[list[T], int | None, str | None]:
+        """
+        Получить страницу для ответа списка.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            page: Номер страницы (игнорируется, если передан курсор)
+            cursor: Курсор из предыдущего ответа (keyset пагинация)
+            total_mode: Режим подсчета общего количества (по умолчанию
+                exact для страниц по номеру и none для курсора)
+            **kwargs: Фильтры репозитория
+
+        Returns:
+            Список записей, общее количество (None для режима none)
+            и курсор следующей страницы (None, если страница последняя)
+
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        total_mode = resolve_total_mode(total_mode, cursor)
+        if cursor:
+            items, next_cursor = await self.get_by_cursor(
+                session, count, cursor, **kwargs
+            )
+            total = await self.get_total(session, total_mode, **kwargs)
+            return items, total, next_cursor
+
+        items, total = await self.get_by_filter_with_total(
+            session, count, page, total_mode, **kwargs
+        )
+        has_more = (
+            page * count < total
+            if total_mode == TotalMode.EXACT
+            else len(items) == count
+        )
+        next_cursor = (
+            encode_cursor(items[-1].created_at, items[-1].id)
+            if items and has_more
+            else None
+        )
+        return items, total, next_cursor
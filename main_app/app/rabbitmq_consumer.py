@@ -1,30 +1,80 @@
-"""Модуль для обработки сообщений из RabbitMQ."""
+"""Модуль для обработки сообщений из RabbitMQ.
+
+Сообщения очереди обрабатываются пакетами: обработчики подписчиков
+выполняются параллельно (до RABBITMQ_PREFETCH_COUNT неподтвержденных
+сообщений на подписчика, для отдельных очередей лимит задается
+RABBITMQ_QUEUE_CONCURRENCY), MicroBatcher очереди собирает до RABBITMQ_BATCH_SIZE
+сообщений или ждет RABBITMQ_BATCH_TIMEOUT_MS миллисекунд, и пакет
+обрабатывается в одной транзакции БД (app.batching.process_in_transaction).
+
+Каждое сообщение подтверждается отдельно после фиксации транзакции пакета:
+- обработано - ack;
+- отклонено (ValueError, нарушение ограничения БД, ошибка в данных или
+  запросе элемента - DataError, ProgrammingError) - reject, его изменения
+  откатываются до точки сохранения, остальные сообщения пакета фиксируются.
+  Отказ - результат обработки, а не сбой: такое сообщение не помещается в
+  карантин, повторная отправка дала бы тот же отказ;
+- ошибка соединения с БД (OperationalError, InterfaceError, разрыв
+  соединения, исчерпание пула) - повтор пакета с экспоненциальной задержкой
+  через очереди {queue}.retry.N, после RABBITMQ_RETRY_MAX_ATTEMPTS попыток -
+  карантин (см. app.dead_letter).
+  Повторные доставки обрабатываются по одной, чтобы «ядовитое» сообщение не
+  срывало пакеты с другими сообщениями.
+
+После RABBITMQ_BREAKER_FAILURE_THRESHOLD ошибок пакетов подряд обработка
+приостанавливается на RABBITMQ_BREAKER_RESET_TIMEOUT_MS миллисекунд
+(app.batching.CircuitBreaker): ожидающие обработчики занимают слоты prefetch,
+и при деградации БД брокер перестает доставлять сообщения.
+
+Результат обработки заказа публикуется до подтверждения: отклоненные заказы
+(например, при нехватке товара) с причиной отказа - в очередь order_rejected,
+а если у сообщения задан reply_to - результат отправляется и в него.
+Публикация результата не влияет на подтверждение: заказ уже зафиксирован, и
+повторная обработка сообщения создала бы его повторно.
+
+Изменения продукции удаляются из кэша Redis после фиксации пакета
+(ProductService.invalidate_cache): до фиксации параллельное чтение вернуло бы
+в кэш прежние данные.
+
+Очереди повтора и карантина объявляются до запуска подписчиков (хук
+on_startup), чтобы копии сообщений не публиковались в несуществующие очереди.
+"""
 
 import logging
 import os
-from typing import Annotated
-
-from faststream import Depends, FastStream
-from faststream.rabbit import RabbitBroker
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+
+import redis.asyncio as aioredis
+from faststream import AckPolicy, FastStream
+from faststream.rabbit import Channel, RabbitBroker, RabbitQueue
+from faststream.rabbit.annotations import RabbitMessage
+from pydantic import BaseModel
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import async_session_factory
-from app.dependencies import (
-    provide_order_repository,
-    provide_order_service,
-    provide_product_repository,
-    provide_product_service,
+from app.batching import CircuitBreaker, MicroBatcher, process_in_transaction
+from app.database import dispose_engine, engine
+from app.dead_letter import (
+    DeadLetterMiddleware,
+    declare_queues,
+    get_attempts,
+    retry_later,
 )
+from app.models import Order, Product
+from app.redis_client import create_redis_pool
 from app.repositories.order_repository import OrderRepository
 from app.repositories.product_repository import ProductRepository
 from app.schemas.order_schema import (
     OrderCreate,
-    OrderUpdate,
+    OrderResultMessage,
     OrderUpdateMessage,
 )
 from app.schemas.product_schema import (
     ProductCreate,
-    ProductUpdate,
     ProductUpdateMessage,
 )
 from app.services.order_service import OrderService
@@ -34,6 +84,115 @@ from app.services.product_service import ProductService
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Очередь отклоненных заказов (результат с причиной отказа и данными заказа)
+ORDER_REJECTED_QUEUE = "order_rejected"
+
+
+@dataclass(frozen=True)
+class ConsumerSettings:
+    """
+    Настройки пакетной обработки сообщений RabbitMQ.
+
+    Attributes:
+        prefetch_count: Количество неподтвержденных сообщений на канал
+            (не меньше batch_size, иначе пакет не заполнится)
+        batch_size: Максимальное количество сообщений в пакете (1 - каждое
+            сообщение обрабатывается в своей транзакции)
+        batch_timeout_ms: Максимальное ожидание заполнения пакета
+            (в миллисекундах)
+        breaker_failure_threshold: Количество ошибок пакетов подряд, после
+            которого обработка приостанавливается
+        breaker_reset_timeout_ms: Длительность приостановки обработки
+            (в миллисекундах)
+        queue_concurrency: Количество неподтвержденных сообщений на процесс
+            для отдельных очередей (вместо prefetch_count). Каждое сообщение
+            в обработке занимает не больше одного соединения с БД, поэтому
+            лимит очереди меньше размера пула оставляет соединения
+            остальным очередям
+        graceful_timeout_ms: Ожидание обработки полученных сообщений при
+            остановке (в миллисекундах)
+    """
+
+    prefetch_count: int = 100
+    batch_size: int = 1
+    batch_timeout_ms: int = 50
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout_ms: int = 5000
+    queue_concurrency: dict[str, int] = field(default_factory=dict)
+    graceful_timeout_ms: int = 30_000
+
+    @classmethod
+    def from_env(cls) -> "ConsumerSettings":
+        """
+        Создание настроек из переменных окружения.
+
+        Используются переменные RABBITMQ_PREFETCH_COUNT, RABBITMQ_BATCH_SIZE,
+        RABBITMQ_BATCH_TIMEOUT_MS, RABBITMQ_BREAKER_FAILURE_THRESHOLD,
+        RABBITMQ_BREAKER_RESET_TIMEOUT_MS, RABBITMQ_QUEUE_CONCURRENCY (в
+        формате "order=10,product_update=50") и RABBITMQ_GRACEFUL_TIMEOUT_MS.
+
+        Returns:
+            ConsumerSettings: Настройки обработки сообщений
+
+        Raises:
+            ValueError: Если RABBITMQ_QUEUE_CONCURRENCY задана в неверном формате
+        """
+        batch_size = max(1, int(os.getenv("RABBITMQ_BATCH_SIZE", "1")))
+        return cls(
+            prefetch_count=max(
+                batch_size, int(os.getenv("RABBITMQ_PREFETCH_COUNT", "100"))
+            ),
+            batch_size=batch_size,
+            batch_timeout_ms=int(os.getenv("RABBITMQ_BATCH_TIMEOUT_MS", "50")),
+            breaker_failure_threshold=max(
+                1, int(os.getenv("RABBITMQ_BREAKER_FAILURE_THRESHOLD", "5"))
+            ),
+            breaker_reset_timeout_ms=int(
+                os.getenv("RABBITMQ_BREAKER_RESET_TIMEOUT_MS", "5000")
+            ),
+            queue_concurrency=parse_queue_limits(
+                os.getenv("RABBITMQ_QUEUE_CONCURRENCY", "")
+            ),
+            graceful_timeout_ms=int(os.getenv("RABBITMQ_GRACEFUL_TIMEOUT_MS", "30000")),
+        )
+
+    def prefetch_for(self, queue: str) -> int:
+        """
+        Количество неподтвержденных сообщений очереди на процесс.
+
+        Args:
+            queue: Имя очереди
+
+        Returns:
+            int: Лимит очереди из queue_concurrency или prefetch_count
+        """
+        return self.queue_concurrency.get(queue, self.prefetch_count)
+
+
+def parse_queue_limits(value: str) -> dict[str, int]:
+    """
+    Разобрать лимиты очередей в формате "order=10,product_update=50".
+
+    Args:
+        value: Строка с лимитами (пустая - лимитов нет)
+
+    Returns:
+        dict[str, int]: Лимит по имени очереди
+
+    Raises:
+        ValueError: Если строка задана в неверном формате или лимит меньше 1
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        queue, separator, limit = item.partition("=")
+        if not separator or not queue.strip() or int(limit) < 1:
+            raise ValueError(f"Invalid queue limit: {item!r}")
+        limits[queue.strip()] = int(limit)
+    return limits
+
+
+consumer_settings = ConsumerSettings.from_env()
+
 
 def get_rabbitmq_url() -> str:
     """
@@ -54,199 +213,436 @@ def get_rabbitmq_url() -> str:
     return f"amqp://{user}:{password}@{host}:{port}/{vhost}"
 
 
-# Инициализация брокера и приложения
-rabbitmq_url = get_rabbitmq_url()
-logger.info("Connecting to RabbitMQ: %s", rabbitmq_url)
+# Обработка отдельных сообщений (в сессии, присоединенной к транзакции пакета)
+async def handle_product_create(
+    session: AsyncSession, product_data: ProductCreate | list[ProductCreate]
+) -> Product | list[Product]:
+    """
+    Создать продукт или загрузить массив продуктов.
+
+    Массив загружается одним многострочным INSERT с upsert по артикулу
+    (sku): повторная доставка сообщения не создает дубликаты продуктов.
+    Сервис создается без Redis: кэш очищается после фиксации пакета
+    (invalidate_products).
+
+    Args:
+        session: Сессия базы данных
+        product_data: Данные продукта или массив данных продуктов
+
+    Returns:
+        Product | list[Product]: Созданный продукт или загруженные продукты
+
+    Raises:
+        ValueError: Если данные продукта некорректны
+    """
+    product_service = ProductService(ProductRepository())
+    if isinstance(product_data, list):
+        products = await product_service.bulk_create(session, product_data, upsert=True)
+        logger.info("Products loaded successfully: count=%s", len(products))
+        return products
+
+    product = await product_service.create(session, product_data)
+    logger.info(
+        "Product created successfully: ID=%s, Name=%s", product.id, product.name
+    )
+    return product
+
+
+async def handle_product_update(
+    session: AsyncSession, message: ProductUpdateMessage
+) -> Product:
+    """
+    Обновить продукт.
+
+    Сервис создается без Redis: кэш очищается после фиксации пакета
+    (invalidate_products).
+
+    Args:
+        session: Сессия базы данных
+        message: Сообщение с ID продукта и данными для обновления
+
+    Returns:
+        Product: Обновленный продукт
+
+    Raises:
+        ValueError: Если продукт не найден
+    """
+    product = await ProductService(ProductRepository()).update(
+        session, message.product_id, message.product_data
+    )
+    logger.info(
+        "Product updated successfully: ID=%s, Stock=%s",
+        product.id,
+        product.stock_quantity,
+    )
+
+    # Проверка, не закончился ли товар на складе
+    if product.stock_quantity == 0:
+        logger.warning("Product %s (ID=%s) is out of stock!", product.name, product.id)
+    return product
+
+
+async def handle_order_create(session: AsyncSession, order_data: OrderCreate) -> Order:
+    """
+    Создать заказ.
+
+    Наличие товара проверяется только резервированием в OrderService.create:
+    один условный UPDATE по всем позициям заказа, без предварительного чтения
+    остатков (в том числе из кэша).
+
+    Args:
+        session: Сессия базы данных
+        order_data: Данные для создания заказа
+
+    Returns:
+        Order: Созданный заказ
+
+    Raises:
+        ValueError: Если товар не найден или его недостаточно на складе
+    """
+    order = await OrderService(OrderRepository(), ProductRepository()).create(
+        session, order_data
+    )
+    logger.info(
+        "Order created successfully: ID=%s, User ID=%s, Total=%s",
+        order.id,
+        order.user_id,
+        order.total_price,
+    )
+    return order
+
+
+async def handle_order_update(
+    session: AsyncSession, message: OrderUpdateMessage
+) -> None:
+    """
+    Обновить статус заказа.
+
+    Args:
+        session: Сессия базы данных
+        message: Сообщение с ID заказа и данными для обновления
+
+    Raises:
+        ValueError: Если заказ не найден
+    """
+    order = await OrderService(OrderRepository(), ProductRepository()).update(
+        session, message.order_id, message.order_data
+    )
+    logger.info("Order updated successfully: ID=%s, Status=%s", order.id, order.status)
+
+
+# Общий для всех очередей: все пакеты обращаются к одной БД
+breaker = CircuitBreaker(
+    consumer_settings.breaker_failure_threshold,
+    consumer_settings.breaker_reset_timeout_ms / 1000,
+)
+
+
+def is_batch_failure(error: BaseException) -> bool:
+    """
+    Проверить, является ли ошибка пакета сбоем соединения с БД.
+
+    Такие ошибки временные: пакет повторяется с задержкой и учитывается
+    размыкателем. Детерминированные ошибки (DataError, ProgrammingError)
+    отклоняют отдельный элемент в process_in_transaction.
+
+    Args:
+        error: Ошибка, прервавшая обработку пакета
+
+    Returns:
+        bool: True для ошибок соединения и исчерпания пула
+    """
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(
+        error, (OperationalError, InterfaceError, PoolTimeoutError, OSError)
+    )
+
+
+async def process_batch(handler, items: list[Any]) -> list[Any]:
+    """
+    Обработать пакет в одной транзакции и учесть его исход в размыкателе.
+
+    Args:
+        handler: Обработчик одного сообщения (session, message)
+        items: Сообщения пакета
+
+    Returns:
+        list[Any]: Результаты process_in_transaction
+    """
+    return await breaker.call(
+        process_in_transaction, engine, handler, items, is_failure=is_batch_failure
+    )
 
-broker = RabbitBroker(rabbitmq_url)
-app = FastStream(broker)
 
+def create_batcher(handler) -> MicroBatcher[BaseModel | list[BaseModel], Any]:
+    """
+    Создать накопитель пакетов очереди.
 
-# Провайдеры для dependency injection
-async def get_db_session() -> AsyncSession:
-    """Провайдер сессии базы данных для RabbitMQ consumer."""
-    async with async_session_factory() as session:
+    Args:
+        handler: Обработчик одного сообщения (session, message)
+
+    Returns:
+        MicroBatcher: Накопитель, обрабатывающий пакет в одной транзакции
+    """
+    return MicroBatcher(
+        partial(process_batch, handler),
+        max_size=consumer_settings.batch_size,
+        max_delay=consumer_settings.batch_timeout_ms / 1000,
+    )
+
+
+batchers = {
+    "product": create_batcher(handle_product_create),
+    "product_update": create_batcher(handle_product_update),
+    "order": create_batcher(handle_order_create),
+    "order_update": create_batcher(handle_order_update),
+}
+
+
+async def process_message(
+    queue: str,
+    data: BaseModel | list[BaseModel],
+    message: RabbitMessage,
+    on_result: Callable[[Any], Awaitable[None]] | None = None,
+) -> None:
+    """
+    Обработать сообщение в пакете очереди и подтвердить его.
+
+    Args:
+        queue: Имя очереди
+        data: Данные сообщения
+        message: Сообщение RabbitMQ для подтверждения
+        on_result: Действие с результатом (результат обработчика или ошибка
+            отказа) после фиксации пакета и до подтверждения сообщения:
+            публикация результата, очистка кэша; его ошибка только
+            записывается в журнал
+    """
+    await breaker.wait()
+    batcher = batchers[queue]
+    try:
+        if get_attempts(message):
+            # Повторная доставка обрабатывается отдельно от пакета
+            [result] = await batcher.process([data])
+        else:
+            result = await batcher.submit(data)
+    except Exception as e:
+        if not is_batch_failure(e):
+            # Прочие ошибки обрабатывает DeadLetterMiddleware
+            raise
+        # Пакет не зафиксирован: сообщение повторяется с задержкой (ошибка уже
+        # учтена размыкателем в process_batch)
+        logger.error("Error processing %s batch: %s", queue, e, exc_info=True)
+        await retry_later(broker, message, queue, e)
+        return
+
+    if isinstance(result, Exception):
+        logger.error("Message from %s rejected: %s", queue, result)
+    if on_result is not None:
+        # Пакет зафиксирован: сообщение подтверждается при любом исходе
+        # публикации, иначе повторная доставка применила бы изменения повторно
         try:
-            yield session
-        finally:
-            await session.close()
+            await on_result(result)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Пропущенная ошибка повторила бы пакет через DeadLetterMiddleware
+            logger.error("Failed to publish %s result: %s", queue, e, exc_info=True)
+
+    if isinstance(result, Exception):
+        await message.reject()
+    else:
+        await message.ack()
+
+
+async def publish_order_result(
+    order_data: OrderCreate, message: RabbitMessage, outcome: Order | Exception
+) -> None:
+    """
+    Опубликовать результат обработки заказа.
+
+    Отказ публикуется в очередь ORDER_REJECTED_QUEUE; если у сообщения задан
+    reply_to, результат (создан или отклонен) отправляется и в нее.
+
+    Args:
+        order_data: Данные заказа из сообщения
+        message: Исходное сообщение RabbitMQ
+        outcome: Созданный заказ или ошибка отказа
+    """
+    if isinstance(outcome, Exception):
+        result = OrderResultMessage(
+            status="rejected", reason=str(outcome), order_data=order_data
+        )
+        await broker.publish(
+            result, ORDER_REJECTED_QUEUE, correlation_id=message.correlation_id
+        )
+    else:
+        result = OrderResultMessage(
+            status="created",
+            order_id=outcome.id,
+            total_price=outcome.total_price,
+            order_data=order_data,
+        )
+
+    if message.reply_to:
+        await broker.publish(
+            result, message.reply_to, correlation_id=message.correlation_id
+        )
+
+
+async def invalidate_products(outcome: Product | list[Product] | Exception) -> None:
+    """
+    Удалить измененные продукты из кэша после фиксации пакета.
+
+    Args:
+        outcome: Созданные или обновленные продукты либо ошибка отказа
+    """
+    if isinstance(outcome, Exception):
+        return
+    products = outcome if isinstance(outcome, list) else [outcome]
+    await ProductService(ProductRepository(), redis_client).invalidate_cache(
+        product.id for product in products
+    )
+
 
+async def declare_result_queues() -> None:
+    """Объявить очереди отказов заказов, повтора и карантина (хук on_startup)."""
+    # Хук выполняется до подключения брокера и запуска подписчиков
+    await broker.connect()
+    await broker.declare_queue(RabbitQueue(ORDER_REJECTED_QUEUE, durable=True))
+    await declare_queues(broker, batchers)
 
-async def get_product_repository(
-    session: Annotated[AsyncSession, Depends(get_db_session)],
-) -> ProductRepository:
-    """Провайдер репозитория продуктов."""
-    return ProductRepository()
 
+async def close_batchers() -> None:
+    """Обработать накопленные сообщения при остановке (хук on_shutdown)."""
+    for batcher in batchers.values():
+        await batcher.close()
 
-async def get_product_service(
-    product_repository: Annotated[ProductRepository, Depends(get_product_repository)],
-) -> ProductService:
-    """Провайдер сервиса продуктов."""
-    return ProductService(product_repository)
 
+async def close_redis_client() -> None:
+    """Закрыть клиент и пул соединений Redis (хук after_shutdown)."""
+    await redis_client.aclose()
+    await redis_client.connection_pool.aclose()
 
-async def get_order_repository(
-    session: Annotated[AsyncSession, Depends(get_db_session)],
-) -> OrderRepository:
-    """Провайдер репозитория заказов."""
-    return OrderRepository()
+
+# Инициализация брокера и приложения
+rabbitmq_url = get_rabbitmq_url()
+logger.info("Connecting to RabbitMQ: %s", rabbitmq_url)
+
+broker = RabbitBroker(
+    rabbitmq_url,
+    middlewares=[DeadLetterMiddleware],
+    graceful_timeout=consumer_settings.graceful_timeout_ms / 1000,
+)
+# Клиент Redis для очистки кэша продукции (соединения создаются лениво)
+redis_client = aioredis.Redis(connection_pool=create_redis_pool())
+
+app = FastStream(
+    broker,
+    on_startup=[declare_result_queues],
+    on_shutdown=[close_batchers],
+    after_shutdown=[close_redis_client, dispose_engine],
+)
 
 
-async def get_order_service(
-    order_repository: Annotated[OrderRepository, Depends(get_order_repository)],
-    product_repository: Annotated[ProductRepository, Depends(get_product_repository)],
-) -> OrderService:
-    """Провайдер сервиса заказов."""
-    return OrderService(order_repository, product_repository)
+def channel_for(queue: str) -> Channel:
+    """
+    Канал подписчика очереди.
+
+    Prefetch ограничивает количество сообщений очереди в обработке
+    (для каждого подписчика отдельно), поэтому очередь с большим потоком
+    сообщений не вытесняет остальные.
+
+    Args:
+        queue: Имя очереди
+
+    Returns:
+        Channel: Канал с prefetch_count очереди
+    """
+    return Channel(prefetch_count=consumer_settings.prefetch_for(queue))
 
 
 # Обработчики сообщений о продукции
-@broker.subscriber("product")
+@broker.subscriber(
+    "product", channel=channel_for("product"), ack_policy=AckPolicy.MANUAL
+)
 async def subscribe_product_create(
-    product_data: ProductCreate,
-    session: Annotated[AsyncSession, Depends(get_db_session)],
-    product_service: Annotated[ProductService, Depends(get_product_service)],
+    product_data: ProductCreate | list[ProductCreate], message: RabbitMessage
 ) -> None:
     """
     Обработчик создания продукта через RabbitMQ.
 
+    Сообщение содержит один продукт или массив продуктов (загрузка каталога).
+
     Args:
-        product_data: Данные для создания продукта
-        session: Сессия базы данных
-        product_service: Сервис для работы с продуктами
+        product_data: Данные для создания продукта или массив данных продуктов
+        message: Сообщение RabbitMQ
     """
-    try:
+    if isinstance(product_data, list):
+        logger.info("Received product bulk create request: %s", len(product_data))
+    else:
         logger.info("Received product create request: %s", product_data.name)
-        product = await product_service.create(session, product_data)
-        logger.info(
-            "Product created successfully: ID=%s, Name=%s", product.id, product.name
-        )
-    except ValueError as e:
-        logger.error("Error creating product: %s", e)
-    except (RuntimeError, ConnectionError) as e:
-        logger.error("Unexpected error creating product: %s", e, exc_info=True)
+    await process_message(
+        "product", product_data, message, on_result=invalidate_products
+    )
 
 
-@broker.subscriber("product_update")
+@broker.subscriber(
+    "product_update", channel=channel_for("product_update"), ack_policy=AckPolicy.MANUAL
+)
 async def subscribe_product_update(
-    message: ProductUpdateMessage,
-    session: Annotated[AsyncSession, Depends(get_db_session)],
-    product_service: Annotated[ProductService, Depends(get_product_service)],
+    product_message: ProductUpdateMessage, message: RabbitMessage
 ) -> None:
     """
     Обработчик обновления продукта через RabbitMQ.
 
     Args:
-        message: Сообщение с ID продукта и данными для обновления
-        session: Сессия базы данных
-        product_service: Сервис для работы с продуктами
+        product_message: Сообщение с ID продукта и данными для обновления
+        message: Сообщение RabbitMQ
     """
-    try:
-        logger.info("Received product update request: ID=%s", message.product_id)
-
-        product = await product_service.update(
-            session, message.product_id, message.product_data
-        )
-        logger.info(
-            "Product updated successfully: ID=%s, Stock=%s",
-            product.id,
-            product.stock_quantity,
-        )
-
-        # Проверка, не закончился ли товар на складе
-        if product.stock_quantity == 0:
-            logger.warning(
-                "Product %s (ID=%s) is out of stock!", product.name, product.id
-            )
-    except ValueError as e:
-        logger.error("Error updating product: %s", e)
-    except (RuntimeError, ConnectionError) as e:
-        logger.error("Unexpected error updating product: %s", e, exc_info=True)
+    logger.info("Received product update request: ID=%s", product_message.product_id)
+    await process_message(
+        "product_update", product_message, message, on_result=invalidate_products
+    )
 
 
 # Обработчики сообщений о заказах
-@broker.subscriber("order")
+@broker.subscriber(
+    "order", channel=channel_for("order"), ack_policy=AckPolicy.MANUAL, no_reply=True
+)
 async def subscribe_order_create(
-    order_data: OrderCreate,
-    session: Annotated[AsyncSession, Depends(get_db_session)],
-    order_service: Annotated[OrderService, Depends(get_order_service)],
-    product_service: Annotated[ProductService, Depends(get_product_service)],
+    order_data: OrderCreate, message: RabbitMessage
 ) -> None:
     """
     Обработчик создания заказа через RabbitMQ.
 
-    Проверяет наличие всех товаров перед созданием заказа.
-    Если хотя бы один товар закончился (stock_quantity == 0), заказ не создается.
+    Отклоненный заказ (например, при нехватке товара) публикуется с причиной
+    в очередь order_rejected; результат также отправляется в reply_to
+    сообщения, если он задан.
 
     Args:
         order_data: Данные для создания заказа
-        session: Сессия базы данных
-        order_service: Сервис для работы с заказами
-        product_service: Сервис для работы с продуктами
+        message: Сообщение RabbitMQ
     """
-    try:
-        logger.info("Received order create request: User ID=%s", order_data.user_id)
-
-        # Проверка наличия всех товаров перед созданием заказа
-        out_of_stock_products = []
-        for item in order_data.items:
-            product = await product_service.get_by_id(session, item.product_id)
-            if not product:
-                logger.error(
-                    "Product with ID=%s not found, order rejected", item.product_id
-                )
-                return
-            if product.stock_quantity == 0:
-                out_of_stock_products.append(
-                    {"product_id": product.id, "name": product.name}
-                )
-
-        # Если есть товары, которые закончились, отклоняем заказ
-        if out_of_stock_products:
-            logger.warning(
-                "Order rejected: products out of stock: %s", out_of_stock_products
-            )
-            return
-
-        # Создаем заказ (OrderService.create уже проверяет достаточность количества)
-        order = await order_service.create(session, order_data)
-        logger.info(
-            "Order created successfully: ID=%s, User ID=%s, Total=%s",
-            order.id,
-            order.user_id,
-            order.total_price,
-        )
-    except ValueError as e:
-        logger.error("Error creating order: %s", e)
-    except (RuntimeError, ConnectionError) as e:
-        logger.error("Unexpected error creating order: %s", e, exc_info=True)
+    logger.info("Received order create request: User ID=%s", order_data.user_id)
+    await process_message(
+        "order",
+        order_data,
+        message,
+        on_result=partial(publish_order_result, order_data, message),
+    )
 
 
-@broker.subscriber("order_update")
+@broker.subscriber(
+    "order_update", channel=channel_for("order_update"), ack_policy=AckPolicy.MANUAL
+)
 async def subscribe_order_update(
-    message: OrderUpdateMessage,
-    session: Annotated[AsyncSession, Depends(get_db_session)],
-    order_service: Annotated[OrderService, Depends(get_order_service)],
+    order_message: OrderUpdateMessage, message: RabbitMessage
 ) -> None:
     """
     Обработчик обновления статуса заказа через RabbitMQ.
 
     Args:
-        message: Сообщение с ID заказа и данными для обновления
-        session: Сессия базы данных
-        order_service: Сервис для работы с заказами
+        order_message: Сообщение с ID заказа и данными для обновления
+        message: Сообщение RabbitMQ
     """
-    try:
-        logger.info("Received order update request: ID=%s", message.order_id)
-
-        order = await order_service.update(
-            session, message.order_id, message.order_data
-        )
-        logger.info(
-            "Order updated successfully: ID=%s, Status=%s", order.id, order.status
-        )
-    except ValueError as e:
-        logger.error("Error updating order: %s", e)
-    except (RuntimeError, ConnectionError) as e:
-        logger.error("Unexpected error updating order: %s", e, exc_info=True)
+    logger.info("Received order update request: ID=%s", order_message.order_id)
+    await process_message("order_update", order_message, message)
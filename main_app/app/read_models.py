@@ -0,0 +1,125 @@
+"""Модуль легковесных моделей чтения (read models).
+
+Данные из кэша возвращаются сервисами в виде объектов с ``__slots__`` вместо
+отсоединенных ORM-объектов: создание экземпляра модели SQLAlchemy требует
+инструментирования атрибутов и состояния сессии, которые для чтения не
+нужны. Атрибуты совпадают с полями ORM-моделей, поэтому объекты принимаются
+схемами ответа (``from_attributes``) и кодом, читающим поля продукта или
+пользователя.
+"""
+
+from datetime import datetime
+from typing import Any
+
+
+def _parse_datetime(value: Any) -> datetime | None:
+    """Преобразовать строку ISO 8601 из кэша в datetime (None и datetime без изменений)."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class ProductView:
+    """Данные продукта, прочитанные из кэша (без привязки к сессии)."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "sku",
+        "description",
+        "price",
+        "stock_quantity",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        product_id: int,
+        name: str,
+        description: str | None,
+        price: float,
+        stock_quantity: int,
+        created_at: datetime,
+        updated_at: datetime | None = None,
+        sku: str | None = None,
+    ):
+        self.id = product_id
+        self.name = name
+        self.sku = sku
+        self.description = description
+        self.price = price
+        self.stock_quantity = stock_quantity
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_cache(cls, cached_data: dict) -> "ProductView":
+        """
+        Создать объект из данных кэша.
+
+        Args:
+            cached_data: Данные продукта из кэша
+
+        Returns:
+            ProductView: Данные продукта
+        """
+        return cls(
+            product_id=cached_data["id"],
+            name=cached_data["name"],
+            description=cached_data.get("description"),
+            price=cached_data["price"],
+            stock_quantity=cached_data["stock_quantity"],
+            created_at=_parse_datetime(cached_data["created_at"]),
+            updated_at=_parse_datetime(cached_data.get("updated_at")),
+            sku=cached_data.get("sku"),
+        )
+
+
+class UserView:
+    """Данные пользователя, прочитанные из кэша (без привязки к сессии)."""
+
+    __slots__ = (
+        "id",
+        "username",
+        "email",
+        "description",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        user_id: int,
+        username: str,
+        email: str,
+        description: str | None,
+        created_at: datetime,
+        updated_at: datetime | None = None,
+    ):
+        self.id = user_id
+        self.username = username
+        self.email = email
+        self.description = description
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_cache(cls, cached_data: dict) -> "UserView":
+        """
+        Создать объект из данных кэша.
+
+        Args:
+            cached_data: Данные пользователя из кэша
+
+        Returns:
+            UserView: Данные пользователя
+        """
+        return cls(
+            user_id=cached_data["id"],
+            username=cached_data["username"],
+            email=cached_data["email"],
+            description=cached_data.get("description"),
+            created_at=_parse_datetime(cached_data["created_at"]),
+            updated_at=_parse_datetime(cached_data.get("updated_at")),
+        )
@@ -2,15 +2,79 @@
 
 import logging
 import os
+from dataclasses import dataclass
 
 import redis
+import redis.asyncio as aioredis
+from litestar import Litestar
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class RedisSettings:
+    """
+    Настройки подключения к Redis и пула соединений.
+
+    Attributes:
+        host: Хост Redis
+        port: Порт Redis
+        db: Номер базы данных Redis
+        decode_responses: Декодировать ли ответы в str
+        max_connections: Максимальное количество соединений в пуле
+        health_check_interval: Интервал проверки соединения (в секундах)
+        socket_timeout: Таймаут операций чтения/записи сокета (в секундах)
+        socket_connect_timeout: Таймаут установки соединения (в секундах)
+    """
+
+    host: str = "localhost"
+    port: int = 6379
+    db: int = 0
+    decode_responses: bool = True
+    max_connections: int = 50
+    health_check_interval: int = 30
+    socket_timeout: float = 1.0
+    socket_connect_timeout: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "RedisSettings":
+        """
+        Создание настроек из переменных окружения.
+
+        Используются переменные:
+        - REDIS_HOST (по умолчанию localhost)
+        - REDIS_PORT (по умолчанию 6379)
+        - REDIS_DB (по умолчанию 0)
+        - REDIS_DECODE_RESPONSES (по умолчанию True)
+        - REDIS_MAX_CONNECTIONS (по умолчанию 50)
+        - REDIS_HEALTH_CHECK_INTERVAL (по умолчанию 30 секунд)
+        - REDIS_SOCKET_TIMEOUT (по умолчанию 1 секунда)
+        - REDIS_SOCKET_CONNECT_TIMEOUT (по умолчанию 1 секунда)
+
+        Returns:
+            RedisSettings: Настройки подключения к Redis
+        """
+        return cls(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", "6379")),
+            db=int(os.getenv("REDIS_DB", "0")),
+            decode_responses=os.getenv("REDIS_DECODE_RESPONSES", "true").lower()
+            == "true",
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+            health_check_interval=int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30")),
+            socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0")),
+            socket_connect_timeout=float(
+                os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "1.0")
+            ),
+        )
+
+
 def get_redis_client() -> redis.Redis:
     """
-    Создание и возврат клиента Redis.
+    Создание и возврат синхронного клиента Redis.
+
+    Используется вспомогательными скриптами. Веб-приложение использует общий
+    асинхронный пул соединений (см. create_redis_pool).
 
     Получает параметры подключения из переменных окружения:
     - REDIS_HOST (по умолчанию localhost)
@@ -24,16 +88,13 @@ def get_redis_client() -> redis.Redis:
     Raises:
         redis.ConnectionError: Если не удалось подключиться к Redis
     """
-    host = os.getenv("REDIS_HOST", "localhost")
-    port = int(os.getenv("REDIS_PORT", "6379"))
-    db = int(os.getenv("REDIS_DB", "0"))
-    decode_responses = os.getenv("REDIS_DECODE_RESPONSES", "true").lower() == "true"
+    settings = RedisSettings.from_env()
 
     redis_client = redis.Redis(
-        host=host,
-        port=port,
-        db=db,
-        decode_responses=decode_responses,
+        host=settings.host,
+        port=settings.port,
+        db=settings.db,
+        decode_responses=settings.decode_responses,
     )
 
     # Проверка подключения
@@ -41,9 +102,9 @@ def get_redis_client() -> redis.Redis:
         redis_client.ping()
         logger.info(
             "Успешное подключение к Redis: host=%s, port=%s, db=%s",
-            host,
-            port,
-            db,
+            settings.host,
+            settings.port,
+            settings.db,
         )
     except redis.ConnectionError as e:
         logger.error("Ошибка подключения к Redis: %s", e)
@@ -69,3 +130,74 @@ def ping_redis(redis_client: redis.Redis) -> bool:
     except redis.ConnectionError as e:
         logger.warning("Ошибка проверки подключения к Redis: %s", e)
         return False
+
+
+def create_redis_pool(settings: RedisSettings | None = None) -> aioredis.ConnectionPool:
+    """
+    Создание асинхронного пула соединений Redis.
+
+    Соединения создаются лениво, поэтому функция не выполняет сетевых запросов.
+
+    Args:
+        settings: Настройки подключения (по умолчанию читаются из окружения)
+
+    Returns:
+        aioredis.ConnectionPool: Пул соединений Redis
+    """
+    settings = settings or RedisSettings.from_env()
+    return aioredis.ConnectionPool(
+        host=settings.host,
+        port=settings.port,
+        db=settings.db,
+        decode_responses=settings.decode_responses,
+        max_connections=settings.max_connections,
+        health_check_interval=settings.health_check_interval,
+        socket_timeout=settings.socket_timeout,
+        socket_connect_timeout=settings.socket_connect_timeout,
+    )
+
+
+async def init_redis(app: Litestar) -> None:
+    """
+    Создание общего клиента Redis при запуске приложения (хук on_startup).
+
+    Клиент сохраняется в app.state.redis_client и используется всеми запросами.
+    Недоступность Redis при старте не является фатальной: кэш работает
+    в режиме fail-open.
+
+    Args:
+        app: Экземпляр приложения Litestar
+    """
+    settings = RedisSettings.from_env()
+    pool = create_redis_pool(settings)
+    redis_client = aioredis.Redis(connection_pool=pool)
+
+    try:
+        await redis_client.ping()
+        logger.info(
+            "Пул соединений Redis создан: host=%s, port=%s, db=%s, max_connections=%s",
+            settings.host,
+            settings.port,
+            settings.db,
+            settings.max_connections,
+        )
+    except redis.RedisError as e:
+        logger.warning("Redis недоступен при запуске приложения: %s", e)
+
+    app.state.redis_client = redis_client
+
+
+async def close_redis(app: Litestar) -> None:
+    """
+    Закрытие клиента и пула соединений Redis при остановке (хук on_shutdown).
+
+    Args:
+        app: Экземпляр приложения Litestar
+    """
+    redis_client: aioredis.Redis | None = getattr(app.state, "redis_client", None)
+    if redis_client is None:
+        return
+
+    await redis_client.aclose()
+    await redis_client.connection_pool.aclose()
+    logger.info("Пул соединений Redis закрыт")
@@ -1,10 +1,13 @@
 from datetime import date, datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models import Order, OrderItem
+from app.dates import day_range
+from app.models import Order, OrderItem, Product
+from app.pagination import apply_keyset, estimate_row_count
 from app.schemas.order_schema import OrderCreate, OrderUpdate
 
 
@@ -43,23 +46,91 @@ class OrderRepository:
         Returns:
             Список заказов с загруженными items
         """
-        stmt = select(Order).options(selectinload(Order.items))
+        stmt = self._apply_filters(
+            select(Order).options(selectinload(Order.items)), **kwargs
+        )
 
-        if "user_id" in kwargs and kwargs["user_id"] is not None:
-            stmt = stmt.where(Order.user_id == kwargs["user_id"])
-        if "status" in kwargs and kwargs["status"]:
-            stmt = stmt.where(Order.status == kwargs["status"])
+        offset = (page - 1) * count
+        stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc())
+        stmt = stmt.offset(offset).limit(count)
+
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_by_filter_with_total(
+        self, session: AsyncSession, count: int, page: int, **kwargs
+    ) -> tuple[list[Order], int]:
+        """
+        Получить страницу заказов и общее количество одним запросом.
+
+        Общее количество считается оконной функцией COUNT(*) OVER () в том же
+        запросе. Если страница пуста (номер страницы за пределами списка),
+        выполняется отдельный COUNT.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            page: Номер страницы (начинается с 1)
+            **kwargs: Фильтры (user_id, status)
+
+        Returns:
+            Список заказов с загруженными items и общее количество с учетом фильтров
+        """
+        stmt = self._apply_filters(
+            select(Order)
+            .options(selectinload(Order.items))
+            .add_columns(func.count().over().label("total")),
+            **kwargs,
+        )
 
         offset = (page - 1) * count
+        stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc())
         stmt = stmt.offset(offset).limit(count)
 
-        stmt = stmt.order_by(Order.created_at.desc())
+        result = await session.execute(stmt)
+        rows = result.all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total
+        if page == 1:
+            return [], 0
+        return [], await self.count(session, **kwargs)
+
+    async def get_by_cursor(
+        self,
+        session: AsyncSession,
+        count: int,
+        after: tuple[datetime, int] | None = None,
+        **kwargs,
+    ) -> list[Order]:
+        """
+        Получить список заказов с keyset пагинацией и фильтрацией.
+
+        Вместо OFFSET используется условие (created_at, id) < after по
+        составному индексу, поэтому стоимость страницы не зависит от ее номера.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            after: Ключ (created_at, id) последней записи предыдущей страницы
+            **kwargs: Фильтры (user_id, status)
+
+        Returns:
+            Список заказов с загруженными items
+        """
+        stmt = self._apply_filters(
+            select(Order).options(selectinload(Order.items)), **kwargs
+        )
+        stmt = apply_keyset(stmt, Order.created_at, Order.id, count, after)
 
         result = await session.execute(stmt)
         return list(result.scalars().all())
 
     async def create(
-        self, session: AsyncSession, order_data: OrderCreate, total_price: float
+        self,
+        session: AsyncSession,
+        order_data: OrderCreate,
+        total_price: float,
+        products: dict[int, Product] | None = None,
     ) -> Order:
         """
         Создать новый заказ с несколькими продуктами.
@@ -68,10 +139,23 @@ class OrderRepository:
             session: Асинхронная сессия базы данных
             order_data: Данные для создания заказа
             total_price: Общая стоимость заказа (вычисляется в сервисе)
+            products: Уже загруженные продукты заказа {ID: Product}, из которых
+                берется цена на момент заказа. Если не переданы, загружаются
+                одним запросом.
 
         Returns:
             Созданный объект Order с загруженными items
+
+        Raises:
+            ValueError: Если продукт не найден
         """
+        if products is None:
+            product_ids = {item.product_id for item in order_data.items}
+            product_result = await session.execute(
+                select(Product).where(Product.id.in_(product_ids))
+            )
+            products = {product.id: product for product in product_result.scalars()}
+
         order = Order(
             user_id=order_data.user_id,
             delivery_address_id=order_data.delivery_address_id,
@@ -81,35 +165,28 @@ class OrderRepository:
         session.add(order)
         await session.flush()
 
-        # Создаем элементы заказа
+        # Создаем элементы заказа с ценой на момент заказа одной пакетной вставкой
+        order_items = []
         for item_data in order_data.items:
-            # Получаем продукт для сохранения цены на момент заказа
-            from app.models import Product
-
-            product_stmt = select(Product).where(Product.id == item_data.product_id)
-            product_result = await session.execute(product_stmt)
-            product = product_result.scalar_one_or_none()
-
+            product = products.get(item_data.product_id)
             if not product:
                 raise ValueError(f"Product with ID {item_data.product_id} not found")
 
-            order_item = OrderItem(
-                order_id=order.id,
-                product_id=item_data.product_id,
-                quantity=item_data.quantity,
-                price_at_order=product.price,
+            order_items.append(
+                {
+                    "order_id": order.id,
+                    "product_id": item_data.product_id,
+                    "quantity": item_data.quantity,
+                    "price_at_order": product.price,
+                }
             )
-            session.add(order_item)
-
-        await session.flush()
-        await session.refresh(order)
-
-        # Загружаем items для возврата
-        stmt = (
-            select(Order).where(Order.id == order.id).options(selectinload(Order.items))
+        result = await session.scalars(
+            insert(OrderItem).returning(OrderItem), order_items
         )
-        result = await session.execute(stmt)
-        return result.scalar_one()
+
+        # Заполняем коллекцию items вставленными строками без повторного SELECT
+        set_committed_value(order, "items", list(result.all()))
+        return order
 
     async def update(
         self, session: AsyncSession, order_id: int, order_data: OrderUpdate
@@ -145,10 +222,7 @@ class OrderRepository:
             setattr(order, key, value)
 
         await session.flush()
-
-        # Перезагружаем объект с items для возврата
-        updated_order = await self.get_by_id(session, order_id)
-        return updated_order
+        return order
 
     async def delete(self, session: AsyncSession, order_id: int) -> None:
         """
@@ -182,22 +256,51 @@ class OrderRepository:
         Returns:
             Количество заказов
         """
-        stmt = select(func.count(Order.id))
-
-        if "user_id" in kwargs and kwargs["user_id"] is not None:
-            stmt = stmt.where(Order.user_id == kwargs["user_id"])
-        if "status" in kwargs and kwargs["status"]:
-            stmt = stmt.where(Order.status == kwargs["status"])
+        stmt = self._apply_filters(select(func.count(Order.id)), **kwargs)
 
         result = await session.execute(stmt)
         return result.scalar_one() or 0
 
+    async def estimate_count(self, session: AsyncSession) -> int | None:
+        """
+        Получить приблизительное количество заказов без сканирования таблицы.
+
+        Args:
+            session: Асинхронная сессия базы данных
+
+        Returns:
+            Оценка количества по статистике PostgreSQL или None, если она
+            недоступна
+        """
+        return await estimate_row_count(session, Order.__tablename__)
+
+    @staticmethod
+    def _apply_filters(stmt: Select, **kwargs) -> Select:
+        """
+        Применить фильтры списка заказов к запросу.
+
+        Args:
+            stmt: Исходный запрос
+            **kwargs: Фильтры (user_id, status)
+
+        Returns:
+            Select: Запрос с условиями фильтрации
+        """
+        if kwargs.get("user_id") is not None:
+            stmt = stmt.where(Order.user_id == kwargs["user_id"])
+        if kwargs.get("status"):
+            stmt = stmt.where(Order.status == kwargs["status"])
+        return stmt
+
     async def get_orders_by_date(
         self, session: AsyncSession, order_date: date
     ) -> list[Order]:
         """
         Получить все заказы, созданные в указанную дату.
 
+        Использует полуоткрытый диапазон [день, день + 1) по created_at, который
+        обслуживается индексом idx_orders_created_at_id.
+
         Args:
             session: Асинхронная сессия базы данных
             order_date: Дата для получения заказов
@@ -205,16 +308,12 @@ class OrderRepository:
         Returns:
             Список заказов с загруженными items, созданных в указанную дату
         """
-        # Создаем диапазон времени для указанной даты
-        start_datetime = datetime.combine(order_date, datetime.min.time())
-        end_datetime = datetime.combine(order_date, datetime.max.time())
-
+        start, end = day_range(order_date)
         stmt = (
             select(Order)
-            .where(Order.created_at >= start_datetime)
-            .where(Order.created_at <= end_datetime)
+            .where(Order.created_at >= start, Order.created_at < end)
             .options(selectinload(Order.items))
-            .order_by(Order.created_at.desc())
+            .order_by(Order.created_at.desc(), Order.id.desc())
         )
 
         result = await session.execute(stmt)
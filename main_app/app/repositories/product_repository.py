@@ -1,8 +1,13 @@
-from sqlalchemy import func, select
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+
+from sqlalchemy import Select, case, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models import Product
+from app.database import dialect_insert
+from app.models import OrderItem, Product
+from app.pagination import apply_keyset, estimate_row_count
 from app.schemas.product_schema import ProductCreate, ProductUpdate
 
 
@@ -24,6 +29,93 @@ class ProductRepository:
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_many(
+        self, session: AsyncSession, product_ids: Iterable[int]
+    ) -> dict[int, Product]:
+        """
+        Получить несколько продуктов по ID одним запросом (WHERE id IN (...)).
+
+        Args:
+            session: Асинхронная сессия базы данных
+            product_ids: ID продуктов (повторы допускаются)
+
+        Returns:
+            Словарь {ID продукта: Product}; отсутствующие в БД ID не включаются
+        """
+        ids = set(product_ids)
+        if not ids:
+            return {}
+
+        stmt = select(Product).where(Product.id.in_(ids))
+        result = await session.execute(stmt)
+        return {product.id: product for product in result.scalars().all()}
+
+    async def get_most_ordered(
+        self, session: AsyncSession, limit: int
+    ) -> list[Product]:
+        """
+        Получить самые заказываемые продукты.
+
+        Продукты упорядочены по убыванию суммарного количества в order_items
+        (агрегат GROUP BY product_id), при равенстве - по ID.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            limit: Максимальное количество продуктов
+
+        Returns:
+            Список продуктов (продукты без заказов не включаются)
+        """
+        total_quantity = func.sum(OrderItem.quantity).label("total_quantity")
+        top = (
+            select(OrderItem.product_id, total_quantity)
+            .group_by(OrderItem.product_id)
+            .order_by(total_quantity.desc(), OrderItem.product_id)
+            .limit(limit)
+            .subquery()
+        )
+        stmt = (
+            select(Product)
+            .join(top, Product.id == top.c.product_id)
+            .order_by(top.c.total_quantity.desc(), Product.id)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def reserve_stock(
+        self, session: AsyncSession, quantities: dict[int, int]
+    ) -> dict[int, Product]:
+        """
+        Атомарно списать товар со склада одним условным UPDATE.
+
+        Выполняет UPDATE products SET stock_quantity = stock_quantity - x
+        WHERE id IN (...) AND stock_quantity >= x RETURNING ... для всех позиций
+        сразу. Строки с недостаточным остатком (или несуществующие продукты)
+        не изменяются и не попадают в результат. Если результат содержит не все
+        запрошенные ID, вызывающий код должен откатить транзакцию.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            quantities: Словарь {ID продукта: количество к списанию}
+
+        Returns:
+            Словарь {ID продукта: Product} с обновленным остатком для успешно
+            зарезервированных продуктов
+        """
+        if not quantities:
+            return {}
+
+        quantity = case(quantities, value=Product.id)
+        stmt = (
+            update(Product)
+            .where(Product.id.in_(quantities), Product.stock_quantity >= quantity)
+            .values(stock_quantity=Product.stock_quantity - quantity)
+            .returning(Product)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await session.execute(stmt)
+        return {product.id: product for product in result.scalars().all()}
+
     async def get_by_filter(
         self, session: AsyncSession, count: int, page: int, **kwargs
     ) -> list[Product]:
@@ -39,19 +131,75 @@ class ProductRepository:
         Returns:
             Список продуктов
         """
-        stmt = select(Product)
+        stmt = self._apply_filters(select(Product), **kwargs)
 
-        if "name" in kwargs and kwargs["name"]:
-            stmt = stmt.where(Product.name.ilike(f"%{kwargs['name']}%"))
-        if "min_price" in kwargs and kwargs["min_price"] is not None:
-            stmt = stmt.where(Product.price >= kwargs["min_price"])
-        if "max_price" in kwargs and kwargs["max_price"] is not None:
-            stmt = stmt.where(Product.price <= kwargs["max_price"])
+        offset = (page - 1) * count
+        stmt = stmt.order_by(Product.created_at.desc(), Product.id.desc())
+        stmt = stmt.offset(offset).limit(count)
+
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_by_filter_with_total(
+        self, session: AsyncSession, count: int, page: int, **kwargs
+    ) -> tuple[list[Product], int]:
+        """
+        Получить страницу продуктов и общее количество одним запросом.
+
+        Общее количество считается оконной функцией COUNT(*) OVER () в том же
+        запросе. Если страница пуста (номер страницы за пределами списка),
+        выполняется отдельный COUNT.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            page: Номер страницы (начинается с 1)
+            **kwargs: Фильтры (name, min_price, max_price)
+
+        Returns:
+            Список продуктов и общее количество с учетом фильтров
+        """
+        stmt = self._apply_filters(
+            select(Product).add_columns(func.count().over().label("total")),
+            **kwargs,
+        )
 
         offset = (page - 1) * count
+        stmt = stmt.order_by(Product.created_at.desc(), Product.id.desc())
         stmt = stmt.offset(offset).limit(count)
 
-        stmt = stmt.order_by(Product.created_at.desc())
+        result = await session.execute(stmt)
+        rows = result.all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total
+        if page == 1:
+            return [], 0
+        return [], await self.count(session, **kwargs)
+
+    async def get_by_cursor(
+        self,
+        session: AsyncSession,
+        count: int,
+        after: tuple[datetime, int] | None = None,
+        **kwargs,
+    ) -> list[Product]:
+        """
+        Получить список продуктов с keyset пагинацией и фильтрацией.
+
+        Вместо OFFSET используется условие (created_at, id) < after по
+        составному индексу, поэтому стоимость страницы не зависит от ее номера.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            after: Ключ (created_at, id) последней записи предыдущей страницы
+            **kwargs: Фильтры (name, min_price, max_price)
+
+        Returns:
+            Список продуктов
+        """
+        stmt = self._apply_filters(select(Product), **kwargs)
+        stmt = apply_keyset(stmt, Product.created_at, Product.id, count, after)
 
         result = await session.execute(stmt)
         return list(result.scalars().all())
@@ -71,6 +219,7 @@ class ProductRepository:
         """
         product = Product(
             name=product_data.name,
+            sku=product_data.sku,
             description=product_data.description,
             price=product_data.price,
             stock_quantity=product_data.stock_quantity,
@@ -80,6 +229,63 @@ class ProductRepository:
         await session.refresh(product)
         return product
 
+    async def bulk_create(
+        self,
+        session: AsyncSession,
+        products_data: Sequence[ProductCreate],
+        upsert: bool = False,
+    ) -> list[Product]:
+        """
+        Создать несколько продуктов многострочным INSERT ... RETURNING.
+
+        Строки отправляются пакетами многострочного INSERT (insertmanyvalues
+        SQLAlchemy) без flush() и refresh() для каждого продукта. При upsert
+        продукт с существующим артикулом обновляется (ON CONFLICT (sku)
+        DO UPDATE), продукты без артикула всегда создаются; если артикул
+        повторяется в списке, используется последнее вхождение.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            products_data: Данные продуктов
+            upsert: Обновлять ли продукты с существующим артикулом
+
+        Returns:
+            Список созданных (и обновленных при upsert) продуктов в порядке
+            данных
+        """
+        rows = [product_data.model_dump() for product_data in products_data]
+        if not rows:
+            return []
+
+        if not upsert:
+            stmt = insert(Product).returning(Product, sort_by_parameter_order=True)
+            result = await session.scalars(stmt, rows)
+            return list(result.all())
+
+        # PostgreSQL не позволяет одному INSERT ... ON CONFLICT изменить строку
+        # дважды: из повторяющихся артикулов остается последний
+        unique_rows = {
+            row["sku"] if row["sku"] is not None else index: row
+            for index, row in enumerate(rows)
+        }
+        insert_stmt = dialect_insert(session)(Product)
+        stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[Product.sku],
+            set_={
+                "name": insert_stmt.excluded.name,
+                "description": insert_stmt.excluded.description,
+                "price": insert_stmt.excluded.price,
+                "stock_quantity": insert_stmt.excluded.stock_quantity,
+                "updated_at": insert_stmt.excluded.updated_at,
+            },
+        ).returning(Product, sort_by_parameter_order=True)
+        result = await session.scalars(
+            stmt,
+            list(unique_rows.values()),
+            execution_options={"populate_existing": True},
+        )
+        return list(result.all())
+
     async def update(
         self, session: AsyncSession, product_id: int, product_data: ProductUpdate
     ) -> Product:
@@ -148,14 +354,40 @@ class ProductRepository:
         Returns:
             Количество продуктов
         """
-        stmt = select(func.count(Product.id))
+        stmt = self._apply_filters(select(func.count(Product.id)), **kwargs)
+
+        result = await session.execute(stmt)
+        return result.scalar_one() or 0
+
+    async def estimate_count(self, session: AsyncSession) -> int | None:
+        """
+        Получить приблизительное количество продуктов без сканирования таблицы.
+
+        Args:
+            session: Асинхронная сессия базы данных
+
+        Returns:
+            Оценка количества по статистике PostgreSQL или None, если она
+            недоступна
+        """
+        return await estimate_row_count(session, Product.__tablename__)
 
-        if "name" in kwargs and kwargs["name"]:
+    @staticmethod
+    def _apply_filters(stmt: Select, **kwargs) -> Select:
+        """
+        Применить фильтры списка продуктов к запросу.
+
+        Args:
+            stmt: Исходный запрос
+            **kwargs: Фильтры (name, min_price, max_price)
+
+        Returns:
+            Select: Запрос с условиями фильтрации
+        """
+        if kwargs.get("name"):
             stmt = stmt.where(Product.name.ilike(f"%{kwargs['name']}%"))
-        if "min_price" in kwargs and kwargs["min_price"] is not None:
+        if kwargs.get("min_price") is not None:
             stmt = stmt.where(Product.price >= kwargs["min_price"])
-        if "max_price" in kwargs and kwargs["max_price"] is not None:
+        if kwargs.get("max_price") is not None:
             stmt = stmt.where(Product.price <= kwargs["max_price"])
-
-        result = await session.execute(stmt)
-        return result.scalar_one() or 0
+        return stmt
@@ -1,11 +1,14 @@
 """Репозиторий для работы с отчетами."""
 
-from datetime import date
+from collections.abc import AsyncIterator
+from datetime import date, datetime
 
-from sqlalchemy import select
+from sqlalchemy import RowMapping, func, literal, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Report
+from app.database import dialect_insert
+from app.dates import day_range
+from app.models import Order, OrderItem, Report, ReportWatermark
 
 
 class ReportRepository:
@@ -40,6 +43,109 @@ class ReportRepository:
         await session.refresh(report)
         return report
 
+    async def upsert_reports_for_date(
+        self,
+        session: AsyncSession,
+        report_date: date,
+        changed_since: datetime | None = None,
+    ) -> list[Report]:
+        """
+        Создать или обновить отчеты по заказам за дату одним запросом.
+
+        Выполняет INSERT INTO reports (...) SELECT ... FROM orders
+        LEFT JOIN order_items ... GROUP BY orders.id
+        ON CONFLICT (report_at, order_id) DO UPDATE ... RETURNING ... на стороне
+        БД, не загружая заказы и их элементы в приложение. Повторный запуск за
+        ту же дату обновляет существующие отчеты вместо создания дубликатов.
+        Для заказа без элементов формируется отчет с count_product = 0.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            report_date: Дата, за которую учитываются заказы (по created_at)
+            changed_since: Учитывать только заказы, созданные или измененные
+                после этого момента (инкрементальный режим)
+
+        Returns:
+            Список созданных или обновленных отчетов
+        """
+        start, end = day_range(report_date)
+
+        orders_stmt = (
+            select(
+                literal(report_date, Report.report_at.type),
+                Order.id,
+                func.coalesce(func.sum(OrderItem.quantity), 0),
+                literal(datetime.now(), Report.created_at.type),
+            )
+            .select_from(Order)
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .where(Order.created_at >= start, Order.created_at < end)
+            .group_by(Order.id)
+        )
+        if changed_since is not None:
+            orders_stmt = orders_stmt.where(
+                or_(
+                    Order.created_at > changed_since,
+                    Order.updated_at > changed_since,
+                )
+            )
+
+        insert_stmt = dialect_insert(session)(Report).from_select(
+            ["report_at", "order_id", "count_product", "created_at"],
+            orders_stmt,
+        )
+        stmt = (
+            insert_stmt.on_conflict_do_update(
+                index_elements=[Report.report_at, Report.order_id],
+                set_={"count_product": insert_stmt.excluded.count_product},
+            )
+            .returning(Report)
+            .execution_options(populate_existing=True)
+        )
+
+        result = await session.scalars(stmt)
+        return list(result.all())
+
+    async def get_watermark(
+        self, session: AsyncSession, report_date: date
+    ) -> datetime | None:
+        """
+        Получить момент последнего формирования отчетов за дату.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            report_date: Дата отчета
+
+        Returns:
+            Отметка времени или None, если отчеты за дату еще не формировались
+        """
+        stmt = select(ReportWatermark.processed_at).where(
+            ReportWatermark.report_at == report_date
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def set_watermark(
+        self, session: AsyncSession, report_date: date, processed_at: datetime
+    ) -> None:
+        """
+        Сохранить момент формирования отчетов за дату.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            report_date: Дата отчета
+            processed_at: Заказы, измененные до этого момента, учтены в отчете
+        """
+        insert_stmt = dialect_insert(session)(ReportWatermark).values(
+            report_at=report_date, processed_at=processed_at
+        )
+        await session.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=[ReportWatermark.report_at],
+                set_={"processed_at": insert_stmt.excluded.processed_at},
+            )
+        )
+
     async def get_reports_by_date(
         self, session: AsyncSession, report_date: date
     ) -> list[Report]:
@@ -57,6 +163,46 @@ class ReportRepository:
         result = await session.execute(stmt)
         return list(result.scalars().all())
 
+    async def stream_reports_between(
+        self,
+        session: AsyncSession,
+        start_date: date,
+        end_date: date,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[list[RowMapping]]:
+        """
+        Потоково получить отчеты за диапазон дат порциями.
+
+        Использует серверный курсор (session.stream с yield_per), поэтому в
+        памяти одновременно находится не больше chunk_size строк. ORM-объекты
+        не создаются.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            start_date: Начальная дата (включительно)
+            end_date: Конечная дата (включительно)
+            chunk_size: Количество строк в порции
+
+        Yields:
+            list[RowMapping]: Порция строк отчетов (id, report_at, order_id,
+                count_product, created_at)
+        """
+        stmt = (
+            select(
+                Report.id,
+                Report.report_at,
+                Report.order_id,
+                Report.count_product,
+                Report.created_at,
+            )
+            .where(Report.report_at >= start_date, Report.report_at <= end_date)
+            .order_by(Report.report_at, Report.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield partition
+
     async def get_report_by_id(
         self, session: AsyncSession, report_id: int
     ) -> Report | None:
@@ -1,7 +1,10 @@
-from sqlalchemy import func, select
+from datetime import datetime
+
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User
+from app.pagination import apply_keyset, estimate_row_count
 from app.schemas.user_schema import UserCreate, UserUpdate
 
 
@@ -38,17 +41,75 @@ class UserRepository:
         Returns:
             Список пользователей
         """
-        stmt = select(User)
+        stmt = self._apply_filters(select(User), **kwargs)
 
-        if "username" in kwargs and kwargs["username"]:
-            stmt = stmt.where(User.username.ilike(f"%{kwargs['username']}%"))
-        if "email" in kwargs and kwargs["email"]:
-            stmt = stmt.where(User.email.ilike(f"%{kwargs['email']}%"))
+        offset = (page - 1) * count
+        stmt = stmt.order_by(User.created_at.desc(), User.id.desc())
+        stmt = stmt.offset(offset).limit(count)
+
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_by_filter_with_total(
+        self, session: AsyncSession, count: int, page: int, **kwargs
+    ) -> tuple[list[User], int]:
+        """
+        Получить страницу пользователей и общее количество одним запросом.
+
+        Общее количество считается оконной функцией COUNT(*) OVER () в том же
+        запросе. Если страница пуста (номер страницы за пределами списка),
+        выполняется отдельный COUNT.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            page: Номер страницы (начинается с 1)
+            **kwargs: Фильтры (username, email)
+
+        Returns:
+            Список пользователей и общее количество с учетом фильтров
+        """
+        stmt = self._apply_filters(
+            select(User).add_columns(func.count().over().label("total")),
+            **kwargs,
+        )
 
         offset = (page - 1) * count
+        stmt = stmt.order_by(User.created_at.desc(), User.id.desc())
         stmt = stmt.offset(offset).limit(count)
 
-        stmt = stmt.order_by(User.created_at.desc())
+        result = await session.execute(stmt)
+        rows = result.all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total
+        if page == 1:
+            return [], 0
+        return [], await self.count(session, **kwargs)
+
+    async def get_by_cursor(
+        self,
+        session: AsyncSession,
+        count: int,
+        after: tuple[datetime, int] | None = None,
+        **kwargs,
+    ) -> list[User]:
+        """
+        Получить список пользователей с keyset пагинацией и фильтрацией.
+
+        Вместо OFFSET используется условие (created_at, id) < after по
+        составному индексу, поэтому стоимость страницы не зависит от ее номера.
+
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            after: Ключ (created_at, id) последней записи предыдущей страницы
+            **kwargs: Фильтры (username, email)
+
+        Returns:
+            Список пользователей
+        """
+        stmt = self._apply_filters(select(User), **kwargs)
+        stmt = apply_keyset(stmt, User.created_at, User.id, count, after)
 
         result = await session.execute(stmt)
         return list(result.scalars().all())
@@ -143,12 +204,38 @@ class UserRepository:
         Returns:
             Количество пользователей
         """
-        stmt = select(func.count(User.id))
-
-        if "username" in kwargs and kwargs["username"]:
-            stmt = stmt.where(User.username.ilike(f"%{kwargs['username']}%"))
-        if "email" in kwargs and kwargs["email"]:
-            stmt = stmt.where(User.email.ilike(f"%{kwargs['email']}%"))
+        stmt = self._apply_filters(select(func.count(User.id)), **kwargs)
 
         result = await session.execute(stmt)
         return result.scalar_one() or 0
+
+    async def estimate_count(self, session: AsyncSession) -> int | None:
+        """
+        Получить приблизительное количество пользователей без сканирования таблицы.
+
+        Args:
+            session: Асинхронная сессия базы данных
+
+        Returns:
+            Оценка количества по статистике PostgreSQL или None, если она
+            недоступна
+        """
+        return await estimate_row_count(session, User.__tablename__)
+
+    @staticmethod
+    def _apply_filters(stmt: Select, **kwargs) -> Select:
+        """
+        Применить фильтры списка пользователей к запросу.
+
+        Args:
+            stmt: Исходный запрос
+            **kwargs: Фильтры (username, email)
+
+        Returns:
+            Select: Запрос с условиями фильтрации
+        """
+        if kwargs.get("username"):
+            stmt = stmt.where(User.username.ilike(f"%{kwargs['username']}%"))
+        if kwargs.get("email"):
+            stmt = stmt.where(User.email.ilike(f"%{kwargs['email']}%"))
+        return stmt
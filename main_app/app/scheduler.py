@@ -6,15 +6,20 @@ import os
 from datetime import date, datetime
 
 import aio_pika
+import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
-from taskiq import TaskiqDepends, TaskiqScheduler
+from taskiq import TaskiqDepends, TaskiqEvents, TaskiqScheduler, TaskiqState
 from taskiq.schedule_sources import LabelScheduleSource
 from taskiq_aio_pika import AioPikaBroker
 from taskiq_redis import RedisScheduleSource
 
-from app.database import async_session_factory
+from app.cache.settings import cache_settings
+from app.database import async_session_factory, dispose_engine
+from app.redis_client import create_redis_pool
 from app.repositories.order_repository import OrderRepository
+from app.repositories.product_repository import ProductRepository
 from app.repositories.report_repository import ReportRepository
+from app.services.product_service import ProductService
 from app.services.report_service import ReportService
 
 # Настройка логирования
@@ -61,6 +66,18 @@ logger.info("Initializing TaskIQ broker with RabbitMQ: %s", rabbitmq_url)
 
 broker = AioPikaBroker(rabbitmq_url)
 
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def shutdown_worker(state: TaskiqState) -> None:
+    """
+    Закрытие пула соединений с базой данных при остановке TaskIQ worker.
+
+    Args:
+        state: Состояние TaskIQ worker
+    """
+    await dispose_engine()
+
+
 # Инициализация источников расписаний
 redis_url = get_redis_url()
 logger.info("Initializing Redis schedule source: %s", redis_url)
@@ -144,6 +161,38 @@ async def provide_report_service_for_taskiq(
     return ReportService(order_repository, report_repository)
 
 
+async def provide_redis_client_for_taskiq() -> aioredis.Redis:
+    """
+    Провайдер клиента Redis для задач TaskIQ.
+
+    Клиент и его пул соединений закрываются после выполнения задачи.
+
+    Yields:
+        aioredis.Redis: Асинхронный клиент Redis
+    """
+    redis_client = aioredis.Redis(connection_pool=create_redis_pool())
+    try:
+        yield redis_client
+    finally:
+        await redis_client.aclose()
+        await redis_client.connection_pool.aclose()
+
+
+async def provide_product_service_for_taskiq(
+    redis_client: aioredis.Redis = TaskiqDepends(provide_redis_client_for_taskiq),
+) -> ProductService:
+    """
+    Провайдер сервиса продуктов для задач TaskIQ.
+
+    Args:
+        redis_client: Клиент Redis (внедряется через DI)
+
+    Returns:
+        ProductService: Экземпляр сервиса продуктов
+    """
+    return ProductService(ProductRepository(), redis_client)
+
+
 # Задача для формирования отчета
 @broker.task(
     schedule=[
@@ -152,11 +201,18 @@ async def provide_report_service_for_taskiq(
             "cron_offset": None,
             "args": [],
             "kwargs": {},
-        }
+        },
+        {
+            "cron": "30 * * * *",  # Ежечасная догоняющая обработка новых заказов
+            "cron_offset": None,
+            "args": [],
+            "kwargs": {"incremental": True},
+        },
     ]
 )
 async def my_scheduled_task(
     report_date: date | None = None,
+    incremental: bool = False,
     db_session: AsyncSession = TaskiqDepends(provide_db_session_for_taskiq),
     report_service: ReportService = TaskiqDepends(provide_report_service_for_taskiq),
 ) -> None:
@@ -168,19 +224,29 @@ async def my_scheduled_task(
 
     Args:
         report_date: Дата для формирования отчета (по умолчанию текущая дата)
+        incremental: Обработать только заказы, созданные или измененные после
+            предыдущего запуска за эту дату
         db_session: Сессия базы данных (внедряется через DI)
         report_service: Сервис для работы с отчетами (внедряется через DI)
     """
     if report_date is None:
         report_date = date.today()
 
-    logger.info("Starting report generation for date: %s", report_date)
+    logger.info(
+        "Starting %s report generation for date: %s",
+        "incremental" if incremental else "full",
+        report_date,
+    )
 
     try:
-        # Используем сервис для формирования отчетов
-        reports = await report_service.generate_report(db_session, report_date)
+        # Используем сервис для формирования отчетов (повторный запуск идемпотентен)
+        reports = await report_service.generate_report(
+            db_session, report_date, incremental=incremental
+        )
 
-        logger.info("Created %d reports for date %s", len(reports), report_date)
+        logger.info(
+            "Created or updated %d reports for date %s", len(reports), report_date
+        )
 
         # Подготавливаем данные для отправки в RabbitMQ
         reports_data = [
@@ -200,6 +266,7 @@ async def my_scheduled_task(
 
             message_body = {
                 "report_date": report_date.isoformat(),
+                "incremental": incremental,
                 "reports_count": len(reports_data),
                 "reports": reports_data,
                 "created_at": datetime.now().isoformat(),
@@ -226,6 +293,40 @@ async def my_scheduled_task(
         raise
 
 
+# Задача прогрева кэша продукции: каждые 5 минут заново записываются только
+# отсутствующие ключи самых заказываемых продуктов (SET NX EX), существующие
+# записи не обновляются и истекают по своему TTL (10 минут)
+@broker.task(
+    schedule=[
+        {
+            "cron": "*/5 * * * *",
+            "cron_offset": None,
+            "args": [],
+            "kwargs": {},
+        },
+    ]
+)
+async def warm_up_product_cache(
+    limit: int | None = None,
+    db_session: AsyncSession = TaskiqDepends(provide_db_session_for_taskiq),
+    product_service: ProductService = TaskiqDepends(provide_product_service_for_taskiq),
+) -> int:
+    """
+    Задача прогрева кэша самыми заказываемыми продуктами.
+
+    Args:
+        limit: Количество продуктов (по умолчанию CACHE_WARMUP_TOP_N)
+        db_session: Сессия базы данных (внедряется через DI)
+        product_service: Сервис для работы с продуктами (внедряется через DI)
+
+    Returns:
+        int: Количество загруженных в кэш продуктов
+    """
+    return await product_service.warm_up_cache(
+        db_session, limit or cache_settings.warmup_top_n
+    )
+
+
 # Экспорт для использования в CLI
 # Объект scheduler используется командой: taskiq scheduler app.scheduler:scheduler
 # Все задачи зарегистрированы в брокере через декоратор @broker.task
@@ -6,6 +6,7 @@ from app.schemas.order_schema import (
     OrderItemResponse,
     OrderListResponse,
     OrderResponse,
+    OrderResultMessage,
     OrderUpdate,
     OrderUpdateMessage,
 )
@@ -41,6 +42,7 @@ __all__ = [
     "OrderItemResponse",
     "OrderResponse",
     "OrderListResponse",
+    "OrderResultMessage",
     "OrderUpdate",
     "OrderUpdateMessage",
     "ReportCreate",
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -48,6 +49,20 @@ class OrderUpdateMessage(BaseModel):
     order_data: OrderUpdate = Field(..., description="Данные для обновления заказа")
 
 
+class OrderResultMessage(BaseModel):
+    """Схема для сообщения с результатом обработки заказа из RabbitMQ."""
+
+    status: Literal["created", "rejected"] = Field(
+        ..., description="Результат обработки заказа"
+    )
+    order_id: int | None = Field(None, gt=0, description="ID созданного заказа")
+    total_price: float | None = Field(None, description="Общая стоимость заказа")
+    reason: str | None = Field(None, description="Причина отказа")
+    order_data: OrderCreate = Field(
+        ..., description="Данные заказа из исходного сообщения"
+    )
+
+
 class OrderResponse(BaseModel):
     """Схема для ответа API с данными заказа."""
 
@@ -70,4 +85,13 @@ class OrderListResponse(BaseModel):
     """Схема для ответа API со списком заказов и общим количеством."""
 
     orders: list[OrderResponse] = Field(..., description="Список заказов")
-    total: int = Field(..., ge=0, description="Общее количество заказов в базе данных")
+    total: int | None = Field(
+        None,
+        ge=0,
+        description="Общее количество заказов в базе данных "
+        "(приблизительное при total_mode=approximate, None при total_mode=none)",
+    )
+    next_cursor: str | None = Field(
+        None,
+        description="Курсор следующей страницы (None, если страница последняя)",
+    )
@@ -9,6 +9,9 @@ class ProductCreate(BaseModel):
     name: str = Field(
         ..., min_length=1, max_length=200, description="Название продукта"
     )
+    sku: str | None = Field(
+        None, min_length=1, max_length=64, description="Артикул продукта"
+    )
     description: str | None = Field(
         None, max_length=1000, description="Описание продукта"
     )
@@ -22,6 +25,9 @@ class ProductUpdate(BaseModel):
     name: str | None = Field(
         None, min_length=1, max_length=200, description="Название продукта"
     )
+    sku: str | None = Field(
+        None, min_length=1, max_length=64, description="Артикул продукта"
+    )
     description: str | None = Field(
         None, max_length=1000, description="Описание продукта"
     )
@@ -45,6 +51,7 @@ class ProductResponse(BaseModel):
 
     id: int = Field(..., gt=0, description="Уникальный идентификатор продукта")
     name: str = Field(..., description="Название продукта")
+    sku: str | None = Field(None, description="Артикул продукта")
     description: str | None = Field(None, description="Описание продукта")
     price: float = Field(..., description="Цена продукта")
     stock_quantity: int = Field(..., description="Количество товара на складе")
@@ -60,6 +67,13 @@ class ProductListResponse(BaseModel):
     """Схема для ответа API со списком продуктов и общим количеством."""
 
     products: list[ProductResponse] = Field(..., description="Список продуктов")
-    total: int = Field(
-        ..., ge=0, description="Общее количество продуктов в базе данных"
+    total: int | None = Field(
+        None,
+        ge=0,
+        description="Общее количество продуктов в базе данных "
+        "(приблизительное при total_mode=approximate, None при total_mode=none)",
+    )
+    next_cursor: str | None = Field(
+        None,
+        description="Курсор следующей страницы (None, если страница последняя)",
     )
@@ -1,6 +1,7 @@
 """Схемы для работы с отчетами."""
 
 from datetime import date, datetime
+from enum import StrEnum
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -17,6 +18,13 @@ class ReportResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ReportExportFormat(StrEnum):
+    """Формат потоковой выгрузки отчетов."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class ReportDateRequest(BaseModel):
     """Схема для запроса отчета по дате."""
 
@@ -46,6 +46,13 @@ class UserListResponse(BaseModel):
     """Схема для ответа API со списком пользователей и общим количеством (задание со звездочкой)."""
 
     users: list[UserResponse] = Field(..., description="Список пользователей")
-    total: int = Field(
-        ..., ge=0, description="Общее количество пользователей в базе данных"
+    total: int | None = Field(
+        None,
+        ge=0,
+        description="Общее количество пользователей в базе данных "
+        "(приблизительное при total_mode=approximate, None при total_mode=none)",
+    )
+    next_cursor: str | None = Field(
+        None,
+        description="Курсор следующей страницы (None, если страница последняя)",
     )
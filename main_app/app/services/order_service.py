@@ -1,7 +1,10 @@
+from collections import defaultdict
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Address, Order, Product, User
+from app.pagination import Paginator, TotalMode
 from app.repositories.order_repository import OrderRepository
 from app.repositories.product_repository import ProductRepository
 from app.schemas.order_schema import OrderCreate, OrderUpdate
@@ -23,6 +26,7 @@ class OrderService:
         """
         self.order_repository = order_repository
         self.product_repository = product_repository
+        self.paginator: Paginator[Order] = Paginator(order_repository)
 
     async def get_by_id(self, session: AsyncSession, order_id: int) -> Order | None:
         """
@@ -32,7 +36,7 @@ class OrderService:
             order_id: ID заказа (int)
 
         Returns:
-            Order объект или None, если не найден
+            Order объект с загруженными items или None, если не найден
         """
         return await self.order_repository.get_by_id(session, order_id)
 
@@ -52,6 +56,37 @@ class OrderService:
         """
         return await self.order_repository.get_by_filter(session, count, page, **kwargs)
 
+    async def get_page(
+        self,
+        session: AsyncSession,
+        count: int,
+        page: int = 1,
+        cursor: str | None = None,
+        total_mode: TotalMode | None = None,
+        **kwargs,
+    ) -> tuple[list[Order], int | None, str | None]:
+        """
+        Получить страницу заказов для ответа списка.
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            page: Номер страницы (игнорируется, если передан курсор)
+            cursor: Курсор из предыдущего ответа (keyset пагинация)
+            total_mode: Режим подсчета общего количества (по умолчанию
+                exact для страниц по номеру и none для курсора)
+            **kwargs: Фильтры (user_id, status)
+
+        Returns:
+            Список заказов, общее количество (None для режима none)
+            и курсор следующей страницы (None, если страница последняя)
+
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        return await self.paginator.get_page(
+            session, count, page, cursor, total_mode, **kwargs
+        )
+
     async def create(self, session: AsyncSession, order_data: OrderCreate) -> Order:
         """
         Создать новый заказ с проверкой наличия товаров и расчетом общей стоимости.
@@ -60,7 +95,8 @@ class OrderService:
             order_data: Данные для создания заказа
 
         Returns:
-            Созданный объект Order
+            Созданный объект Order с загруженными items (повторная загрузка
+            перед сериализацией не требуется)
 
         Raises:
             ValueError: Если пользователь, адрес или продукт не найдены, или недостаточно товара на складе
@@ -87,51 +123,69 @@ class OrderService:
         if address.user_id != order_data.user_id:
             raise ValueError("Delivery address does not belong to the user")
 
-        # Проверка наличия товаров и расчет общей стоимости
-        total_price = 0.0
-        products_to_update = []  # Для обновления количества на складе
-
-        for item_data in order_data.items:
-            # Получаем продукт
-            product = await self.product_repository.get_by_id(
-                session, item_data.product_id
-            )
-            if not product:
-                raise ValueError(f"Product with ID {item_data.product_id} not found")
+        # Атомарное резервирование товара и расчет общей стоимости
+        products = await self._reserve_stock(session, order_data)
+        total_price = sum(
+            products[item_data.product_id].price * item_data.quantity
+            for item_data in order_data.items
+        )
 
-            # Проверка наличия достаточного количества товара
-            if product.stock_quantity < item_data.quantity:
-                raise ValueError(
-                    f"Insufficient stock for product {product.name}. "
-                    f"Available: {product.stock_quantity}, Requested: {item_data.quantity}"
-                )
+        # Создаем заказ
+        order = await self.order_repository.create(
+            session, order_data, total_price, products=products
+        )
 
-            # Расчет стоимости для этого элемента
-            item_total = product.price * item_data.quantity
-            total_price += item_total
+        await session.commit()
+        return order
 
-            # Сохраняем информацию для обновления количества на складе
-            products_to_update.append((product, item_data.quantity))
+    async def _reserve_stock(
+        self, session: AsyncSession, order_data: OrderCreate
+    ) -> dict[int, Product]:
+        """
+        Зарезервировать товар для всех позиций заказа одним условным UPDATE.
 
-        # Создаем заказ
-        order = await self.order_repository.create(session, order_data, total_price)
+        Количество по одинаковым продуктам суммируется. Если хотя бы одной
+        позиции не хватает, транзакция откатывается и заказ не создается,
+        поэтому при конкурентных заказах остаток не уходит в минус.
 
-        # Обновляем количество товаров на складе
-        for product, quantity in products_to_update:
-            product.stock_quantity -= quantity
-            session.add(product)
+        Args:
+            session: Асинхронная сессия базы данных
+            order_data: Данные для создания заказа
 
-        await session.commit()
-        await session.refresh(order)
+        Returns:
+            Словарь {ID продукта: Product} с актуальным остатком
 
-        # Загружаем items для возврата (нужно для Pydantic валидации)
-        from sqlalchemy.orm import selectinload
+        Raises:
+            ValueError: Если продукт не найден или недостаточно товара на складе
+        """
+        quantities: dict[int, int] = defaultdict(int)
+        for item_data in order_data.items:
+            quantities[item_data.product_id] += item_data.quantity
 
-        stmt = (
-            select(Order).where(Order.id == order.id).options(selectinload(Order.items))
+        products = await self.product_repository.reserve_stock(
+            session, dict(quantities)
         )
-        result = await session.execute(stmt)
-        return result.scalar_one()
+        if len(products) == len(quantities):
+            return products
+
+        # Резервирование не удалось: откатываем частичное списание
+        # и выясняем причину отказа
+        await session.rollback()
+        rejected_ids = [
+            product_id for product_id in quantities if product_id not in products
+        ]
+        current = await self.product_repository.get_many(session, rejected_ids)
+        for product_id in rejected_ids:
+            product = current.get(product_id)
+            if not product:
+                raise ValueError(f"Product with ID {product_id} not found")
+            if product.stock_quantity < quantities[product_id]:
+                raise ValueError(
+                    f"Insufficient stock for product {product.name}. "
+                    f"Available: {product.stock_quantity}, "
+                    f"Requested: {quantities[product_id]}"
+                )
+        raise ValueError("Insufficient stock, please retry the order")
 
     async def update(
         self, session: AsyncSession, order_id: int, order_data: OrderUpdate
@@ -144,15 +198,11 @@ class OrderService:
             order_data: Данные для обновления
 
         Returns:
-            Обновленный объект Order
+            Обновленный объект Order с загруженными items
 
         Raises:
             ValueError: Если заказ не найден
         """
-        existing_order = await self.order_repository.get_by_id(session, order_id)
-        if not existing_order:
-            raise ValueError(f"Order with ID {order_id} not found")
-
         order = await self.order_repository.update(session, order_id, order_data)
         await session.commit()
         return order
@@ -1,21 +1,88 @@
 import logging
-from datetime import datetime
+from collections.abc import Iterable, Sequence
+from functools import partial
 
 import redis
-from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.cache.codec import dumps_json
+from app.cache.list_cache import (
+    CachedPaginator,
+    invalidate_list_cache,
+)
 from app.cache.product_cache import (
     delete_product_from_cache,
+    delete_products_from_cache,
     get_product_from_cache,
+    get_product_json_from_cache,
+    get_products_from_cache,
     set_product_to_cache,
+    set_products_to_cache,
     update_product_in_cache,
 )
+from app.cache.settings import CacheSettings
+from app.cache.settings import cache_settings as default_cache_settings
+from app.cache.stampede import SingleFlight, load_with_lock
+from app.cache.write_policy import apply_write_policy, wait_for_pending_writes
+from app.database import async_session_factory
 from app.models import Product
+from app.pagination import TotalMode
+from app.read_models import ProductView
 from app.repositories.product_repository import ProductRepository
-from app.schemas.product_schema import ProductCreate, ProductResponse, ProductUpdate
+from app.schemas.product_schema import ProductCreate, ProductUpdate
 
 logger = logging.getLogger(__name__)
 
+LIST_CACHE_ENTITY = "products"
+
+# Поля, сохраняемые в кэш (совпадают с ProductResponse)
+CACHE_FIELDS = (
+    "id",
+    "name",
+    "sku",
+    "description",
+    "price",
+    "stock_quantity",
+    "created_at",
+    "updated_at",
+)
+
+# Загрузки по ID, выполняющиеся в процессе (общие для всех экземпляров сервиса)
+_product_loads = SingleFlight()
+
+
+def _product_to_cache(product: Product) -> dict:
+    """
+    Подготовить данные продукта для сохранения в кэш.
+
+    Поля читаются напрямую из объекта, даты остаются datetime и
+    сериализуются кодеком кэша (см. app.cache.codec).
+
+    Args:
+        product: Объект Product
+
+    Returns:
+        dict: Данные продукта (поля ProductResponse)
+    """
+    return {field: getattr(product, field) for field in CACHE_FIELDS}
+
+
+def _product_from_cache(cached_data: dict) -> ProductView:
+    """
+    Преобразовать данные продукта из кэша в объект чтения.
+
+    Вместо ORM-объекта создается ProductView: попадание в кэш не платит за
+    инструментирование модели SQLAlchemy.
+
+    Args:
+        cached_data: Данные продукта из кэша
+
+    Returns:
+        ProductView: Данные продукта (не привязаны к сессии)
+    """
+    return ProductView.from_cache(cached_data)
+
 
 class ProductService:
     """Сервис для бизнес-логики работы с продуктами."""
@@ -23,75 +90,171 @@ class ProductService:
     def __init__(
         self,
         product_repository: ProductRepository,
-        redis_client: redis.Redis | None = None,
+        redis_client: aioredis.Redis | None = None,
+        cache_settings: CacheSettings | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
     ):
         """
         Инициализация сервиса.
         Args:
             product_repository: Репозиторий для работы с продуктами (Dependency Injection)
             redis_client: Клиент Redis для кэширования (опционально)
+            cache_settings: Настройки кэширования (по умолчанию из окружения)
+            session_factory: Фабрика сессий для загрузки промахов кэша
+                (по умолчанию фабрика приложения)
         """
         self.product_repository = product_repository
         self.redis_client = redis_client
+        self.cache_settings = cache_settings or default_cache_settings
+        self.session_factory = session_factory or async_session_factory
+        self.paginator = CachedPaginator(
+            product_repository,
+            LIST_CACHE_ENTITY,
+            _product_to_cache,
+            _product_from_cache,
+            redis_client,
+        )
 
-    async def get_by_id(self, session: AsyncSession, product_id: int) -> Product | None:
+    async def get_by_id(
+        self, session: AsyncSession, product_id: int
+    ) -> Product | ProductView | None:
         """
         Получить продукт по ID с использованием кэширования.
+
+        При промахе кэша одновременные запросы одного ID выполняют один запрос
+        к БД (single-flight), а при включенном CACHE_STAMPEDE_LOCK - одна
+        реплика на все приложение.
         Args:
             session: Асинхронная сессия базы данных
             product_id: ID продукта (int)
 
         Returns:
-            Product объект или None, если не найден
+            Product из БД (без Redis), ProductView из кэша или None, если не найден
         """
+        if not self.redis_client:
+            return await self.product_repository.get_by_id(session, product_id)
+
         # Попытка получить данные из кэша
+        cached_data = await get_product_from_cache(self.redis_client, product_id)
+        if cached_data is None:
+            # Одновременные промахи по одному ключу объединяются в одну загрузку
+            cached_data = await _product_loads.do(
+                f"product:{product_id}",
+                lambda: self._load_to_cache(product_id),
+            )
+        if cached_data is None:
+            return None
+        return _product_from_cache(cached_data)
+
+    async def get_json_by_id(
+        self, session: AsyncSession, product_id: int
+    ) -> bytes | None:
+        """
+        Получить продукт по ID в виде готового JSON ответа API.
+
+        При попадании в кэш значение возвращается без построения объектов и
+        валидации схемы ответа; промахи загружаются так же, как в get_by_id.
+        Args:
+            session: Асинхронная сессия базы данных
+            product_id: ID продукта (int)
+
+        Returns:
+            JSON с полями ProductResponse или None, если продукт не найден
+        """
+        if not self.redis_client:
+            product = await self.product_repository.get_by_id(session, product_id)
+            return dumps_json(_product_to_cache(product)) if product else None
+
+        body = await get_product_json_from_cache(self.redis_client, product_id)
+        if body is not None:
+            return body
+
+        cached_data = await _product_loads.do(
+            f"product:{product_id}",
+            lambda: self._load_to_cache(product_id),
+        )
+        return dumps_json(cached_data) if cached_data is not None else None
+
+    async def get_many(
+        self, session: AsyncSession, product_ids: Iterable[int]
+    ) -> dict[int, Product | ProductView]:
+        """
+        Получить несколько продуктов по ID с использованием кэширования.
+
+        Кэш читается одной командой MGET, промахи загружаются из БД одним
+        запросом и сохраняются в кэш одним конвейером SETEX.
+        Args:
+            session: Асинхронная сессия базы данных
+            product_ids: ID продуктов (повторы допускаются)
+
+        Returns:
+            Словарь {ID продукта: Product или ProductView из кэша};
+            отсутствующие в БД ID не включаются
+        """
+        ids = set(product_ids)
+        if not ids:
+            return {}
+
+        products: dict[int, Product | ProductView] = {}
         if self.redis_client:
-            cached_data = get_product_from_cache(self.redis_client, product_id)
-            if cached_data is not None:
-                # Преобразуем словарь обратно в объект Product
-                # Преобразуем строки ISO формата обратно в datetime
-                created_at = (
-                    datetime.fromisoformat(cached_data["created_at"])
-                    if isinstance(cached_data["created_at"], str)
-                    else cached_data["created_at"]
-                )
-                updated_at = (
-                    datetime.fromisoformat(cached_data["updated_at"])
-                    if cached_data.get("updated_at")
-                    and isinstance(cached_data["updated_at"], str)
-                    else cached_data.get("updated_at")
-                )
-                return Product(
-                    id=cached_data["id"],
-                    name=cached_data["name"],
-                    description=cached_data.get("description"),
-                    price=cached_data["price"],
-                    stock_quantity=cached_data["stock_quantity"],
-                    created_at=created_at,
-                    updated_at=updated_at,
-                )
+            cached = await get_products_from_cache(self.redis_client, sorted(ids))
+            products = {
+                product_id: _product_from_cache(cached_data)
+                for product_id, cached_data in cached.items()
+            }
 
-        # Если данных нет в кэше, получаем из БД
-        product = await self.product_repository.get_by_id(session, product_id)
-        if product and self.redis_client:
-            # Сохраняем в кэш (обработка ошибок внутри функции)
+        missing_ids = ids - products.keys()
+        if not missing_ids:
+            return products
+
+        loaded = await self.product_repository.get_many(session, missing_ids)
+        products.update(loaded)
+        if loaded and self.redis_client:
             try:
-                product_dict = ProductResponse.model_validate(product).model_dump()
-                # Преобразуем datetime в строки для JSON
-                if product_dict.get("created_at"):
-                    product_dict["created_at"] = product_dict["created_at"].isoformat()
-                if product_dict.get("updated_at"):
-                    product_dict["updated_at"] = product_dict["updated_at"].isoformat()
-                set_product_to_cache(self.redis_client, product_id, product_dict)
+                await set_products_to_cache(
+                    self.redis_client,
+                    {
+                        product_id: _product_to_cache(product)
+                        for product_id, product in loaded.items()
+                    },
+                )
             except (ValueError, TypeError, redis.RedisError) as e:
                 # Логируем ошибку, но не блокируем возврат данных
                 logger.warning(
-                    "Не удалось сохранить продукцию в кэш: product_id=%s, error=%s",
-                    product_id,
+                    "Не удалось сохранить продукцию в кэш: product_ids=%s, error=%s",
+                    sorted(loaded),
                     e,
                 )
+        return products
 
-        return product
+    async def warm_up_cache(self, session: AsyncSession, limit: int) -> int:
+        """
+        Прогреть кэш самыми заказываемыми продуктами.
+
+        Используется после деплоя или очистки Redis: продукты читаются одним
+        агрегирующим запросом по order_items и записываются в ключи
+        product:{id} одним конвейером SET NX EX. Прогрев заполняет только
+        отсутствующие ключи: значение, записанное после чтения продуктов
+        (например, при их изменении), не перезаписывается прежними данными.
+        Args:
+            session: Асинхронная сессия базы данных
+            limit: Количество продуктов (N самых заказываемых)
+
+        Returns:
+            Количество загруженных продуктов (0 без Redis)
+        """
+        if not self.redis_client:
+            return 0
+
+        products = await self.product_repository.get_most_ordered(session, limit)
+        if products:
+            await set_products_to_cache(
+                self.redis_client,
+                {product.id: _product_to_cache(product) for product in products},
+                only_missing=True,
+            )
+        logger.info("Прогрев кэша продукции: загружено %s из %s", len(products), limit)
+        return len(products)
 
     async def get_by_filter(
         self, session: AsyncSession, count: int, page: int, **kwargs
@@ -111,6 +274,40 @@ class ProductService:
             session, count, page, **kwargs
         )
 
+    async def get_page(
+        self,
+        session: AsyncSession,
+        count: int,
+        page: int = 1,
+        cursor: str | None = None,
+        total_mode: TotalMode | None = None,
+        **kwargs,
+    ) -> tuple[list[Product | ProductView], int | None, str | None]:
+        """
+        Получить страницу продуктов для ответа списка с кэшированием.
+
+        Страница кэшируется по параметрам запроса и инвалидируется при любом
+        изменении продуктов (см. CachedPaginator).
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            page: Номер страницы (игнорируется, если передан курсор)
+            cursor: Курсор из предыдущего ответа (keyset пагинация)
+            total_mode: Режим подсчета общего количества (по умолчанию
+                exact для страниц по номеру и none для курсора)
+            **kwargs: Фильтры (name, min_price, max_price)
+
+        Returns:
+            Список продуктов, общее количество (None для режима none)
+            и курсор следующей страницы (None, если страница последняя)
+
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        return await self.paginator.get_page(
+            session, count, page, cursor, total_mode, **kwargs
+        )
+
     async def create(
         self, session: AsyncSession, product_data: ProductCreate
     ) -> Product:
@@ -136,8 +333,73 @@ class ProductService:
 
         product = await self.product_repository.create(session, product_data)
         await session.commit()
+        await self._invalidate_list_cache()
+        await self._write_to_cache(product, created=True)
         return product
 
+    async def bulk_create(
+        self,
+        session: AsyncSession,
+        products_data: Sequence[ProductCreate],
+        upsert: bool = False,
+    ) -> list[Product]:
+        """
+        Создать несколько продуктов одним многострочным INSERT (загрузка каталога).
+
+        Созданные продукты не записываются в кэш, чтобы загрузка каталога не
+        вытесняла популярные записи (их загружает прогрев кэша). При upsert
+        ключи продуктов удаляются из кэша одним конвейером: обновленные
+        продукты не должны читаться из кэша в прежнем виде.
+        Args:
+            session: Асинхронная сессия базы данных
+            products_data: Данные продуктов
+            upsert: Обновлять ли продукты с существующим артикулом (sku)
+
+        Returns:
+            Список созданных (и обновленных при upsert) продуктов
+
+        Raises:
+            ValueError: Если данные невалидны
+        """
+        for product_data in products_data:
+            if product_data.price <= 0:
+                raise ValueError("Price must be greater than 0")
+            if product_data.stock_quantity < 0:
+                raise ValueError("Stock quantity cannot be negative")
+
+        products = await self.product_repository.bulk_create(
+            session, products_data, upsert
+        )
+        await session.commit()
+        await self._invalidate_list_cache()
+
+        if upsert and self.redis_client:
+            # Фоновые записи не должны вернуть в кэш прежние данные продуктов
+            await wait_for_pending_writes()
+            await delete_products_from_cache(
+                self.redis_client, (product.id for product in products)
+            )
+        logger.info("Продукты загружены: count=%s, upsert=%s", len(products), upsert)
+        return products
+
+    async def invalidate_cache(self, product_ids: Iterable[int]) -> None:
+        """
+        Удалить продукты из кэша и инвалидировать кэш списков продуктов.
+
+        Нужна, когда изменения фиксируются вне сервиса (транзакцией пакета
+        RabbitMQ consumer): кэш очищается только после фиксации, иначе
+        параллельное чтение вернуло бы в кэш прежние данные.
+        Args:
+            product_ids: Идентификаторы продукции
+        """
+        if not self.redis_client:
+            return
+
+        await self._invalidate_list_cache()
+        # Фоновые записи не должны вернуть в кэш прежние данные продуктов
+        await wait_for_pending_writes()
+        await delete_products_from_cache(self.redis_client, product_ids)
+
     async def update(
         self, session: AsyncSession, product_id: int, product_data: ProductUpdate
     ) -> Product:
@@ -170,24 +432,10 @@ class ProductService:
             session, product_id, product_data
         )
         await session.commit()
+        await self._invalidate_list_cache()
 
-        # Обновление кэша после обновления продукции (обработка ошибок внутри функции)
-        if self.redis_client:
-            try:
-                product_dict = ProductResponse.model_validate(product).model_dump()
-                # Преобразуем datetime в строки для JSON
-                if product_dict.get("created_at"):
-                    product_dict["created_at"] = product_dict["created_at"].isoformat()
-                if product_dict.get("updated_at"):
-                    product_dict["updated_at"] = product_dict["updated_at"].isoformat()
-                update_product_in_cache(self.redis_client, product_id, product_dict)
-            except (ValueError, TypeError, redis.RedisError) as e:
-                # Логируем ошибку, но не блокируем возврат данных
-                logger.warning(
-                    "Не удалось обновить продукцию в кэше: product_id=%s, error=%s",
-                    product_id,
-                    e,
-                )
+        # Обновление кэша согласно политике записи (обработка ошибок внутри функции)
+        await self._write_to_cache(product)
 
         return product
 
@@ -203,11 +451,14 @@ class ProductService:
         """
         await self.product_repository.delete(session, product_id)
         await session.commit()
+        await self._invalidate_list_cache()
 
         # Инвалидация кэша после удаления (обработка ошибок внутри функции)
         if self.redis_client:
             try:
-                delete_product_from_cache(self.redis_client, product_id)
+                # Фоновая запись не должна вернуть удаленную продукцию в кэш
+                await wait_for_pending_writes(f"product:{product_id}")
+                await delete_product_from_cache(self.redis_client, product_id)
             except redis.RedisError as e:
                 # Логируем ошибку, но не блокируем удаление
                 logger.warning(
@@ -227,3 +478,88 @@ class ProductService:
             Количество продуктов
         """
         return await self.product_repository.count(session, **kwargs)
+
+    async def _load_to_cache(self, product_id: int) -> dict | None:
+        """
+        Загрузить продукцию из БД и сохранить в кэш.
+
+        Загрузка общая для всех ожидающих запросов и может пережить отмену
+        запроса, начавшего ее, поэтому выполняется в собственной сессии.
+        При включенной распределенной блокировке загрузку выполняет одна
+        реплика, остальные дожидаются значения в кэше.
+        Args:
+            product_id: ID продукта (int)
+
+        Returns:
+            Данные для кэша или None, если запись не найдена
+        """
+        async with self.session_factory() as session:
+            if not self.cache_settings.stampede_lock:
+                return await self._load_from_db(session, product_id)
+
+            return await load_with_lock(
+                self.redis_client,
+                f"product:{product_id}",
+                lambda: self._load_from_db(session, product_id),
+                lambda: get_product_from_cache(self.redis_client, product_id),
+                self.cache_settings.stampede_lock_timeout,
+                self.cache_settings.stampede_poll_interval,
+            )
+
+    async def _load_from_db(
+        self, session: AsyncSession, product_id: int
+    ) -> dict | None:
+        """
+        Прочитать продукцию из БД и сохранить в кэш (обработка ошибок внутри).
+        Args:
+            session: Асинхронная сессия базы данных
+            product_id: ID продукта (int)
+
+        Returns:
+            Данные для кэша или None, если запись не найдена
+        """
+        product = await self.product_repository.get_by_id(session, product_id)
+        if product is None:
+            return None
+
+        product_dict = _product_to_cache(product)
+        try:
+            await set_product_to_cache(self.redis_client, product_id, product_dict)
+        except (ValueError, TypeError, redis.RedisError) as e:
+            # Логируем ошибку, но не блокируем возврат данных
+            logger.warning(
+                "Не удалось сохранить продукцию в кэш: product_id=%s, error=%s",
+                product_id,
+                e,
+            )
+        return product_dict
+
+    async def _write_to_cache(self, product: Product, created: bool = False) -> None:
+        """
+        Обновить кэш продукции после фиксации изменения (CACHE_PRODUCT_WRITE_POLICY).
+        Args:
+            product: Сохраненный объект Product
+            created: Продукция только что создана (инвалидировать нечего)
+        """
+        if not self.redis_client:
+            return
+
+        product_id = product.id
+        # Данные снимаются сразу: фоновая запись выполняется после ответа
+        product_dict = _product_to_cache(product)
+        write = set_product_to_cache if created else update_product_in_cache
+        await apply_write_policy(
+            self.cache_settings.product_write_policy,
+            f"product:{product_id}",
+            partial(write, self.redis_client, product_id, product_dict),
+            (
+                None
+                if created
+                else partial(delete_product_from_cache, self.redis_client, product_id)
+            ),
+        )
+
+    async def _invalidate_list_cache(self) -> None:
+        """Инвалидировать кэш страниц списка продуктов (после изменения данных)."""
+        if self.redis_client:
+            await invalidate_list_cache(self.redis_client, LIST_CACHE_ENTITY)
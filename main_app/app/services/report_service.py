@@ -1,11 +1,23 @@
 """Сервис для бизнес-логики работы с отчетами."""
 
-from datetime import date
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.order_repository import OrderRepository
 from app.repositories.report_repository import ReportRepository
+from app.schemas.report_schema import ReportExportFormat
+
+# Запас для инкрементального режима: заказы, измененные в этом интервале до
+# предыдущего запуска, пересчитываются повторно (upsert делает это безопасным)
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# Поля отчета в выгрузке (и заголовок CSV)
+REPORT_EXPORT_FIELDS = ("id", "report_at", "order_id", "count_product", "created_at")
 
 
 class ReportService:
@@ -26,47 +38,40 @@ class ReportService:
         self.order_repository = order_repository
         self.report_repository = report_repository
 
-    async def generate_report(self, session: AsyncSession, report_date: date) -> list:
+    async def generate_report(
+        self, session: AsyncSession, report_date: date, incremental: bool = False
+    ) -> list:
         """
         Сформировать отчет за указанную дату.
 
-        Получает все заказы за указанную дату, подсчитывает количество продукции
-        в каждом заказе и создает записи отчетов.
+        Количество продукции по каждому заказу за дату считается и
+        сохраняется одним INSERT ... SELECT ... ON CONFLICT DO UPDATE на стороне
+        БД, поэтому повторный запуск не создает дубликатов. Момент запуска
+        сохраняется как отметка (watermark) в той же транзакции.
 
         Args:
             session: Асинхронная сессия базы данных
             report_date: Дата для формирования отчета
+            incremental: Учитывать только заказы, созданные или измененные
+                после предыдущего формирования отчета за эту дату
 
         Returns:
-            Список созданных отчетов
+            Список созданных или обновленных отчетов
         """
-        # Получаем все заказы за указанную дату
-        orders = await self.order_repository.get_orders_by_date(session, report_date)
-
-        reports = []
-
-        # Для каждого заказа создаем отчет
-        for order in orders:
-            # Подсчитываем общее количество продукции в заказе
-            # (сумма quantity всех элементов заказа)
-            count_product = sum(item.quantity for item in order.items)
-
-            # Создаем отчет
-            report = await self.report_repository.create_report(
-                session=session,
-                report_at=report_date,
-                order_id=order.id,
-                count_product=count_product,
-            )
-            reports.append(report)
-
-        # Сохраняем все отчеты в базу данных
+        started_at = datetime.now()
+        changed_since = None
+        if incremental:
+            watermark = await self.report_repository.get_watermark(session, report_date)
+            if watermark is not None:
+                # Перекрытие покрывает заказы из транзакций, зафиксированных
+                # после предыдущего запуска с более ранним временем изменения
+                changed_since = watermark - WATERMARK_OVERLAP
+
+        reports = await self.report_repository.upsert_reports_for_date(
+            session, report_date, changed_since
+        )
+        await self.report_repository.set_watermark(session, report_date, started_at)
         await session.commit()
-
-        # Обновляем объекты отчетов после commit
-        for report in reports:
-            await session.refresh(report)
-
         return reports
 
     async def get_report_by_date(
@@ -83,3 +88,67 @@ class ReportService:
             Список отчетов за указанную дату
         """
         return await self.report_repository.get_reports_by_date(session, report_date)
+
+    async def export_reports(
+        self,
+        session: AsyncSession,
+        start_date: date,
+        end_date: date,
+        export_format: ReportExportFormat = ReportExportFormat.NDJSON,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[bytes]:
+        """
+        Потоково выгрузить отчеты за диапазон дат в формате NDJSON или CSV.
+
+        Строки читаются серверным курсором порциями по chunk_size и сразу
+        кодируются, поэтому потребление памяти не зависит от объема выгрузки.
+
+        Args:
+            session: Асинхронная сессия базы данных (должна быть открыта, пока
+                выгрузка не прочитана до конца)
+            start_date: Начальная дата (включительно)
+            end_date: Конечная дата (включительно)
+            export_format: Формат выгрузки
+            chunk_size: Количество строк в порции
+
+        Yields:
+            bytes: Очередная порция выгрузки
+        """
+        if export_format == ReportExportFormat.CSV:
+            yield _encode_csv([REPORT_EXPORT_FIELDS])
+
+        async for rows in self.report_repository.stream_reports_between(
+            session, start_date, end_date, chunk_size
+        ):
+            if export_format == ReportExportFormat.CSV:
+                yield _encode_csv(
+                    [
+                        [_export_value(row[field]) for field in REPORT_EXPORT_FIELDS]
+                        for row in rows
+                    ]
+                )
+            else:
+                yield "".join(
+                    json.dumps(
+                        {
+                            field: _export_value(row[field])
+                            for field in REPORT_EXPORT_FIELDS
+                        }
+                    )
+                    + "\n"
+                    for row in rows
+                ).encode()
+
+
+def _export_value(value):
+    """Преобразовать значение поля отчета для выгрузки (даты в ISO 8601)."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows: list[list]) -> bytes:
+    """Закодировать строки в CSV."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
@@ -1,94 +1,165 @@
 import logging
-from datetime import datetime
+from functools import partial
 
 import redis
+import redis.asyncio as aioredis
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.cache.codec import dumps_json
+from app.cache.list_cache import (
+    CachedPaginator,
+    invalidate_list_cache,
+)
+from app.cache.settings import CacheSettings
+from app.cache.settings import cache_settings as default_cache_settings
+from app.cache.stampede import SingleFlight, load_with_lock
 from app.cache.user_cache import (
     delete_user_from_cache,
     get_user_from_cache,
+    get_user_json_from_cache,
     set_user_to_cache,
+    update_user_in_cache,
 )
+from app.cache.write_policy import apply_write_policy, wait_for_pending_writes
+from app.database import async_session_factory
 from app.models import User
+from app.pagination import TotalMode
+from app.read_models import UserView
 from app.repositories.user_repository import UserRepository
-from app.schemas.user_schema import UserCreate, UserResponse, UserUpdate
+from app.schemas.user_schema import UserCreate, UserUpdate
 
 logger = logging.getLogger(__name__)
 
+LIST_CACHE_ENTITY = "users"
+
+# Поля, сохраняемые в кэш (совпадают с UserResponse)
+CACHE_FIELDS = ("id", "username", "email", "description", "created_at", "updated_at")
+
+# Загрузки по ID, выполняющиеся в процессе (общие для всех экземпляров сервиса)
+_user_loads = SingleFlight()
+
+
+def _user_to_cache(user: User) -> dict:
+    """
+    Подготовить данные пользователя для сохранения в кэш.
+
+    Поля читаются напрямую из объекта, даты остаются datetime и
+    сериализуются кодеком кэша (см. app.cache.codec).
+
+    Args:
+        user: Объект User
+
+    Returns:
+        dict: Данные пользователя (поля UserResponse)
+    """
+    return {field: getattr(user, field) for field in CACHE_FIELDS}
+
+
+def _user_from_cache(cached_data: dict) -> UserView:
+    """
+    Преобразовать данные пользователя из кэша в объект чтения.
+
+    Вместо ORM-объекта создается UserView: попадание в кэш не платит за
+    инструментирование модели SQLAlchemy.
+
+    Args:
+        cached_data: Данные пользователя из кэша
+
+    Returns:
+        UserView: Данные пользователя (не привязаны к сессии)
+    """
+    return UserView.from_cache(cached_data)
+
 
 class UserService:
     """Сервис для бизнес-логики работы с пользователями."""
 
     def __init__(
-        self, user_repository: UserRepository, redis_client: redis.Redis | None = None
+        self,
+        user_repository: UserRepository,
+        redis_client: aioredis.Redis | None = None,
+        cache_settings: CacheSettings | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
     ):
         """
         Инициализация сервиса.
         Args:
             user_repository: Репозиторий для работы с пользователями (Dependency Injection)
             redis_client: Клиент Redis для кэширования (опционально)
+            cache_settings: Настройки кэширования (по умолчанию из окружения)
+            session_factory: Фабрика сессий для загрузки промахов кэша
+                (по умолчанию фабрика приложения)
         """
         self.user_repository = user_repository
         self.redis_client = redis_client
-
-    async def get_by_id(self, session: AsyncSession, user_id: int) -> User | None:
+        self.cache_settings = cache_settings or default_cache_settings
+        self.session_factory = session_factory or async_session_factory
+        self.paginator = CachedPaginator(
+            user_repository,
+            LIST_CACHE_ENTITY,
+            _user_to_cache,
+            _user_from_cache,
+            redis_client,
+        )
+
+    async def get_by_id(
+        self, session: AsyncSession, user_id: int
+    ) -> User | UserView | None:
         """
         Получить пользователя по ID с использованием кэширования.
+
+        При промахе кэша одновременные запросы одного ID выполняют один запрос
+        к БД (single-flight), а при включенном CACHE_STAMPEDE_LOCK - одна
+        реплика на все приложение.
         Args:
             session: Асинхронная сессия базы данных
             user_id: ID пользователя (int)
 
         Returns:
-            User объект или None, если не найден
+            User из БД (без Redis), UserView из кэша или None, если не найден
         """
+        if not self.redis_client:
+            return await self.user_repository.get_by_id(session, user_id)
+
         # Попытка получить данные из кэша
-        if self.redis_client:
-            cached_data = get_user_from_cache(self.redis_client, user_id)
-            if cached_data is not None:
-                # Преобразуем словарь обратно в объект User
-                # Преобразуем строки ISO формата обратно в datetime
-                created_at = (
-                    datetime.fromisoformat(cached_data["created_at"])
-                    if isinstance(cached_data["created_at"], str)
-                    else cached_data["created_at"]
-                )
-                updated_at = (
-                    datetime.fromisoformat(cached_data["updated_at"])
-                    if cached_data.get("updated_at")
-                    and isinstance(cached_data["updated_at"], str)
-                    else cached_data.get("updated_at")
-                )
-                return User(
-                    id=cached_data["id"],
-                    username=cached_data["username"],
-                    email=cached_data["email"],
-                    description=cached_data.get("description"),
-                    created_at=created_at,
-                    updated_at=updated_at,
-                )
+        cached_data = await get_user_from_cache(self.redis_client, user_id)
+        if cached_data is None:
+            # Одновременные промахи по одному ключу объединяются в одну загрузку
+            cached_data = await _user_loads.do(
+                f"user:{user_id}",
+                lambda: self._load_to_cache(user_id),
+            )
+        if cached_data is None:
+            return None
+        return _user_from_cache(cached_data)
 
-        # Если данных нет в кэше, получаем из БД
-        user = await self.user_repository.get_by_id(session, user_id)
-        if user and self.redis_client:
-            # Сохраняем в кэш (обработка ошибок внутри функции)
-            try:
-                user_dict = UserResponse.model_validate(user).model_dump()
-                # Преобразуем datetime в строки для JSON
-                if user_dict.get("created_at"):
-                    user_dict["created_at"] = user_dict["created_at"].isoformat()
-                if user_dict.get("updated_at"):
-                    user_dict["updated_at"] = user_dict["updated_at"].isoformat()
-                set_user_to_cache(self.redis_client, user_id, user_dict)
-            except (ValueError, TypeError, redis.RedisError) as e:
-                # Логируем ошибку, но не блокируем возврат данных
-                logger.warning(
-                    "Не удалось сохранить пользователя в кэш: user_id=%s, error=%s",
-                    user_id,
-                    e,
-                )
+    async def get_json_by_id(self, session: AsyncSession, user_id: int) -> bytes | None:
+        """
+        Получить пользователя по ID в виде готового JSON ответа API.
 
-        return user
+        При попадании в кэш значение возвращается без построения объектов и
+        валидации схемы ответа; промахи загружаются так же, как в get_by_id.
+        Args:
+            session: Асинхронная сессия базы данных
+            user_id: ID пользователя (int)
+
+        Returns:
+            JSON с полями UserResponse или None, если пользователь не найден
+        """
+        if not self.redis_client:
+            user = await self.user_repository.get_by_id(session, user_id)
+            return dumps_json(_user_to_cache(user)) if user else None
+
+        body = await get_user_json_from_cache(self.redis_client, user_id)
+        if body is not None:
+            return body
+
+        cached_data = await _user_loads.do(
+            f"user:{user_id}",
+            lambda: self._load_to_cache(user_id),
+        )
+        return dumps_json(cached_data) if cached_data is not None else None
 
     async def get_by_filter(
         self, session: AsyncSession, count: int, page: int, **kwargs
@@ -106,6 +177,40 @@ class UserService:
         """
         return await self.user_repository.get_by_filter(session, count, page, **kwargs)
 
+    async def get_page(
+        self,
+        session: AsyncSession,
+        count: int,
+        page: int = 1,
+        cursor: str | None = None,
+        total_mode: TotalMode | None = None,
+        **kwargs,
+    ) -> tuple[list[User | UserView], int | None, str | None]:
+        """
+        Получить страницу пользователей для ответа списка с кэшированием.
+
+        Страница кэшируется по параметрам запроса и инвалидируется при любом
+        изменении пользователей (см. CachedPaginator).
+        Args:
+            session: Асинхронная сессия базы данных
+            count: Количество записей на странице
+            page: Номер страницы (игнорируется, если передан курсор)
+            cursor: Курсор из предыдущего ответа (keyset пагинация)
+            total_mode: Режим подсчета общего количества (по умолчанию
+                exact для страниц по номеру и none для курсора)
+            **kwargs: Фильтры (username, email)
+
+        Returns:
+            Список пользователей, общее количество (None для режима none)
+            и курсор следующей страницы (None, если страница последняя)
+
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        return await self.paginator.get_page(
+            session, count, page, cursor, total_mode, **kwargs
+        )
+
     async def create(self, session: AsyncSession, user_data: UserCreate) -> User:
         """
         Создать нового пользователя с проверкой уникальности.
@@ -129,6 +234,8 @@ class UserService:
 
         user = await self.user_repository.create(session, user_data)
         await session.commit()
+        await self._invalidate_list_cache()
+        await self._write_to_cache(user, created=True)
         return user
 
     async def update(
@@ -167,18 +274,10 @@ class UserService:
 
         user = await self.user_repository.update(session, user_id, user_data)
         await session.commit()
+        await self._invalidate_list_cache()
 
-        # Инвалидация кэша после обновления (обработка ошибок внутри функции)
-        if self.redis_client:
-            try:
-                delete_user_from_cache(self.redis_client, user_id)
-            except redis.RedisError as e:
-                # Логируем ошибку, но не блокируем возврат данных
-                logger.warning(
-                    "Не удалось удалить пользователя из кэша: user_id=%s, error=%s",
-                    user_id,
-                    e,
-                )
+        # Обновление кэша согласно политике записи (обработка ошибок внутри функции)
+        await self._write_to_cache(user)
 
         return user
 
@@ -194,11 +293,14 @@ class UserService:
         """
         await self.user_repository.delete(session, user_id)
         await session.commit()
+        await self._invalidate_list_cache()
 
         # Инвалидация кэша после удаления (обработка ошибок внутри функции)
         if self.redis_client:
             try:
-                delete_user_from_cache(self.redis_client, user_id)
+                # Фоновая запись не должна вернуть удаленного пользователя в кэш
+                await wait_for_pending_writes(f"user:{user_id}")
+                await delete_user_from_cache(self.redis_client, user_id)
             except redis.RedisError as e:
                 # Логируем ошибку, но не блокируем удаление
                 logger.warning(
@@ -220,6 +322,89 @@ class UserService:
         """
         return await self.user_repository.count(session, **kwargs)
 
+    async def _load_to_cache(self, user_id: int) -> dict | None:
+        """
+        Загрузить пользователя из БД и сохранить в кэш.
+
+        Загрузка общая для всех ожидающих запросов и может пережить отмену
+        запроса, начавшего ее, поэтому выполняется в собственной сессии.
+        При включенной распределенной блокировке загрузку выполняет одна
+        реплика, остальные дожидаются значения в кэше.
+        Args:
+            user_id: ID пользователя (int)
+
+        Returns:
+            Данные для кэша или None, если запись не найдена
+        """
+        async with self.session_factory() as session:
+            if not self.cache_settings.stampede_lock:
+                return await self._load_from_db(session, user_id)
+
+            return await load_with_lock(
+                self.redis_client,
+                f"user:{user_id}",
+                lambda: self._load_from_db(session, user_id),
+                lambda: get_user_from_cache(self.redis_client, user_id),
+                self.cache_settings.stampede_lock_timeout,
+                self.cache_settings.stampede_poll_interval,
+            )
+
+    async def _load_from_db(self, session: AsyncSession, user_id: int) -> dict | None:
+        """
+        Прочитать пользователя из БД и сохранить в кэш (обработка ошибок внутри).
+        Args:
+            session: Асинхронная сессия базы данных
+            user_id: ID пользователя (int)
+
+        Returns:
+            Данные для кэша или None, если запись не найдена
+        """
+        user = await self.user_repository.get_by_id(session, user_id)
+        if user is None:
+            return None
+
+        user_dict = _user_to_cache(user)
+        try:
+            await set_user_to_cache(self.redis_client, user_id, user_dict)
+        except (ValueError, TypeError, redis.RedisError) as e:
+            # Логируем ошибку, но не блокируем возврат данных
+            logger.warning(
+                "Не удалось сохранить пользователя в кэш: user_id=%s, error=%s",
+                user_id,
+                e,
+            )
+        return user_dict
+
+    async def _write_to_cache(self, user: User, created: bool = False) -> None:
+        """
+        Обновить кэш пользователя после фиксации изменения (CACHE_USER_WRITE_POLICY).
+        Args:
+            user: Сохраненный объект User
+            created: Пользователь только что создан (инвалидировать нечего)
+        """
+        if not self.redis_client:
+            return
+
+        user_id = user.id
+        # Данные снимаются сразу: фоновая запись выполняется после ответа
+        user_dict = _user_to_cache(user)
+        write = set_user_to_cache if created else update_user_in_cache
+        await apply_write_policy(
+            self.cache_settings.user_write_policy,
+            f"user:{user_id}",
+            partial(write, self.redis_client, user_id, user_dict),
+            (
+                None
+                if created
+                else partial(delete_user_from_cache, self.redis_client, user_id)
+            ),
+        )
+
+    async def _invalidate_list_cache(self) -> None:
+        """Инвалидировать кэш страниц списка пользователей (после изменения данных)."""
+        if self.redis_client:
+            await invalidate_list_cache(self.redis_client, LIST_CACHE_ENTITY)
+
     async def _check_email_exists(
         self, session: AsyncSession, email: str
     ) -> User | None:
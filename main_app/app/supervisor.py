@@ -0,0 +1,239 @@
+"""Модуль супервизора процессов RabbitMQ worker.
+
+Supervisor запускает RABBITMQ_WORKERS процессов (по умолчанию - по числу
+ядер CPU). Процессы создаются методом spawn: каждый импортирует приложение
+заново и получает собственный цикл событий, пул соединений с БД и каналы
+RabbitMQ. Сообщения распределяются между процессами брокером.
+
+Сигналы супервизора:
+- SIGTERM, SIGINT - остановка: процессам отправляется SIGTERM, каждый
+  перестает получать сообщения и дожидается обработки полученных
+  (RABBITMQ_GRACEFUL_TIMEOUT_MS); процесс, не завершившийся за
+  RABBITMQ_WORKER_STOP_TIMEOUT_MS, принудительно останавливается;
+- SIGHUP - поэтапный перезапуск: для каждого процесса запускается замена,
+  и только после ее подключения к брокеру старый процесс останавливается,
+  поэтому количество обработчиков не снижается.
+
+Неожиданно завершившийся процесс перезапускается.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from multiprocessing.synchronize import Event
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SupervisorSettings:
+    """
+    Настройки супервизора процессов.
+
+    Attributes:
+        workers: Количество процессов
+        stop_timeout_ms: Ожидание завершения процесса после SIGTERM
+            (в миллисекундах), затем процесс останавливается SIGKILL
+        startup_timeout_ms: Ожидание подключения нового процесса к брокеру
+            при перезапуске (в миллисекундах)
+        restart_delay_ms: Задержка перезапуска процесса, завершившегося до
+            подключения к брокеру (в миллисекундах)
+    """
+
+    workers: int = 1
+    stop_timeout_ms: int = 60_000
+    startup_timeout_ms: int = 60_000
+    restart_delay_ms: int = 1000
+
+    @classmethod
+    def from_env(cls) -> "SupervisorSettings":
+        """
+        Создание настроек из переменных окружения.
+
+        Используются переменные RABBITMQ_WORKERS (по умолчанию - количество
+        ядер CPU), RABBITMQ_WORKER_STOP_TIMEOUT_MS,
+        RABBITMQ_WORKER_STARTUP_TIMEOUT_MS и RABBITMQ_WORKER_RESTART_DELAY_MS.
+
+        Returns:
+            SupervisorSettings: Настройки супервизора
+        """
+        return cls(
+            workers=max(1, int(os.getenv("RABBITMQ_WORKERS") or os.cpu_count() or 1)),
+            stop_timeout_ms=int(os.getenv("RABBITMQ_WORKER_STOP_TIMEOUT_MS", "60000")),
+            startup_timeout_ms=int(
+                os.getenv("RABBITMQ_WORKER_STARTUP_TIMEOUT_MS", "60000")
+            ),
+            restart_delay_ms=int(os.getenv("RABBITMQ_WORKER_RESTART_DELAY_MS", "1000")),
+        )
+
+
+@dataclass
+class Worker:
+    """
+    Процесс worker.
+
+    Attributes:
+        process: Процесс
+        ready: Событие подключения процесса к брокеру
+    """
+
+    process: BaseProcess
+    ready: Event
+
+
+class Supervisor:
+    """Запуск, перезапуск и остановка процессов worker."""
+
+    def __init__(self, target: Callable[[Event], None], settings: SupervisorSettings):
+        """
+        Инициализация.
+
+        Args:
+            target: Функция процесса worker; получает событие готовности,
+                которое устанавливает после подключения к брокеру, и
+                завершается по SIGTERM после обработки полученных сообщений.
+                Должна быть доступна для импорта (метод запуска spawn)
+            settings: Настройки супервизора
+        """
+        self.target = target
+        self.settings = settings
+        self.workers: list[Worker] = []
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = False
+        self._restart_requested = False
+
+    def run(self) -> None:
+        """Запустить процессы и обслуживать их до сигнала остановки."""
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_restart)
+
+        logger.info("Starting %s RabbitMQ worker processes", self.settings.workers)
+        self.start()
+        while not self._stopping:
+            if self._restart_requested:
+                self._restart_requested = False
+                self.rolling_restart()
+            else:
+                wait([worker.process.sentinel for worker in self.workers], timeout=1)
+                self.replace_exited()
+        self.stop()
+
+    def start(self) -> None:
+        """Запустить недостающие процессы."""
+        while len(self.workers) < self.settings.workers:
+            self.workers.append(self._spawn())
+
+    def replace_exited(self) -> None:
+        """Перезапустить неожиданно завершившиеся процессы."""
+        for index, worker in enumerate(self.workers):
+            if worker.process.is_alive() or self._stopping:
+                continue
+            logger.warning(
+                "Worker %s exited with code %s, restarting",
+                worker.process.pid,
+                worker.process.exitcode,
+            )
+            if not worker.ready.is_set():
+                # Процесс не подключился к брокеру: не перезапускаем его в цикле
+                time.sleep(self.settings.restart_delay_ms / 1000)
+            self.workers[index] = self._spawn()
+
+    def rolling_restart(self) -> bool:
+        """
+        Поэтапно перезапустить процессы.
+
+        Returns:
+            bool: True, если все процессы перезапущены; False, если замена не
+                подключилась к брокеру или получен сигнал остановки
+                (оставшиеся процессы продолжают работу)
+        """
+        logger.info("Rolling restart of %s workers", len(self.workers))
+        for index, old in enumerate(self.workers):
+            if self._stopping:
+                return False
+            new = self._spawn()
+            if not self._wait_ready(new):
+                logger.error(
+                    "Worker %s failed to start, restart aborted", new.process.pid
+                )
+                self._stop_workers([new])
+                return False
+            self.workers[index] = new
+            self._stop_workers([old])
+        logger.info("Rolling restart completed")
+        return True
+
+    def stop(self) -> None:
+        """Остановить все процессы, дождавшись обработки полученных сообщений."""
+        logger.info("Stopping %s RabbitMQ worker processes", len(self.workers))
+        self._stop_workers(self.workers)
+        self.workers = []
+
+    def _spawn(self) -> Worker:
+        """Запустить процесс worker."""
+        ready = self._context.Event()
+        process = self._context.Process(
+            target=self.target, args=(ready,), name="rabbitmq-worker"
+        )
+        process.start()
+        logger.info("Worker %s started", process.pid)
+        return Worker(process, ready)
+
+    def _wait_ready(self, worker: Worker) -> bool:
+        """
+        Дождаться подключения процесса к брокеру.
+
+        Args:
+            worker: Процесс worker
+
+        Returns:
+            bool: True, если процесс готов к обработке сообщений
+        """
+        deadline = time.monotonic() + self.settings.startup_timeout_ms / 1000
+        while not self._stopping and worker.process.is_alive():
+            if worker.ready.wait(min(1.0, max(0.0, deadline - time.monotonic()))):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+        return False
+
+    def _stop_workers(self, workers: list[Worker]) -> None:
+        """
+        Остановить процессы: SIGTERM, затем SIGKILL по истечении таймаута.
+
+        Args:
+            workers: Процессы worker
+        """
+        for worker in workers:
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+        deadline = time.monotonic() + self.settings.stop_timeout_ms / 1000
+        for worker in workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                logger.warning(
+                    "Worker %s did not stop in time, killing", worker.process.pid
+                )
+                worker.process.kill()
+                worker.process.join()
+            logger.info(
+                "Worker %s stopped with code %s",
+                worker.process.pid,
+                worker.process.exitcode,
+            )
+
+    def _request_stop(self, signum, frame) -> None:
+        """Обработчик SIGTERM и SIGINT."""
+        self._stopping = True
+
+    def _request_restart(self, signum, frame) -> None:
+        """Обработчик SIGHUP."""
+        self._restart_requested = True
@@ -0,0 +1,105 @@
+"""Микробенчмарк сериализации продукта для кэша.
+
+Сравнивает стоимость записи (encode) и чтения (decode) одного продукта и
+размер значения в Redis:
+
+- before: прежний путь (ProductResponse.model_validate(...).model_dump(),
+  ручные .isoformat(), json.dumps; при чтении json.loads и fromisoformat);
+- json, orjson, msgpack: кодеки app.cache.codec (данные для кэша
+  формируются без Pydantic, datetime сериализует кодек).
+
+Во всех вариантах чтение заканчивается построением объекта из данных кэша
+(_product_from_cache), как в ProductService.get_by_id. Кодеки, библиотеки которых не установлены,
+пропускаются (``uv sync --extra fast-cache``).
+
+Запуск:
+    uv run python -m benchmarks.bench_cache_codec
+    uv run python -m benchmarks.bench_cache_codec --iterations 200000
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime
+
+from app.cache.codec import (
+    JsonCodec,
+    MsgpackCodec,
+    OrjsonCodec,
+    decode,
+    encode,
+    get_codec,
+)
+from app.models import Product
+from app.schemas.product_schema import ProductResponse
+from app.services.product_service import _product_from_cache, _product_to_cache
+
+PRODUCT = Product(
+    id=12345,
+    name="Benchmark Product",
+    sku="BENCH-12345",
+    description="Товар для бенчмарка сериализации кэша",
+    price=1299.99,
+    stock_quantity=42,
+    created_at=datetime(2025, 1, 15, 10, 30, 0, 123456),
+    updated_at=datetime(2025, 2, 1, 8, 0, 0, 654321),
+)
+
+
+def encode_before(product: Product) -> str:
+    """Прежняя запись: Pydantic, ручной isoformat и json.dumps."""
+    product_dict = ProductResponse.model_validate(product).model_dump()
+    if product_dict.get("created_at"):
+        product_dict["created_at"] = product_dict["created_at"].isoformat()
+    if product_dict.get("updated_at"):
+        product_dict["updated_at"] = product_dict["updated_at"].isoformat()
+    return json.dumps(product_dict)
+
+
+def measure(name: str, encoder, loads, iterations: int) -> None:
+    """
+    Измерить и вывести стоимость encode/decode и размер значения.
+
+    Args:
+        name: Название варианта
+        encoder: Функция Product -> значение для Redis
+        loads: Функция значение -> dict (без построения объекта)
+        iterations: Количество повторов каждой операции
+    """
+    raw = encoder(PRODUCT)
+    assert _product_from_cache(loads(raw)).created_at == PRODUCT.created_at
+
+    encode_s = timeit.timeit(lambda: encoder(PRODUCT), number=iterations)
+    loads_s = timeit.timeit(lambda: loads(raw), number=iterations)
+    decode_s = timeit.timeit(lambda: _product_from_cache(loads(raw)), number=iterations)
+    size = len(raw.encode() if isinstance(raw, str) else raw)
+    print(
+        f"{name:<8} encode={encode_s / iterations * 1e6:6.2f} us  "
+        f"loads={loads_s / iterations * 1e6:6.2f} us  "
+        f"loads+object={decode_s / iterations * 1e6:6.2f} us  size={size:4d} B"
+    )
+
+
+def main() -> None:
+    """Главная функция бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{args.iterations} iterations per operation")
+    measure("before", encode_before, json.loads, args.iterations)
+    for cls in (JsonCodec, OrjsonCodec, MsgpackCodec):
+        codec = get_codec(cls.name)
+        if codec.name != cls.name:
+            print(f"{cls.name:<8} skipped (not installed)")
+            continue
+        measure(
+            cls.name,
+            lambda product, codec=codec: encode(_product_to_cache(product), codec),
+            decode,
+            args.iterations,
+        )
+
+
+if __name__ == "__main__":
+    main()
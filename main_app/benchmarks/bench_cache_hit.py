@@ -0,0 +1,79 @@
+"""Микробенчмарк ответа GET /products/{id} при попадании в кэш.
+
+Сравнивает обработку значения из Redis до тела ответа:
+
+- before: decode, отсоединенный ORM-объект Product, ProductResponse
+  (model_validate) и сериализация ответа;
+- view: decode, ProductView (``__slots__``), ProductResponse и сериализация
+  (путь ProductService.get_by_id для прочих потребителей);
+- after: готовый JSON из значения кэша (ProductService.get_json_by_id), без
+  построения объектов и валидации.
+
+Запуск:
+    uv run python -m benchmarks.bench_cache_hit
+    uv run python -m benchmarks.bench_cache_hit --codec orjson --iterations 200000
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime
+
+from app.cache.codec import decode, encode, get_codec, to_json
+from app.models import Product
+from app.read_models import ProductView
+from app.schemas.product_schema import ProductResponse
+
+PRODUCT_DATA = {
+    "id": 12345,
+    "name": "Benchmark Product",
+    "sku": "BENCH-12345",
+    "description": "Товар для бенчмарка ответа из кэша",
+    "price": 1299.99,
+    "stock_quantity": 42,
+    "created_at": datetime(2025, 1, 15, 10, 30, 0, 123456),
+    "updated_at": datetime(2025, 2, 1, 8, 0, 0, 654321),
+}
+
+
+def respond_before(raw: bytes) -> bytes:
+    """Прежний путь: ORM-объект и валидация схемы ответа."""
+    data = decode(raw)
+    product = Product(
+        **{
+            **data,
+            "created_at": datetime.fromisoformat(data["created_at"]),
+            "updated_at": datetime.fromisoformat(data["updated_at"]),
+        }
+    )
+    return ProductResponse.model_validate(product).model_dump_json().encode()
+
+
+def respond_view(raw: bytes) -> bytes:
+    """Объект чтения со __slots__ и валидация схемы ответа."""
+    product = ProductView.from_cache(decode(raw))
+    return ProductResponse.model_validate(product).model_dump_json().encode()
+
+
+def main() -> None:
+    """Главная функция бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--codec", default="json", choices=["json", "orjson"])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    raw = encode(PRODUCT_DATA, get_codec(args.codec))
+    expected = json.loads(respond_before(raw))
+    print(f"{args.iterations} iterations per variant, codec {args.codec}")
+    for name, respond in (
+        ("before", respond_before),
+        ("view", respond_view),
+        ("after", to_json),
+    ):
+        assert json.loads(respond(raw)) == expected
+        seconds = timeit.timeit(lambda: respond(raw), number=args.iterations)
+        print(f"{name:<8} {seconds / args.iterations * 1e6:6.2f} us per hit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Бенчмарк задержки чтения из кэша при конкурентных запросах.
+
+Сравнивает два варианта обработки 200 одновременных GET /products/{id}
+с попаданием в кэш:
+
+- before: синхронный клиент redis.Redis внутри async-обработчика
+  (каждое обращение блокирует event loop на время сетевого запроса);
+- after: асинхронный клиент redis.asyncio и ProductService.get_by_id
+  (ожидания ввода-вывода перекрываются между запросами).
+
+По умолчанию Redis имитируется с заданной сетевой задержкой (--rtt-ms),
+поэтому бенчмарк не требует запущенных сервисов. С флагом --redis-url
+используется настоящий Redis.
+
+Запуск:
+    uv run python -m benchmarks.bench_cache_latency
+    uv run python -m benchmarks.bench_cache_latency --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+
+import redis
+import redis.asyncio as aioredis
+
+from app.repositories.product_repository import ProductRepository
+from app.services.product_service import ProductService
+
+PRODUCT_ID = 1
+PRODUCT_PAYLOAD = json.dumps(
+    {
+        "id": PRODUCT_ID,
+        "name": "Benchmark Product",
+        "description": "Cached product",
+        "price": 99.99,
+        "stock_quantity": 10,
+        "created_at": datetime(2025, 1, 1).isoformat(),
+        "updated_at": None,
+    }
+)
+
+
+class BlockingFakeRedis:
+    """Имитация синхронного redis.Redis: блокирует поток на время RTT."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+
+    def get(self, key: str) -> str:
+        time.sleep(self.rtt)
+        return PRODUCT_PAYLOAD
+
+
+class AsyncFakeRedis:
+    """Имитация redis.asyncio.Redis: ожидание RTT не блокирует event loop."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+
+    async def get(self, key: str) -> str:
+        await asyncio.sleep(self.rtt)
+        return PRODUCT_PAYLOAD
+
+
+async def run_concurrent(handler, concurrency: int) -> list[float]:
+    """
+    Запустить concurrency одновременных запросов и вернуть их задержки.
+
+    Задержка считается от момента поступления всех запросов до завершения
+    конкретного запроса, как ее видит клиент.
+
+    Args:
+        handler: Корутинная функция без аргументов, имитирующая обработчик
+        concurrency: Количество одновременных запросов
+
+    Returns:
+        list[float]: Задержки запросов в миллисекундах
+    """
+    started = time.perf_counter()
+
+    async def timed() -> float:
+        await handler()
+        return (time.perf_counter() - started) * 1000
+
+    return list(await asyncio.gather(*(timed() for _ in range(concurrency))))
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Вычислить перцентиль (pct от 0 до 100)."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, latencies: list[float]) -> None:
+    """Вывести статистику задержек."""
+    print(
+        f"{name:<8} p50={percentile(latencies, 50):8.2f} ms  "
+        f"p99={percentile(latencies, 99):8.2f} ms  "
+        f"mean={statistics.mean(latencies):8.2f} ms"
+    )
+
+
+async def main() -> None:
+    """Главная функция бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+
+    if args.redis_url:
+        sync_client = redis.Redis.from_url(args.redis_url, decode_responses=True)
+        async_client = aioredis.Redis.from_url(
+            args.redis_url, decode_responses=True, max_connections=args.concurrency
+        )
+        sync_client.setex(f"product:{PRODUCT_ID}", 600, PRODUCT_PAYLOAD)
+    else:
+        sync_client = BlockingFakeRedis(args.rtt_ms / 1000)
+        async_client = AsyncFakeRedis(args.rtt_ms / 1000)
+
+    async def before() -> None:
+        # Прежний путь: синхронный вызов Redis внутри async def
+        json.loads(sync_client.get(f"product:{PRODUCT_ID}"))
+
+    service = ProductService(ProductRepository(), async_client)
+
+    async def after() -> None:
+        await service.get_by_id(None, PRODUCT_ID)
+
+    print(
+        f"{args.concurrency} concurrent cached GETs, "
+        f"{'redis ' + args.redis_url if args.redis_url else f'simulated RTT {args.rtt_ms} ms'}"
+    )
+    report("before", await run_concurrent(before, args.concurrency))
+    report("after", await run_concurrent(after, args.concurrency))
+
+    if args.redis_url:
+        await async_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""Нагрузочный тест промаха популярного ключа кэша (cache stampede).
+
+Имитирует истечение ключа product:{id} под нагрузкой: N одновременных
+GET /products/{id} получают промах кэша. Сравниваются два варианта:
+
+- before: прежний cache-aside (каждый промах выполняет запрос к БД);
+- after: ProductService.get_by_id с single-flight (и, с флагом --lock,
+  распределенной блокировкой Redis).
+
+Redis и БД имитируются с заданными задержками (--rtt-ms, --db-ms), поэтому
+тест не требует запущенных сервисов. Выводится количество запросов к БД и
+задержки запросов.
+
+Запуск:
+    uv run python -m benchmarks.bench_cache_stampede
+    uv run python -m benchmarks.bench_cache_stampede --concurrency 1000 --lock
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from app.cache.product_cache import get_product_from_cache, set_product_to_cache
+from app.cache.settings import CacheSettings
+from app.models import Product
+from app.repositories.product_repository import ProductRepository
+from app.services.product_service import ProductService
+from benchmarks.bench_cache_latency import report, run_concurrent
+
+PRODUCT_ID = 1
+
+
+class AsyncFakeRedis:
+    """Имитация redis.asyncio.Redis в памяти с задержкой сети."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.data: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        await asyncio.sleep(self.rtt)
+        return self.data.get(key)
+
+    async def setex(self, key: str, ttl: int, value: str) -> bool:
+        await asyncio.sleep(self.rtt)
+        self.data[key] = value
+        return True
+
+    async def set(self, key: str, value: str, nx: bool = False, px: int = 0):
+        await asyncio.sleep(self.rtt)
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def exists(self, key: str) -> int:
+        await asyncio.sleep(self.rtt)
+        return int(key in self.data)
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str) -> int:
+        await asyncio.sleep(self.rtt)
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+class SlowProductRepository(ProductRepository):
+    """Репозиторий с имитацией задержки БД и подсчетом запросов."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.queries = 0
+
+    async def get_by_id(self, session, product_id: int) -> Product | None:
+        self.queries += 1
+        await asyncio.sleep(self.latency)
+        return Product(
+            id=product_id,
+            name="Hot Product",
+            description=None,
+            price=99.99,
+            stock_quantity=10,
+            created_at=datetime(2025, 1, 1),
+            updated_at=None,
+        )
+
+
+async def main() -> None:
+    """Главная функция нагрузочного теста."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--db-ms", type=float, default=20.0)
+    parser.add_argument("--lock", action="store_true")
+    args = parser.parse_args()
+
+    print(
+        f"{args.concurrency} concurrent GETs on an expired key, "
+        f"simulated RTT {args.rtt_ms} ms, DB {args.db_ms} ms"
+    )
+
+    redis_client = AsyncFakeRedis(args.rtt_ms / 1000)
+    repository = SlowProductRepository(args.db_ms / 1000)
+
+    async def before() -> None:
+        # Прежний cache-aside: каждый промах идет в БД
+        cached = await get_product_from_cache(redis_client, PRODUCT_ID)
+        if cached is None:
+            product = await repository.get_by_id(None, PRODUCT_ID)
+            await set_product_to_cache(redis_client, PRODUCT_ID, {"id": product.id})
+
+    latencies = await run_concurrent(before, args.concurrency)
+    report("before", latencies)
+    print(f"{'':<8} db_queries={repository.queries}")
+
+    redis_client = AsyncFakeRedis(args.rtt_ms / 1000)
+    repository = SlowProductRepository(args.db_ms / 1000)
+    service = ProductService(
+        repository, redis_client, CacheSettings(stampede_lock=args.lock)
+    )
+
+    async def after() -> None:
+        await service.get_by_id(None, PRODUCT_ID)
+
+    latencies = await run_concurrent(after, args.concurrency)
+    report("after", latencies)
+    print(f"{'':<8} db_queries={repository.queries}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,176 @@
+"""Нагрузочный тест пакетной обработки сообщений RabbitMQ consumer.
+
+Очередь "product" имитируется в памяти: каждая доставка обрабатывается
+отдельной задачей (как в aio-pika), количество неподтвержденных сообщений
+ограничено prefetch, подтверждение занимает --ack-ms. Сообщения проходят
+через обработчик app.rabbitmq_consumer.handle_product_create, MicroBatcher и
+process_in_transaction, то есть через тот же путь, что и в consumer.
+Выводится пропускная способность (сообщений в секунду) для разных размеров
+пакета; batch=1 соответствует транзакции на каждое сообщение.
+
+По умолчанию используется SQLite во временном файле; для измерения на
+PostgreSQL передайте --database-url (таблицы должны существовать, созданные
+продукты не удаляются).
+
+Запуск:
+    uv run python -m benchmarks.bench_consumer_batching
+    uv run python -m benchmarks.bench_consumer_batching --messages 5000 \\
+        --batch-sizes 1 10 100 --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from functools import partial
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.batching import MicroBatcher, process_in_transaction
+from app.models import Base
+from app.rabbitmq_consumer import handle_product_create
+from app.schemas.product_schema import ProductCreate
+
+
+class FakeDelivery:
+    """Имитация сообщения RabbitMQ с подтверждением и освобождением prefetch."""
+
+    def __init__(self, prefetch: asyncio.Semaphore, ack_delay: float, stats: dict):
+        self.prefetch = prefetch
+        self.ack_delay = ack_delay
+        self.stats = stats
+
+    async def _settle(self, outcome: str) -> None:
+        await asyncio.sleep(self.ack_delay)
+        self.stats[outcome] += 1
+        self.prefetch.release()
+
+    async def ack(self) -> None:
+        await self._settle("ack")
+
+    async def nack(self, requeue: bool = True) -> None:
+        await self._settle("nack")
+
+    async def reject(self) -> None:
+        await self._settle("reject")
+
+
+async def consume(
+    batcher: MicroBatcher, delivery: FakeDelivery, data: ProductCreate
+) -> None:
+    """Обработать доставку так же, как app.rabbitmq_consumer.process_message."""
+    try:
+        error = await batcher.submit(data)
+    except Exception:
+        await delivery.nack(requeue=True)
+        return
+    if error is None:
+        await delivery.ack()
+    else:
+        await delivery.reject()
+
+
+async def run(
+    engine: AsyncEngine,
+    messages: int,
+    batch_size: int,
+    prefetch_count: int,
+    timeout_ms: float,
+    ack_delay: float,
+) -> tuple[float, dict]:
+    """
+    Обработать messages сообщений с заданным размером пакета.
+
+    Returns:
+        tuple[float, dict]: Сообщений в секунду и счетчики ack/nack/reject
+    """
+    batcher = MicroBatcher(
+        partial(process_in_transaction, engine, handle_product_create),
+        max_size=batch_size,
+        max_delay=timeout_ms / 1000,
+    )
+    prefetch = asyncio.Semaphore(max(prefetch_count, batch_size))
+    stats = {"ack": 0, "nack": 0, "reject": 0}
+    tasks = []
+
+    started = time.perf_counter()
+    for i in range(messages):
+        # Брокер не отправляет больше prefetch неподтвержденных сообщений
+        await prefetch.acquire()
+        data = ProductCreate(name=f"Batch product {i}", price=10.0, stock_quantity=5)
+        delivery = FakeDelivery(prefetch, ack_delay, stats)
+        tasks.append(asyncio.create_task(consume(batcher, delivery, data)))
+    await asyncio.gather(*tasks)
+    await batcher.close()
+    elapsed = time.perf_counter() - started
+
+    return messages / elapsed, stats
+
+
+def create_sqlite_engine() -> AsyncEngine:
+    """Создать движок SQLite во временном файле с поддержкой SAVEPOINT."""
+    path = tempfile.mktemp(suffix=".db")
+    # SQLite допускает одну пишущую транзакцию: одно соединение вместо ожидания
+    # блокировки файла
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", pool_size=1, max_overflow=0
+    )
+
+    # pysqlite сам не открывает транзакцию перед SAVEPOINT: BEGIN выдается явно
+    @event.listens_for(engine.sync_engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+async def main() -> None:
+    """Главная функция нагрузочного теста."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--prefetch", type=int, default=100)
+    parser.add_argument("--timeout-ms", type=float, default=50.0)
+    parser.add_argument("--ack-ms", type=float, default=0.5)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+    # Журнал каждого сообщения не должен влиять на измерение
+    logging.disable(logging.INFO)
+
+    if args.database_url:
+        engine = create_async_engine(args.database_url)
+    else:
+        engine = create_sqlite_engine()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    print(
+        f"{args.messages} messages, prefetch {args.prefetch}, "
+        f"batch timeout {args.timeout_ms} ms, simulated ack {args.ack_ms} ms"
+    )
+    try:
+        for batch_size in args.batch_sizes:
+            rate, stats = await run(
+                engine,
+                args.messages,
+                batch_size,
+                args.prefetch,
+                args.timeout_ms,
+                args.ack_ms / 1000,
+            )
+            print(
+                f"batch={batch_size:<5} {rate:9.0f} msg/s  "
+                f"ack={stats['ack']} nack={stats['nack']} reject={stats['reject']}"
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
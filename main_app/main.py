@@ -3,10 +3,18 @@ from litestar import Litestar
 from litestar.di import Provide
 from litestar.openapi import OpenAPIConfig
 
+from app.controllers.metrics_controller import MetricsController
 from app.controllers.order_controller import OrderController
 from app.controllers.product_controller import ProductController
 from app.controllers.report_controller import ReportController
 from app.controllers.user_controller import UserController
+from app.cache.local_cache import (
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
+from app.cache.write_policy import flush_pending_writes
+from app.cache_warmup import start_cache_warmup, stop_cache_warmup
+from app.database import dispose_engine
 from app.dependencies import (
     provide_db_session,
     provide_order_repository,
@@ -16,9 +24,11 @@ from app.dependencies import (
     provide_redis_client,
     provide_report_repository,
     provide_report_service,
+    provide_session_factory,
     provide_user_repository,
     provide_user_service,
 )
+from app.redis_client import close_redis, init_redis
 
 
 app = Litestar(
@@ -27,10 +37,12 @@ app = Litestar(
         ProductController,
         OrderController,
         ReportController,
+        MetricsController,
     ],
     dependencies={
         "db_session": Provide(provide_db_session),
-        "redis_client": Provide(provide_redis_client),
+        "session_factory": Provide(provide_session_factory, sync_to_thread=False),
+        "redis_client": Provide(provide_redis_client, sync_to_thread=False),
         "user_repository": Provide(provide_user_repository),
         "user_service": Provide(provide_user_service),
         "product_repository": Provide(provide_product_repository),
@@ -40,6 +52,14 @@ app = Litestar(
         "report_repository": Provide(provide_report_repository),
         "report_service": Provide(provide_report_service),
     },
+    on_startup=[init_redis, start_invalidation_listener, start_cache_warmup],
+    on_shutdown=[
+        stop_cache_warmup,
+        stop_invalidation_listener,
+        flush_pending_writes,
+        close_redis,
+        dispose_engine,
+    ],
     openapi_config=OpenAPIConfig(
         title="E-Commerce API",
         version="1.0.0",
@@ -52,8 +72,9 @@ if __name__ == "__main__":
     import uvicorn
     import logging
     
-    # Логгирование для отладки
-    logging.basicConfig(level=logging.DEBUG)
+    # Уровень логирования (DEBUG включает подробные логи, в том числе SQLAlchemy)
+    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    logging.basicConfig(level=log_level)
     
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", 8000))
@@ -62,5 +83,5 @@ if __name__ == "__main__":
         app,
         host=host,
         port=port,
-        log_level="debug"
+        log_level=log_level.lower()
     )
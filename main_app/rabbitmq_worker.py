@@ -1,9 +1,21 @@
-"""Скрипт для запуска RabbitMQ consumer в отдельном процессе."""
+"""Скрипт для запуска RabbitMQ consumer в отдельном процессе.
 
+    uv run python rabbitmq_worker.py               # один процесс
+    uv run python rabbitmq_worker.py --supervisor  # RABBITMQ_WORKERS процессов
+    uv run python rabbitmq_worker.py --supervisor --workers 4
+
+В режиме супервизора (app.supervisor) SIGTERM останавливает процессы после
+обработки полученных сообщений, SIGHUP - поэтапно перезапускает их.
+"""
+
+import argparse
 import asyncio
 import logging
+import signal
+from dataclasses import replace
+from multiprocessing.synchronize import Event
 
-from app.rabbitmq_consumer import app
+from app.supervisor import Supervisor, SupervisorSettings
 
 # Настройка логирования
 logging.basicConfig(
@@ -13,8 +25,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main() -> None:
-    """Главная функция для запуска RabbitMQ consumer."""
+async def main(ready: Event | None = None) -> None:
+    """
+    Главная функция для запуска RabbitMQ consumer.
+
+    Args:
+        ready: Событие, устанавливаемое после подключения к брокеру
+            (процесс под управлением супервизора)
+    """
+    # Импорт здесь: брокер и пул соединений с БД создаются в каждом процессе
+    from app.rabbitmq_consumer import app
+
+    if ready is not None:
+        app.after_startup(ready.set)
+
     logger.info("Starting RabbitMQ worker...")
     try:
         await app.run()
@@ -25,6 +49,37 @@ async def main() -> None:
         raise
 
 
+def run_worker(ready: Event) -> None:
+    """
+    Точка входа процесса worker под управлением супервизора.
+
+    Args:
+        ready: Событие, устанавливаемое после подключения к брокеру
+    """
+    # SIGHUP предназначен супервизору (поэтапный перезапуск)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    asyncio.run(main(ready))
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="RabbitMQ worker")
+    parser.add_argument(
+        "--supervisor",
+        action="store_true",
+        help="Запустить несколько процессов под управлением супервизора",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Количество процессов (по умолчанию RABBITMQ_WORKERS или число ядер)",
+    )
+    args = parser.parse_args()
 
+    if args.supervisor:
+        settings = SupervisorSettings.from_env()
+        if args.workers is not None:
+            settings = replace(settings, workers=max(1, args.workers))
+        Supervisor(run_worker, settings).run()
+    else:
+        asyncio.run(main())
@@ -1,6 +1,7 @@
 import pytest
 from litestar.testing import TestClient
 from litestar.di import Provide
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from app.models import Base
@@ -103,6 +104,34 @@ async def controller_session(engine, tables):
             # через async with
 
 
+class QueryCounter:
+    """Счетчик SQL-запросов, отправленных в БД через движок."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        """Количество выполненных запросов."""
+        return len(self.statements)
+
+    def reset(self) -> None:
+        """Сбросить счетчик."""
+        self.statements.clear()
+
+
+@pytest.fixture
+def query_counter(engine):
+    """Фикстура для подсчета SQL-запросов (для регрессионных тестов N+1)."""
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
 @pytest.fixture
 def user_repository():
     """Фикстура для репозитория пользователей."""
@@ -162,18 +191,22 @@ def client(engine, tables):
         provide_report_repository,
         provide_report_service,
     )
-    import redis
-    from unittest.mock import MagicMock
+    import redis.asyncio as aioredis
+    from unittest.mock import AsyncMock
     
     # Создаем мок-клиент Redis для тестов
-    def provide_test_redis_client() -> redis.Redis:
+    def provide_test_redis_client() -> aioredis.Redis:
         """Провайдер мок-клиента Redis для тестов."""
-        mock_redis = MagicMock(spec=redis.Redis)
+        mock_redis = AsyncMock(spec=aioredis.Redis)
         # Настраиваем базовое поведение мока
-        mock_redis.get.return_value = None
-        mock_redis.set.return_value = True
-        mock_redis.delete.return_value = 0
-        mock_redis.exists.return_value = False
+        # (команды redis.asyncio не объявлены как async def, поэтому задаем явно)
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.set = AsyncMock(return_value=True)
+        mock_redis.setex = AsyncMock(return_value=True)
+        mock_redis.delete = AsyncMock(return_value=0)
+        mock_redis.publish = AsyncMock(return_value=0)
+        mock_redis.exists = AsyncMock(return_value=False)
+        mock_redis.incr = AsyncMock(return_value=1)
         return mock_redis
     
     # Используем ту же сессию, что и controller_session через глобальную переменную
@@ -199,6 +232,15 @@ def client(engine, tables):
                     await session.rollback()
                     raise
     
+    def provide_test_session_factory():
+        """Провайдер фабрики сессий тестовой БД (для потоковых ответов)."""
+        global _test_session_factory
+        if _test_session_factory is None:
+            _test_session_factory = async_sessionmaker(
+                engine, class_=AsyncSession, expire_on_commit=False
+            )
+        return _test_session_factory
+    
     # Создаем тестовое приложение с переопределенными зависимостями
     from litestar import Litestar
     from litestar.openapi import OpenAPIConfig
@@ -208,6 +250,7 @@ def client(engine, tables):
     from app.controllers.product_controller import ProductController
     from app.controllers.order_controller import OrderController
     from app.controllers.report_controller import ReportController
+    from app.controllers.metrics_controller import MetricsController
     
     test_app = Litestar(
         route_handlers=[
@@ -215,9 +258,11 @@ def client(engine, tables):
             ProductController,
             OrderController,
             ReportController,
+            MetricsController,
         ],
         dependencies={
             "db_session": Provide(provide_test_session),
+            "session_factory": Provide(provide_test_session_factory, sync_to_thread=False),
             "redis_client": Provide(provide_test_redis_client, sync_to_thread=False),
             "user_repository": Provide(provide_user_repository),
             "user_service": Provide(provide_user_service),
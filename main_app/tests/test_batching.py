@@ -0,0 +1,480 @@
+import asyncio
+from functools import partial
+
+import pytest
+import redis.asyncio as aioredis
+from unittest.mock import AsyncMock, MagicMock, Mock
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import (
+    DataError,
+    DBAPIError,
+    InterfaceError,
+    OperationalError,
+    ProgrammingError,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import rabbitmq_consumer
+from app.batching import CircuitBreaker, MicroBatcher, process_in_transaction
+from app.dead_letter import ATTEMPTS_HEADER
+from app.models import Base, Order, Product
+from app.rabbitmq_consumer import (
+    ORDER_REJECTED_QUEUE,
+    ConsumerSettings,
+    invalidate_products,
+    process_message,
+    publish_order_result,
+)
+from app.schemas.order_schema import OrderCreate, OrderItemCreate
+
+
+@pytest.fixture
+async def file_engine(tmp_path):
+    """Движок SQLite в файле: пакет открывает собственное соединение."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'batch.db'}")
+
+    # pysqlite сам не открывает транзакцию перед SAVEPOINT: BEGIN выдается явно,
+    # как в PostgreSQL (см. документацию SQLAlchemy, "Serializable isolation /
+    # Savepoints / Transactional DDL")
+    @event.listens_for(engine.sync_engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def create_product(session, name):
+    """Обработчик элемента: создает продукт, имя "bad" отклоняется."""
+    session.add(Product(name=name, price=10.0, stock_quantity=1))
+    await session.flush()
+    if name == "bad":
+        raise ValueError("bad product")
+
+
+async def count_products(engine):
+    async with engine.connect() as conn:
+        return await conn.scalar(select(func.count()).select_from(Product))
+
+
+class TestMicroBatcher:
+    """Тесты для накопителя пакетов."""
+
+    @pytest.mark.asyncio
+    async def test_groups_by_size_and_timeout(self):
+        """Тест: пакет отправляется по размеру, остаток - по таймауту."""
+        batches = []
+
+        async def process(items):
+            batches.append(items)
+            return [item * 10 for item in items]
+
+        batcher = MicroBatcher(process, max_size=2, max_delay=0.01)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        assert results == [0, 10, 20, 30, 40]
+        assert batches == [[0, 1], [2, 3], [4]]
+
+    @pytest.mark.asyncio
+    async def test_batch_error_is_raised_for_every_item(self):
+        """Тест: ошибка обработки пакета получают все элементы."""
+        batcher = MicroBatcher(
+            AsyncMock(side_effect=ConnectionError("db down")),
+            max_size=2,
+            max_delay=1,
+        )
+
+        results = await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_items(self):
+        """Тест: при закрытии накопленные элементы обрабатываются без ожидания."""
+        process = AsyncMock(return_value=[None])
+        batcher = MicroBatcher(process, max_size=10, max_delay=60)
+
+        task = asyncio.create_task(batcher.submit(1))
+        await asyncio.sleep(0)
+        await batcher.close()
+
+        assert await task is None
+        process.assert_awaited_once_with([1])
+
+
+class TestCircuitBreaker:
+    """Тесты для размыкателя цепи."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold_and_lets_one_probe_through(self):
+        """Тест: цепь размыкается по порогу, после паузы пропускается один вызов."""
+        breaker = CircuitBreaker(2, reset_timeout=0.02)
+
+        breaker.record_failure()
+        await breaker.wait()
+        breaker.record_failure()
+        assert breaker.is_open
+
+        waiters = [asyncio.create_task(breaker.wait()) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert not any(waiter.done() for waiter in waiters)
+
+        await asyncio.sleep(0.05)
+        assert sum(waiter.done() for waiter in waiters) == 1
+
+        breaker.record_success()
+        await asyncio.wait_for(asyncio.gather(*waiters), 1)
+        assert not breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self):
+        """Тест: ошибка пробного вызова снова размыкает цепь."""
+        breaker = CircuitBreaker(3, reset_timeout=0.02)
+        for _ in range(3):
+            breaker.record_failure()
+
+        await asyncio.wait_for(breaker.wait(), 1)
+        breaker.record_failure()
+
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(breaker.wait(), 0.01)
+
+
+class TestProcessInTransaction:
+    """Тесты для обработки пакета в одной транзакции."""
+
+    @pytest.mark.asyncio
+    async def test_rejected_item_is_rolled_back_alone(self, file_engine):
+        """Тест: отклоненный элемент откатывается, остальные фиксируются."""
+        results = await process_in_transaction(
+            file_engine, create_product, ["first", "bad", "second"]
+        )
+
+        assert results[0] is None
+        assert isinstance(results[1], ValueError)
+        assert results[2] is None
+        assert await count_products(file_engine) == 2
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_rolls_back_batch(self, file_engine):
+        """Тест: непредвиденная ошибка откатывает весь пакет."""
+
+        async def failing(session, name):
+            await create_product(session, name)
+            if name == "second":
+                raise ConnectionError("db down")
+
+        with pytest.raises(ConnectionError):
+            await process_in_transaction(file_engine, failing, ["first", "second"])
+
+        assert await count_products(file_engine) == 0
+
+    @pytest.mark.asyncio
+    async def test_data_error_rejects_item_alone(self, file_engine):
+        """Тест: DataError отклоняет только свой элемент, а не весь пакет."""
+
+        async def overflowing(session, name):
+            await create_product(session, name)
+            if name == "overflow":
+                raise DataError("INSERT", {}, Exception("numeric field overflow"))
+
+        results = await process_in_transaction(
+            file_engine, overflowing, ["first", "overflow", "second"]
+        )
+
+        assert isinstance(results[1], DataError)
+        assert await count_products(file_engine) == 2
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (OperationalError("SELECT 1", {}, Exception("connection refused")), True),
+        (InterfaceError("SELECT 1", {}, Exception("connection closed")), True),
+        (
+            DBAPIError("SELECT 1", {}, Exception("reset"), connection_invalidated=True),
+            True,
+        ),
+        (ConnectionError("db down"), True),
+        (DataError("INSERT", {}, Exception("numeric field overflow")), False),
+        (ProgrammingError("SELECT", {}, Exception("undefined column")), False),
+        (RuntimeError("bug"), False),
+    ],
+)
+def test_is_batch_failure(error, expected):
+    """Тест: повтор и размыкатель только для ошибок соединения с БД."""
+    assert rabbitmq_consumer.is_batch_failure(error) is expected
+
+
+def rabbit_message(**kwargs):
+    """Сообщение RabbitMQ с заголовками и свойствами для повторной публикации."""
+    defaults = dict(
+        body=b"{}",
+        headers={},
+        correlation_id="corr-1",
+        reply_to=None,
+        content_type="application/json",
+    )
+    return AsyncMock(**{**defaults, **kwargs})
+
+
+@pytest.fixture
+def publish(monkeypatch):
+    """Публикация брокера consumer и свежий размыкатель цепи."""
+    publish = AsyncMock()
+    monkeypatch.setattr(rabbitmq_consumer.broker, "publish", publish)
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    monkeypatch.setattr(rabbitmq_consumer, "breaker", breaker)
+    return publish
+
+
+class TestConsumer:
+    """Тесты подтверждения сообщений RabbitMQ consumer."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "outcome, settled, queue",
+        [
+            (None, "ack", None),
+            (ValueError("out of stock"), "reject", None),
+            (ConnectionError("db down"), "ack", "order.retry.1"),
+        ],
+    )
+    async def test_process_message_settles_message(
+        self, monkeypatch, publish, outcome, settled, queue
+    ):
+        """Тест: ack при успехе, reject при отказе, повтор при ошибке пакета."""
+        batcher = AsyncMock()
+        if isinstance(outcome, ConnectionError):
+            batcher.submit.side_effect = outcome
+        else:
+            batcher.submit.return_value = outcome
+        monkeypatch.setitem(rabbitmq_consumer.batchers, "order", batcher)
+        message = rabbit_message()
+
+        await process_message("order", object(), message)
+
+        for method in ("ack", "reject", "nack"):
+            assert getattr(message, method).await_count == (method == settled)
+        if queue is None:
+            publish.assert_not_awaited()
+        else:
+            assert publish.await_args.args == (b"{}", queue)
+            assert publish.await_args.kwargs["correlation_id"] == "corr-1"
+
+    @pytest.mark.asyncio
+    async def test_redelivery_is_processed_outside_batch(self, monkeypatch, publish):
+        """Тест: повторная доставка обрабатывается отдельно от пакета."""
+        batcher = AsyncMock()
+        batcher.process.return_value = [None]
+        monkeypatch.setitem(rabbitmq_consumer.batchers, "order", batcher)
+        message = rabbit_message(headers={ATTEMPTS_HEADER: 2})
+        data = object()
+
+        await process_message("order", data, message)
+
+        batcher.process.assert_awaited_once_with([data])
+        batcher.submit.assert_not_awaited()
+        message.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_batch_failures_open_breaker(self, monkeypatch, publish):
+        """Тест: серия ошибок пакетов приостанавливает обработку новых сообщений."""
+        process = AsyncMock(side_effect=ConnectionError("db down"))
+        monkeypatch.setattr(rabbitmq_consumer, "process_in_transaction", process)
+        batcher = MicroBatcher(
+            partial(rabbitmq_consumer.process_batch, None), max_size=1, max_delay=1
+        )
+        monkeypatch.setitem(rabbitmq_consumer.batchers, "order", batcher)
+
+        for _ in range(2):
+            await process_message("order", object(), rabbit_message())
+
+        assert rabbitmq_consumer.breaker.is_open
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(
+                process_message("order", object(), rabbit_message()), 0.05
+            )
+        assert process.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_counts_once(self, monkeypatch, publish):
+        """Тест: ошибка одного пакета учитывается один раз, а не на каждое сообщение."""
+        process = AsyncMock(side_effect=ConnectionError("db down"))
+        monkeypatch.setattr(rabbitmq_consumer, "process_in_transaction", process)
+        batcher = MicroBatcher(
+            partial(rabbitmq_consumer.process_batch, None), max_size=3, max_delay=1
+        )
+        monkeypatch.setitem(rabbitmq_consumer.batchers, "order", batcher)
+        messages = [rabbit_message() for _ in range(3)]
+
+        await asyncio.gather(
+            *(process_message("order", object(), message) for message in messages)
+        )
+
+        process.assert_awaited_once()
+        assert not rabbitmq_consumer.breaker.is_open
+        assert all(message.ack.await_count == 1 for message in messages)
+
+    @pytest.mark.asyncio
+    async def test_order_rejection_published_before_reject(
+        self, monkeypatch, publish
+    ):
+        """Тест: отказ заказа публикуется в очередь отказов, затем reject."""
+        events = []
+        publish.side_effect = lambda message, queue, **kw: events.append(queue)
+        batcher = AsyncMock()
+        batcher.submit.return_value = ValueError("Insufficient stock")
+        monkeypatch.setitem(rabbitmq_consumer.batchers, "order", batcher)
+        message = rabbit_message()
+        message.reject.side_effect = lambda: events.append("reject")
+        order_data = OrderCreate(
+            user_id=1,
+            delivery_address_id=1,
+            items=[OrderItemCreate(product_id=1, quantity=5)],
+        )
+
+        await process_message(
+            "order",
+            order_data,
+            message,
+            on_result=partial(publish_order_result, order_data, message),
+        )
+
+        assert events == [ORDER_REJECTED_QUEUE, "reject"]
+        result, queue = publish.await_args.args
+        assert result.status == "rejected"
+        assert result.reason == "Insufficient stock"
+        assert result.order_data == order_data
+        assert publish.await_args.kwargs["correlation_id"] == "corr-1"
+
+    @pytest.mark.asyncio
+    async def test_result_publish_failure_does_not_retry_committed_order(
+        self, monkeypatch, publish
+    ):
+        """Тест: ошибка публикации результата не повторяет обработку заказа."""
+        publish.side_effect = ConnectionError("broker down")
+        batcher = AsyncMock()
+        batcher.submit.return_value = Order(id=7, user_id=1, total_price=10.0)
+        monkeypatch.setitem(rabbitmq_consumer.batchers, "order", batcher)
+        message = rabbit_message(reply_to="replies")
+        order_data = OrderCreate(
+            user_id=1,
+            delivery_address_id=1,
+            items=[OrderItemCreate(product_id=1, quantity=1)],
+        )
+
+        await process_message(
+            "order",
+            order_data,
+            message,
+            on_result=partial(publish_order_result, order_data, message),
+        )
+
+        message.ack.assert_awaited_once()
+        message.nack.assert_not_awaited()
+        assert [call.args[1] for call in publish.await_args_list] == ["replies"]
+
+    @pytest.mark.asyncio
+    async def test_committed_products_removed_from_cache(self, monkeypatch, publish):
+        """Тест: продукты пакета удаляются из кэша после фиксации, отказ - нет."""
+        redis_client = AsyncMock(spec=aioredis.Redis)
+        redis_client.incr = AsyncMock(return_value=1)
+        redis_client.publish = AsyncMock(return_value=0)
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.execute = AsyncMock(return_value=[])
+        redis_client.pipeline = Mock(return_value=pipe)
+        monkeypatch.setattr(rabbitmq_consumer, "redis_client", redis_client)
+        batcher = AsyncMock()
+        outcomes = iter(
+            [
+                [Product(id=1, name="A"), Product(id=2, name="B")],
+                ValueError("Price must be greater than 0"),
+            ]
+        )
+        batcher.submit.side_effect = lambda data: next(outcomes)
+        monkeypatch.setitem(rabbitmq_consumer.batchers, "product", batcher)
+        loaded, rejected = rabbit_message(), rabbit_message()
+
+        await process_message("product", [], loaded, on_result=invalidate_products)
+        await process_message("product", [], rejected, on_result=invalidate_products)
+
+        deleted = {call.args[0] for call in pipe.delete.call_args_list}
+        assert deleted == {"product:1", "product:2"}
+        redis_client.incr.assert_awaited_once_with("products:list:version")
+        loaded.ack.assert_awaited_once()
+        rejected.reject.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_created_order_replied_to_reply_queue(self, publish):
+        """Тест: созданный заказ отправляется только в reply_to сообщения."""
+        message = rabbit_message(reply_to="replies", correlation_id="corr-2")
+        order_data = OrderCreate(
+            user_id=1,
+            delivery_address_id=1,
+            items=[OrderItemCreate(product_id=1, quantity=1)],
+        )
+
+        await publish_order_result(
+            order_data, message, Order(id=7, user_id=1, total_price=10.0)
+        )
+
+        result, queue = publish.await_args.args
+        assert queue == "replies"
+        assert (result.status, result.order_id, result.total_price) == (
+            "created",
+            7,
+            10.0,
+        )
+        publish.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_service_queues_declared_before_consuming(self, monkeypatch):
+        """Тест: служебные очереди объявляются в хуке запуска до подписчиков."""
+        calls = []
+        connect = AsyncMock(side_effect=lambda: calls.append("connect"))
+        declare = AsyncMock(side_effect=lambda queue: calls.append(queue.name))
+        monkeypatch.setattr(rabbitmq_consumer.broker, "connect", connect)
+        monkeypatch.setattr(rabbitmq_consumer.broker, "declare_queue", declare)
+
+        await rabbitmq_consumer.declare_result_queues()
+
+        assert calls[:2] == ["connect", ORDER_REJECTED_QUEUE]
+        assert {"order.retry.1", "order.dlq", "product.dlq"} <= set(calls)
+
+    def test_settings_from_env(self, monkeypatch):
+        """Тест: prefetch не меньше размера пакета."""
+        monkeypatch.setenv("RABBITMQ_BATCH_SIZE", "200")
+        monkeypatch.setenv("RABBITMQ_PREFETCH_COUNT", "50")
+        monkeypatch.setenv("RABBITMQ_BATCH_TIMEOUT_MS", "20")
+
+        settings = ConsumerSettings.from_env()
+
+        assert settings.batch_size == 200
+        assert settings.prefetch_count == 200
+        assert settings.batch_timeout_ms == 20
+
+    def test_queue_concurrency_from_env(self, monkeypatch):
+        """Тест: лимит очереди заменяет общий prefetch только для нее."""
+        monkeypatch.setenv("RABBITMQ_PREFETCH_COUNT", "100")
+        monkeypatch.setenv("RABBITMQ_QUEUE_CONCURRENCY", "order=10, product_update=50")
+
+        settings = ConsumerSettings.from_env()
+
+        assert settings.prefetch_for("order") == 10
+        assert settings.prefetch_for("product_update") == 50
+        assert settings.prefetch_for("product") == 100
+
+        monkeypatch.setenv("RABBITMQ_QUEUE_CONCURRENCY", "order:10")
+        with pytest.raises(ValueError):
+            ConsumerSettings.from_env()
@@ -0,0 +1,142 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from app.cache import codec as codec_module
+from app.cache.codec import (
+    SCHEMA_VERSION,
+    CacheCodec,
+    JsonCodec,
+    MsgpackCodec,
+    OrjsonCodec,
+    decode,
+    dumps_json,
+    encode,
+    get_codec,
+    to_json,
+)
+
+PRODUCT_DATA = {
+    "id": 1,
+    "name": "Продукт",
+    "description": None,
+    "price": 99.99,
+    "stock_quantity": 10,
+    "created_at": datetime(2025, 1, 15, 10, 30, 0, 123456),
+    "updated_at": None,
+}
+DECODED_DATA = {**PRODUCT_DATA, "created_at": "2025-01-15T10:30:00.123456"}
+
+
+def available_codecs():
+    """Кодеки, библиотеки которых установлены в окружении."""
+    codecs = [JsonCodec()]
+    for cls, module in ((OrjsonCodec, "orjson"), (MsgpackCodec, "msgpack")):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        codecs.append(cls())
+    return codecs
+
+
+class TestCacheCodec:
+    """Тесты кодеков данных кэша."""
+
+    @pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+    def test_round_trip_with_format_byte(self, codec):
+        """Тест: значение начинается с байта формата и читается обратно."""
+        raw = encode(PRODUCT_DATA, codec)
+
+        assert raw[0] == (SCHEMA_VERSION << 4) | codec.codec_id
+        assert decode(raw) == DECODED_DATA
+
+    @pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+    def test_decode_accepts_str_for_text_codecs(self, codec):
+        """Тест чтения при REDIS_DECODE_RESPONSES=true (значение - str)."""
+        if codec.name == "msgpack":
+            pytest.skip("msgpack требует REDIS_DECODE_RESPONSES=false")
+
+        assert decode(encode(PRODUCT_DATA, codec).decode()) == DECODED_DATA
+
+    @pytest.mark.parametrize("raw", [json.dumps({"id": 1}), b'[{"id": 1}]'])
+    def test_legacy_json_is_unsupported_schema(self, raw):
+        """Тест: JSON без байта формата (версия схемы 1) не читается."""
+        with pytest.raises(ValueError, match="schema version: 1"):
+            decode(raw)
+        with pytest.raises(ValueError, match="schema version: 1"):
+            to_json(raw)
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            b"",
+            bytes(((SCHEMA_VERSION + 1) << 4 | JsonCodec.codec_id,)) + b"{}",
+            bytes((1 << 4 | JsonCodec.codec_id,)) + b'{"id": 1}',
+            bytes((SCHEMA_VERSION << 4 | 15,)) + b"{}",
+            encode({"id": 1}, JsonCodec())[:-1],
+            "{not json",
+        ],
+        ids=["empty", "schema", "schema-v1", "codec", "truncated", "legacy-corrupted"],
+    )
+    def test_decode_invalid_raises_value_error(self, raw):
+        """Тест: поврежденные и несовместимые значения дают ValueError."""
+        with pytest.raises(ValueError):
+            decode(raw)
+
+    def test_encode_unserializable_raises_type_error(self):
+        """Тест: несериализуемые данные дают TypeError."""
+        with pytest.raises(TypeError):
+            encode({"value": object()}, JsonCodec())
+
+    def test_incomplete_codec_cannot_be_created(self):
+        """Тест: кодек без loads не создается (ошибка при регистрации, а не записи)."""
+
+        class DumpsOnlyCodec(CacheCodec):
+            name = "dumps-only"
+            codec_id = 14
+
+            def dumps(self, data):
+                return b""
+
+        with pytest.raises(TypeError):
+            DumpsOnlyCodec()
+
+    def test_get_codec(self):
+        """Тест выбора кодека по имени."""
+        assert get_codec("json").name == "json"
+        with pytest.raises(ValueError):
+            get_codec("pickle")
+
+    def test_binary_codec_rejected_with_decoded_responses(self, monkeypatch):
+        """Тест: msgpack при REDIS_DECODE_RESPONSES=true - ошибка при запуске."""
+        monkeypatch.setitem(codec_module._codecs, MsgpackCodec.codec_id, MsgpackCodec())
+
+        assert get_codec("msgpack").name == "msgpack"
+        assert get_codec("json", decode_responses=True).name == "json"
+        with pytest.raises(ValueError, match="REDIS_DECODE_RESPONSES=false"):
+            get_codec("msgpack", decode_responses=True)
+
+    @pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+    def test_to_json(self, codec):
+        """Тест: значение любого кодека преобразуется в JSON ответа."""
+        body = to_json(encode(PRODUCT_DATA, codec))
+
+        assert json.loads(body) == DECODED_DATA
+
+    def test_to_json_skips_parsing_for_json_codecs(self):
+        """Тест: для JSON-кодеков возвращаются данные после байта формата."""
+        raw = encode(PRODUCT_DATA, JsonCodec())
+
+        assert to_json(raw) == raw[1:]
+        assert to_json(raw.decode()) == raw[1:]
+
+    def test_to_json_invalid_raises_value_error(self):
+        """Тест: несовместимая версия схемы дает ValueError."""
+        with pytest.raises(ValueError):
+            to_json(bytes(((SCHEMA_VERSION + 1) << 4 | JsonCodec.codec_id,)) + b"{}")
+
+    def test_dumps_json_matches_response_format(self):
+        """Тест: datetime сериализуется в ISO 8601, как в ответах API."""
+        assert json.loads(dumps_json(PRODUCT_DATA)) == DECODED_DATA
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+import redis
+import redis.asyncio as aioredis
+from unittest.mock import AsyncMock
+
+from app.cache.list_cache import (
+    get_list_from_cache,
+    invalidate_list_cache,
+    make_list_cache_key,
+    set_list_to_cache,
+)
+
+
+class TestListCache:
+    """Тесты для кэша страниц списков."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Создает мок асинхронного клиента Redis."""
+        client = AsyncMock(spec=aioredis.Redis)
+        client.get = AsyncMock(return_value=None)
+        client.setex = AsyncMock(return_value=True)
+        client.delete = AsyncMock(return_value=1)
+        client.incr = AsyncMock(return_value=1)
+        return client
+
+    def test_make_list_cache_key_normalized(self):
+        """Тест нормализации параметров: порядок и None не влияют на ключ."""
+        key = make_list_cache_key("products", 3, {"count": 10, "name": "a", "page": 1})
+        same = make_list_cache_key(
+            "products", 3, {"page": 1, "cursor": None, "name": "a", "count": 10}
+        )
+        other_version = make_list_cache_key(
+            "products", 4, {"count": 10, "name": "a", "page": 1}
+        )
+
+        assert key == same
+        assert key.startswith("products:list:v3:")
+        assert key != other_version
+
+    @pytest.mark.asyncio
+    async def test_get_list_miss_returns_version(self, mock_redis):
+        """Тест промаха: возвращается текущая версия списка."""
+        mock_redis.get.side_effect = ["7", None]
+
+        version, page_data = await get_list_from_cache(
+            mock_redis, "products", {"count": 10}
+        )
+
+        assert version == 7
+        assert page_data is None
+        mock_redis.get.assert_any_await("products:list:version")
+        mock_redis.get.assert_any_await(
+            make_list_cache_key("products", 7, {"count": 10})
+        )
+
+    @pytest.mark.asyncio
+    async def test_set_then_get_list(self, mock_redis):
+        """Тест сохранения и чтения страницы под одной версией."""
+        page_data = {"items": [{"id": 1}], "total": 1, "next_cursor": None}
+        await set_list_to_cache(mock_redis, "users", 0, {"count": 10}, page_data)
+
+        key, ttl, json_data = mock_redis.setex.await_args.args
+        assert key == make_list_cache_key("users", 0, {"count": 10})
+        assert ttl == 30
+
+        mock_redis.get.side_effect = [None, json_data]
+        version, cached_page = await get_list_from_cache(
+            mock_redis, "users", {"count": 10}
+        )
+
+        assert version == 0
+        assert cached_page == page_data
+
+    @pytest.mark.asyncio
+    async def test_get_list_corrupted_data(self, mock_redis):
+        """Тест удаления поврежденной страницы из кэша."""
+        mock_redis.get.side_effect = ["1", "{not json"]
+
+        version, page_data = await get_list_from_cache(mock_redis, "users", {})
+
+        assert (version, page_data) == (1, None)
+        mock_redis.delete.assert_awaited_once_with(
+            make_list_cache_key("users", 1, {})
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate_list_cache(self, mock_redis):
+        """Тест инвалидации: увеличивается счетчик версии списка."""
+        await invalidate_list_cache(mock_redis, "products")
+
+        mock_redis.incr.assert_awaited_once_with("products:list:version")
+
+    @pytest.mark.asyncio
+    async def test_list_cache_fail_open(self, mock_redis):
+        """Тест fail-open: без версии страница не сохраняется, ошибки не пробрасываются."""
+        mock_redis.get.side_effect = redis.ConnectionError("down")
+        mock_redis.incr.side_effect = redis.TimeoutError("slow")
+
+        version, page_data = await get_list_from_cache(mock_redis, "products", {})
+        await invalidate_list_cache(mock_redis, "products")
+
+        assert (version, page_data) == (None, None)
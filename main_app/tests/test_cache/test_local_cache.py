@@ -0,0 +1,205 @@
+import asyncio
+
+import pytest
+import redis
+import redis.asyncio as aioredis
+from unittest.mock import AsyncMock, Mock
+
+from app.cache import local_cache as local_cache_module
+from app.cache.codec import encode
+from app.cache.local_cache import (
+    INVALIDATION_CHANNEL,
+    LocalCache,
+    listen_for_invalidations,
+)
+from app.cache.product_cache import (
+    delete_product_from_cache,
+    get_product_from_cache,
+    update_product_in_cache,
+)
+from app.cache.stats import CACHE_REQUESTS, hit_ratio
+from app.cache.user_cache import delete_user_from_cache, get_user_from_cache
+
+
+class FakeClock:
+    """Управляемый источник монотонного времени."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLocalCache:
+    """Тесты LRU-кэша процесса."""
+
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованной записи."""
+        cache = LocalCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        """Тест истечения TTL записи."""
+        clock = FakeClock()
+        cache = LocalCache(max_size=10, ttl=5, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_delete_and_clear(self):
+        """Тест удаления записей."""
+        cache = LocalCache(max_size=10, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.delete("a")
+        cache.delete("missing")
+        assert cache.get("a") is None
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestLocalCacheTier:
+    """Тесты двухуровневого кэша (L1 + Redis) и инвалидации через pub/sub."""
+
+    @pytest.fixture
+    def l1(self, monkeypatch):
+        """Включает L1 на время теста."""
+        cache = LocalCache(max_size=100, ttl=60)
+        monkeypatch.setattr(local_cache_module, "local_cache", cache)
+        return cache
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Создает мок асинхронного клиента Redis."""
+        client = AsyncMock(spec=aioredis.Redis)
+        client.get = AsyncMock(return_value=encode({"id": 1, "name": "P"}))
+        client.setex = AsyncMock(return_value=True)
+        client.delete = AsyncMock(return_value=1)
+        client.publish = AsyncMock(return_value=1)
+        return client
+
+    @pytest.fixture(autouse=True)
+    def reset_metrics(self, monkeypatch):
+        """Изолирует счетчики обращений к кэшу."""
+        monkeypatch.setattr(CACHE_REQUESTS, "values", {})
+
+    @pytest.mark.asyncio
+    async def test_second_read_served_from_l1(self, l1, mock_redis):
+        """Тест: повторное чтение не обращается к Redis, метрики уровней учитываются."""
+        first = await get_product_from_cache(mock_redis, 1)
+        second = await get_product_from_cache(mock_redis, 1)
+
+        assert first == second == {"id": 1, "name": "P"}
+        mock_redis.get.assert_awaited_once_with("product:1")
+        assert CACHE_REQUESTS.get(tier="l1", entity="product", result="hit") == 1
+        assert CACHE_REQUESTS.get(tier="l1", entity="product", result="miss") == 1
+        assert CACHE_REQUESTS.get(tier="redis", entity="product", result="hit") == 1
+        assert hit_ratio("l1") == 0.5
+        assert hit_ratio("redis") == 1.0
+
+    @pytest.mark.asyncio
+    async def test_mutations_publish_invalidation(self, l1, mock_redis):
+        """Тест: обновление и удаление удаляют ключ из L1 и публикуют инвалидацию."""
+        await get_product_from_cache(mock_redis, 1)
+        await update_product_in_cache(mock_redis, 1, {"id": 1, "name": "New"})
+        assert l1.get("product:1") is None
+
+        mock_redis.get.return_value = encode({"id": 2, "username": "u"})
+        await get_user_from_cache(mock_redis, 2)
+        await delete_user_from_cache(mock_redis, 2)
+        await delete_product_from_cache(mock_redis, 1)
+
+        assert l1.get("user:2") is None
+        assert [call.args for call in mock_redis.publish.await_args_list] == [
+            (INVALIDATION_CHANNEL, "product:1"),
+            (INVALIDATION_CHANNEL, "user:2"),
+            (INVALIDATION_CHANNEL, "product:1"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_disabled_l1_still_publishes(self, mock_redis):
+        """Тест: без L1 чтения идут в Redis, но инвалидация публикуется для реплик."""
+        await get_product_from_cache(mock_redis, 1)
+        await get_product_from_cache(mock_redis, 1)
+        await delete_product_from_cache(mock_redis, 1)
+
+        assert mock_redis.get.await_count == 2
+        mock_redis.publish.assert_awaited_once_with(INVALIDATION_CHANNEL, "product:1")
+
+    @pytest.mark.asyncio
+    async def test_listener_evicts_published_keys(self, l1):
+        """Тест: слушатель удаляет из L1 ключи, полученные из канала."""
+        l1.set("product:1", {"id": 1})
+        l1.set("product:2", {"id": 2})
+        received = asyncio.Event()
+
+        # None - истек таймаут ожидания без сообщений
+        messages = iter([None, {"type": "message", "data": "product:1"}])
+
+        async def get_message(ignore_subscribe_messages, timeout):
+            assert ignore_subscribe_messages and timeout > 0
+            try:
+                return next(messages)
+            except StopIteration:
+                received.set()
+                await asyncio.Event().wait()
+
+        pubsub = Mock()
+        pubsub.subscribe = AsyncMock()
+        pubsub.aclose = AsyncMock()
+        pubsub.get_message = get_message
+        redis_client = Mock()
+        redis_client.pubsub = Mock(return_value=pubsub)
+
+        task = asyncio.create_task(listen_for_invalidations(redis_client))
+        await asyncio.wait_for(received.wait(), 1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        pubsub.subscribe.assert_awaited_once_with(INVALIDATION_CHANNEL)
+        pubsub.aclose.assert_awaited_once()
+        assert l1.get("product:1") is None
+        assert l1.get("product:2") == {"id": 2}
+
+    @pytest.mark.asyncio
+    async def test_listener_resubscribes_after_redis_error(self, l1, monkeypatch):
+        """Тест: после любой ошибки Redis L1 очищается и подписка возобновляется."""
+        monkeypatch.setattr(local_cache_module, "RESUBSCRIBE_DELAY", 0)
+        l1.set("product:1", {"id": 1})
+        resubscribed = asyncio.Event()
+        pubsub = Mock()
+        pubsub.subscribe = AsyncMock(
+            side_effect=[redis.ResponseError("NOPERM"), None]
+        )
+        pubsub.aclose = AsyncMock()
+
+        async def get_message(ignore_subscribe_messages, timeout):
+            resubscribed.set()
+            await asyncio.Event().wait()
+
+        pubsub.get_message = get_message
+        redis_client = Mock()
+        redis_client.pubsub = Mock(return_value=pubsub)
+
+        task = asyncio.create_task(listen_for_invalidations(redis_client))
+        await asyncio.wait_for(resubscribed.wait(), 1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert pubsub.subscribe.await_count == 2
+        assert l1.get("product:1") is None
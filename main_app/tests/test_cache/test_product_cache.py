@@ -0,0 +1,192 @@
+import json
+
+import pytest
+import redis
+import redis.asyncio as aioredis
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+from app.cache import local_cache as local_cache_module
+from app.cache.codec import encode
+from app.cache.local_cache import INVALIDATION_CHANNEL, LocalCache
+from app.cache.product_cache import (
+    delete_product_from_cache,
+    delete_products_from_cache,
+    get_product_from_cache,
+    get_product_json_from_cache,
+    get_products_from_cache,
+    set_product_to_cache,
+    set_products_to_cache,
+    update_product_in_cache,
+)
+
+
+class TestProductCache:
+    """Тесты для асинхронного кэша продукции."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Создает мок асинхронного клиента Redis."""
+        client = AsyncMock(spec=aioredis.Redis)
+        client.get = AsyncMock(return_value=None)
+        client.setex = AsyncMock(return_value=True)
+        client.delete = AsyncMock(return_value=1)
+        client.publish = AsyncMock(return_value=0)
+        client.mget = AsyncMock(return_value=[])
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.execute = AsyncMock(return_value=[])
+        client.pipeline = Mock(return_value=pipe)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_get_product_cache_hit(self, mock_redis):
+        """Тест получения продукции из кэша (cache hit)."""
+        mock_redis.get.return_value = encode({"id": 1, "name": "Product"})
+
+        result = await get_product_from_cache(mock_redis, 1)
+
+        assert result == {"id": 1, "name": "Product"}
+        mock_redis.get.assert_awaited_once_with("product:1")
+
+    @pytest.mark.asyncio
+    async def test_get_product_json_cache_hit(self, mock_redis):
+        """Тест получения готового JSON продукции из кэша без разбора значения."""
+        raw = encode({"id": 1, "name": "Product"})
+        mock_redis.get.return_value = raw
+
+        result = await get_product_json_from_cache(mock_redis, 1)
+
+        assert result == raw[1:]
+        assert json.loads(result) == {"id": 1, "name": "Product"}
+
+    @pytest.mark.asyncio
+    async def test_get_product_json_miss_and_corrupted(self, mock_redis):
+        """Тест: промах дает None, поврежденное значение удаляется из кэша."""
+        assert await get_product_json_from_cache(mock_redis, 1) is None
+
+        mock_redis.get.return_value = b"\xff{}"
+        assert await get_product_json_from_cache(mock_redis, 1) is None
+        mock_redis.delete.assert_awaited_once_with("product:1")
+
+    @pytest.mark.asyncio
+    async def test_get_product_cache_miss(self, mock_redis):
+        """Тест получения продукции из кэша (cache miss)."""
+        result = await get_product_from_cache(mock_redis, 1)
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error", [redis.ConnectionError("down"), redis.TimeoutError("slow")]
+    )
+    async def test_get_product_fail_open(self, mock_redis, error):
+        """Тест fail-open: ошибка Redis не пробрасывается, возвращается None."""
+        mock_redis.get.side_effect = error
+
+        result = await get_product_from_cache(mock_redis, 1)
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_get_product_corrupted_data(self, mock_redis):
+        """Тест удаления поврежденных данных из кэша."""
+        mock_redis.get.return_value = "{not json"
+
+        result = await get_product_from_cache(mock_redis, 1)
+
+        assert result is None
+        mock_redis.delete.assert_awaited_once_with("product:1")
+
+    @pytest.mark.asyncio
+    async def test_set_and_update_product(self, mock_redis):
+        """Тест сохранения и обновления продукции в кэше с TTL."""
+        await set_product_to_cache(mock_redis, 1, {"id": 1})
+        await update_product_in_cache(mock_redis, 1, {"id": 1}, ttl=60)
+
+        mock_redis.setex.assert_any_await("product:1", 600, encode({"id": 1}))
+        mock_redis.setex.assert_any_await("product:1", 60, encode({"id": 1}))
+
+    @pytest.mark.asyncio
+    async def test_set_and_delete_product_fail_open(self, mock_redis):
+        """Тест fail-open при записи и удалении."""
+        mock_redis.setex.side_effect = redis.TimeoutError("slow")
+        mock_redis.delete.side_effect = redis.ConnectionError("down")
+
+        await set_product_to_cache(mock_redis, 1, {"id": 1})
+        await delete_product_from_cache(mock_redis, 1)
+
+    @pytest.mark.asyncio
+    async def test_get_products_single_mget(self, mock_redis):
+        """Тест пакетного чтения: одна команда MGET, в ответе только попадания."""
+        mock_redis.mget.return_value = [encode({"id": 1}), None, "{not json"]
+
+        result = await get_products_from_cache(mock_redis, [1, 2, 3, 1])
+
+        assert result == {1: {"id": 1}}
+        mock_redis.mget.assert_awaited_once_with(["product:1", "product:2", "product:3"])
+        mock_redis.delete.assert_awaited_once_with("product:3")
+
+    @pytest.mark.asyncio
+    async def test_get_products_empty_and_fail_open(self, mock_redis):
+        """Тест пакетного чтения без ID и при недоступном Redis."""
+        assert await get_products_from_cache(mock_redis, []) == {}
+        mock_redis.mget.assert_not_awaited()
+
+        mock_redis.mget.side_effect = redis.ConnectionError("down")
+        assert await get_products_from_cache(mock_redis, [1]) == {}
+
+    @pytest.mark.asyncio
+    async def test_set_products_pipelined(self, mock_redis):
+        """Тест пакетной записи: SETEX отправляются одним конвейером."""
+        await set_products_to_cache(mock_redis, {1: {"id": 1}, 2: {"id": 2}}, ttl=60)
+
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        pipe = mock_redis.pipeline.return_value
+        assert pipe.setex.call_count == 2
+        pipe.setex.assert_any_call("product:2", 60, encode({"id": 2}))
+        pipe.execute.assert_awaited_once()
+        mock_redis.setex.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_set_products_only_missing(self, mock_redis, monkeypatch):
+        """Тест SET NX: существующие ключи не перезаписываются и не попадают в L1."""
+        l1 = LocalCache(max_size=10, ttl=60)
+        monkeypatch.setattr(local_cache_module, "local_cache", l1)
+        pipe = mock_redis.pipeline.return_value
+        pipe.execute.return_value = [True, None]
+
+        await set_products_to_cache(
+            mock_redis, {1: {"id": 1}, 2: {"id": 2}}, ttl=60, only_missing=True
+        )
+
+        pipe.set.assert_any_call("product:2", encode({"id": 2}), ex=60, nx=True)
+        pipe.setex.assert_not_called()
+        assert l1.get("product:1") == {"id": 1}
+        assert l1.get("product:2") is None
+
+    @pytest.mark.asyncio
+    async def test_delete_products_pipelined(self, mock_redis):
+        """Тест пакетного удаления: DEL отправляются одним конвейером."""
+        await delete_products_from_cache(mock_redis, [1, 2, 1])
+
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        pipe = mock_redis.pipeline.return_value
+        assert sorted(call.args[0] for call in pipe.delete.call_args_list) == [
+            "product:1",
+            "product:2",
+        ]
+        assert sorted(call.args for call in pipe.publish.call_args_list) == [
+            (INVALIDATION_CHANNEL, "product:1"),
+            (INVALIDATION_CHANNEL, "product:2"),
+        ]
+        mock_redis.publish.assert_not_awaited()
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_set_products_fail_open(self, mock_redis):
+        """Тест fail-open при пакетной записи."""
+        mock_redis.pipeline.return_value.execute.side_effect = redis.TimeoutError(
+            "slow"
+        )
+
+        await set_products_to_cache(mock_redis, {1: {"id": 1}})
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+import redis
+import redis.asyncio as aioredis
+from unittest.mock import AsyncMock
+
+from app.cache.stampede import SingleFlight, load_with_lock
+
+
+class TestSingleFlight:
+    """Тесты объединения одновременных загрузок внутри процесса."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_load(self):
+        """Тест: 100 одновременных вызовов выполняют одну загрузку."""
+        single_flight = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        results = await asyncio.gather(
+            *(single_flight.do("product:1", load) for _ in range(100))
+        )
+
+        assert calls == 1
+        assert all(result == {"id": 1} for result in results)
+
+    @pytest.mark.asyncio
+    async def test_error_is_shared_and_not_cached(self):
+        """Тест: ошибка загрузки получают все ожидающие, следующий вызов повторяет загрузку."""
+        single_flight = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            if calls == 1:
+                raise RuntimeError("db down")
+            return "ok"
+
+        results = await asyncio.gather(
+            *(single_flight.do("key", load) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+        assert calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await single_flight.do("key", load) == "ok"
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_load(self):
+        """Тест: отмена первого запроса не отменяет загрузку для остальных."""
+        single_flight = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.02)
+            return 42
+
+        first = asyncio.ensure_future(single_flight.do("key", load))
+        second = asyncio.ensure_future(single_flight.do("key", load))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == 42
+
+
+class TestLoadWithLock:
+    """Тесты распределенной блокировки при промахе кэша."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Создает мок асинхронного клиента Redis."""
+        client = AsyncMock(spec=aioredis.Redis)
+        client.set = AsyncMock(return_value=True)
+        client.eval = AsyncMock(return_value=1)
+        client.exists = AsyncMock(return_value=1)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_lock_owner_loads_and_releases(self, mock_redis):
+        """Тест: владелец блокировки загружает значение и снимает блокировку."""
+        load = AsyncMock(return_value={"id": 1})
+        read_cached = AsyncMock(return_value=None)
+
+        result = await load_with_lock(mock_redis, "product:1", load, read_cached)
+
+        assert result == {"id": 1}
+        lock_key, token = mock_redis.set.await_args.args
+        assert lock_key == "lock:product:1"
+        assert mock_redis.set.await_args.kwargs == {"nx": True, "px": 5000}
+        assert mock_redis.eval.await_args.args[1:] == (1, "lock:product:1", token)
+        read_cached.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_waiter_reads_value_filled_by_owner(self, mock_redis):
+        """Тест: без блокировки значение дожидается в кэше, БД не запрашивается."""
+        mock_redis.set.return_value = None
+        load = AsyncMock(return_value={"id": 1})
+        read_cached = AsyncMock(side_effect=[None, {"id": 1, "cached": True}])
+
+        result = await load_with_lock(
+            mock_redis, "product:1", load, read_cached, poll_interval=0.001
+        )
+
+        assert result == {"id": 1, "cached": True}
+        load.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_waiter_loads_when_lock_released_without_value(self, mock_redis):
+        """Тест: если блокировка снята без значения (нет в БД), ожидание прекращается."""
+        mock_redis.set.return_value = None
+        mock_redis.exists.return_value = 0
+        load = AsyncMock(return_value=None)
+
+        result = await load_with_lock(
+            mock_redis,
+            "product:404",
+            load,
+            AsyncMock(return_value=None),
+            poll_interval=0.001,
+        )
+
+        assert result is None
+        load.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_fail_open_without_redis(self, mock_redis):
+        """Тест fail-open: при недоступности Redis загрузка выполняется без блокировки."""
+        mock_redis.set.side_effect = redis.ConnectionError("down")
+        load = AsyncMock(return_value={"id": 1})
+
+        result = await load_with_lock(
+            mock_redis, "product:1", load, AsyncMock(return_value=None)
+        )
+
+        assert result == {"id": 1}
+        load.assert_awaited_once()
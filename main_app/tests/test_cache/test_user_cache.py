@@ -0,0 +1,72 @@
+import json
+
+import pytest
+import redis
+import redis.asyncio as aioredis
+from unittest.mock import AsyncMock
+
+from app.cache.codec import encode
+from app.cache.user_cache import (
+    delete_user_from_cache,
+    get_user_from_cache,
+    get_user_json_from_cache,
+    set_user_to_cache,
+)
+
+
+class TestUserCache:
+    """Тесты для асинхронного кэша пользователей."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Создает мок асинхронного клиента Redis."""
+        client = AsyncMock(spec=aioredis.Redis)
+        client.get = AsyncMock(return_value=None)
+        client.setex = AsyncMock(return_value=True)
+        client.delete = AsyncMock(return_value=1)
+        client.publish = AsyncMock(return_value=0)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_get_user_cache_hit(self, mock_redis):
+        """Тест получения пользователя из кэша (cache hit)."""
+        mock_redis.get.return_value = encode({"id": 1, "username": "user"})
+
+        result = await get_user_from_cache(mock_redis, 1)
+
+        assert result == {"id": 1, "username": "user"}
+        mock_redis.get.assert_awaited_once_with("user:1")
+
+    @pytest.mark.asyncio
+    async def test_get_user_json_cache_hit(self, mock_redis):
+        """Тест получения готового JSON пользователя из кэша."""
+        mock_redis.get.return_value = encode({"id": 1, "username": "user"})
+
+        result = await get_user_json_from_cache(mock_redis, 1)
+
+        assert json.loads(result) == {"id": 1, "username": "user"}
+
+    @pytest.mark.asyncio
+    async def test_get_user_fail_open(self, mock_redis):
+        """Тест fail-open: таймаут Redis не пробрасывается, возвращается None."""
+        mock_redis.get.side_effect = redis.TimeoutError("slow")
+
+        result = await get_user_from_cache(mock_redis, 1)
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_set_user_to_cache(self, mock_redis):
+        """Тест сохранения пользователя в кэш с TTL по умолчанию."""
+        await set_user_to_cache(mock_redis, 1, {"id": 1})
+
+        mock_redis.setex.assert_awaited_once_with(
+            "user:1", 3600, encode({"id": 1})
+        )
+
+    @pytest.mark.asyncio
+    async def test_delete_user_from_cache(self, mock_redis):
+        """Тест удаления пользователя из кэша."""
+        await delete_user_from_cache(mock_redis, 1)
+
+        mock_redis.delete.assert_awaited_once_with("user:1")
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+import redis
+from unittest.mock import AsyncMock
+
+from app.cache.settings import CacheSettings, WritePolicy
+from app.cache.write_policy import apply_write_policy, wait_for_pending_writes
+
+
+class TestWritePolicy:
+    """Тесты применения политик записи в кэш."""
+
+    @pytest.mark.asyncio
+    async def test_write_through_awaits_write(self):
+        """Тест write-through: запись выполняется до возврата управления."""
+        write = AsyncMock()
+        invalidate = AsyncMock()
+
+        await apply_write_policy(
+            WritePolicy.WRITE_THROUGH, "product:1", write, invalidate
+        )
+
+        write.assert_awaited_once()
+        invalidate.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        """Тест invalidate: ключ удаляется, после создания ничего не делается."""
+        write = AsyncMock()
+        invalidate = AsyncMock()
+
+        await apply_write_policy(WritePolicy.INVALIDATE, "user:1", write, invalidate)
+        await apply_write_policy(WritePolicy.INVALIDATE, "user:2", write, None)
+
+        invalidate.assert_awaited_once()
+        write.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_write_behind_runs_in_background_in_order(self):
+        """Тест write-behind: ответ не ждет записи, записи ключа не переставляются."""
+        written = []
+
+        async def write(value, delay):
+            await asyncio.sleep(delay)
+            written.append(value)
+
+        await apply_write_policy(
+            WritePolicy.WRITE_BEHIND, "product:1", lambda: write("old", 0.02)
+        )
+        await apply_write_policy(
+            WritePolicy.WRITE_BEHIND, "product:1", lambda: write("new", 0)
+        )
+        assert written == []
+
+        await wait_for_pending_writes()
+
+        assert written == ["old", "new"]
+
+    @pytest.mark.asyncio
+    async def test_write_through_waits_for_pending_write_behind(self):
+        """Тест: синхронная операция ключа выполняется после его фоновой записи."""
+        written = []
+
+        async def slow_write():
+            await asyncio.sleep(0.02)
+            written.append("behind")
+
+        async def invalidate():
+            written.append("invalidate")
+
+        await apply_write_policy(WritePolicy.WRITE_BEHIND, "user:1", slow_write)
+        await apply_write_policy(
+            WritePolicy.INVALIDATE, "user:1", AsyncMock(), invalidate
+        )
+
+        assert written == ["behind", "invalidate"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "policy", [WritePolicy.WRITE_THROUGH, WritePolicy.WRITE_BEHIND]
+    )
+    async def test_cache_errors_are_not_raised(self, policy):
+        """Тест fail-open: ошибка записи в кэш не пробрасывается."""
+        write = AsyncMock(side_effect=redis.ConnectionError("down"))
+
+        await apply_write_policy(policy, "product:1", write)
+        await wait_for_pending_writes()
+
+        write.assert_awaited_once()
+
+    def test_policy_from_env(self, monkeypatch):
+        """Тест чтения политик записи из окружения."""
+        monkeypatch.setenv("CACHE_PRODUCT_WRITE_POLICY", "write_behind")
+        monkeypatch.setenv("CACHE_USER_WRITE_POLICY", "INVALIDATE")
+
+        settings = CacheSettings.from_env()
+
+        assert settings.product_write_policy == WritePolicy.WRITE_BEHIND
+        assert settings.user_write_policy == WritePolicy.INVALIDATE
+
+        monkeypatch.setenv("CACHE_USER_WRITE_POLICY", "lazy")
+        with pytest.raises(ValueError):
+            CacheSettings.from_env()
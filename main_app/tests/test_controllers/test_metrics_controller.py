@@ -0,0 +1,21 @@
+import pytest
+from litestar.status_codes import HTTP_200_OK
+from litestar.testing import TestClient
+
+from app.database import DB_POOL_CHECKOUT_WAIT
+
+
+class TestMetricsController:
+    """Тесты для эндпоинта метрик."""
+
+    @pytest.mark.asyncio
+    async def test_get_metrics(self, client: TestClient):
+        """Тест GET /metrics - экспорт метрик в формате Prometheus."""
+        DB_POOL_CHECKOUT_WAIT.observe(0.002)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE db_pool_checkout_wait_seconds histogram" in response.text
+        assert 'db_pool_checkout_wait_seconds_bucket{le="0.005"}' in response.text
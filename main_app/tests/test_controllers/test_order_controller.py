@@ -143,6 +143,45 @@ class TestOrderController:
         assert len(data["orders"]) >= 3
         assert data["total"] >= 3
 
+    @pytest.mark.asyncio
+    async def test_get_all_orders_with_cursor(
+        self,
+        client: TestClient,
+        controller_session,
+        order_repository: OrderRepository,
+        test_user: User,
+        test_address: Address,
+        test_products: list[Product],
+    ):
+        """Тест GET /orders - keyset пагинация по курсору с фильтром."""
+        from app.schemas.order_schema import OrderCreate, OrderItemCreate
+        for i in range(3):
+            order_data = OrderCreate(
+                user_id=test_user.id,
+                delivery_address_id=test_address.id,
+                items=[OrderItemCreate(product_id=test_products[0].id, quantity=1)],
+            )
+            await order_repository.create(
+                controller_session, order_data, test_products[0].price
+            )
+        await controller_session.commit()
+
+        response = client.get(f"/orders?count=2&user_id={test_user.id}")
+        assert response.status_code == HTTP_200_OK
+        first = response.json()
+        assert len(first["orders"]) == 2
+        assert first["next_cursor"] is not None
+
+        response = client.get(
+            f"/orders?count=2&user_id={test_user.id}&cursor={first['next_cursor']}"
+        )
+        assert response.status_code == HTTP_200_OK
+        second = response.json()
+        assert len(second["orders"]) == 1
+        assert second["next_cursor"] is None
+        assert (first["total"], second["total"]) == (3, None)
+        assert second["orders"][0]["id"] < first["orders"][-1]["id"]
+
     @pytest.mark.asyncio
     async def test_create_order(
         self,
@@ -348,3 +387,54 @@ class TestOrderController:
         data = response.json()
         assert all(order["user_id"] == test_user.id for order in data["orders"])
 
+
+    # Бюджет SQL-запросов на один вызов эндпоинта (регрессия лишних перезагрузок)
+    QUERY_BUDGETS = {
+        "GET /orders/{id}": 2,  # заказ + items (selectinload)
+        "GET /orders": 2,  # страница с COUNT(*) OVER () + items
+        "POST /orders": 5,  # user, address, UPDATE products, INSERT orders, INSERT order_items
+        "PUT /orders/{id}": 3,  # заказ + items, UPDATE orders
+    }
+
+    @pytest.mark.asyncio
+    async def test_order_endpoints_query_budget(
+        self,
+        client: TestClient,
+        query_counter,
+        test_user: User,
+        test_address: Address,
+        test_products: list[Product],
+    ):
+        """Тест бюджета SQL-запросов для эндпоинтов заказов."""
+        order_data = {
+            "user_id": test_user.id,
+            "delivery_address_id": test_address.id,
+            "items": [
+                {"product_id": test_products[0].id, "quantity": 2},
+                {"product_id": test_products[1].id, "quantity": 1},
+            ],
+        }
+
+        query_counter.reset()
+        response = client.post("/orders", json=order_data)
+        assert response.status_code == HTTP_201_CREATED
+        assert len(response.json()["items"]) == 2
+        assert query_counter.count <= self.QUERY_BUDGETS["POST /orders"]
+        order_id = response.json()["id"]
+
+        query_counter.reset()
+        response = client.get(f"/orders/{order_id}")
+        assert response.status_code == HTTP_200_OK
+        assert query_counter.count <= self.QUERY_BUDGETS["GET /orders/{id}"]
+
+        query_counter.reset()
+        response = client.get("/orders")
+        assert response.status_code == HTTP_200_OK
+        assert query_counter.count <= self.QUERY_BUDGETS["GET /orders"]
+
+        query_counter.reset()
+        response = client.put(f"/orders/{order_id}", json={"status": "shipped"})
+        assert response.status_code == HTTP_200_OK
+        assert response.json()["status"] == "shipped"
+        assert len(response.json()["items"]) == 2
+        assert query_counter.count <= self.QUERY_BUDGETS["PUT /orders/{id}"]
@@ -3,7 +3,7 @@ from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CON
 from litestar.testing import TestClient
 
 from app.models import Product
-from app.schemas.product_schema import ProductCreate
+from app.schemas.product_schema import ProductCreate, ProductResponse
 from app.repositories.product_repository import ProductRepository
 
 
@@ -34,6 +34,10 @@ class TestProductController:
         assert data["name"] == "Test Product"
         assert data["price"] == 99.99
         assert data["stock_quantity"] == 10
+        # Тело ответа совпадает с сериализацией ProductResponse
+        assert data == ProductResponse.model_validate(created_product).model_dump(
+            mode="json"
+        )
 
     @pytest.mark.asyncio
     async def test_get_product_by_id_not_found(self, client: TestClient):
@@ -66,6 +70,66 @@ class TestProductController:
         assert len(data["products"]) >= 3
         assert data["total"] >= 3
 
+    @pytest.mark.asyncio
+    async def test_get_all_products_single_query(
+        self,
+        client: TestClient,
+        controller_session,
+        product_repository: ProductRepository,
+        query_counter,
+    ):
+        """Тест GET /products - список и total одним запросом (без COUNT)."""
+        for i in range(3):
+            product_data = ProductCreate(
+                name=f"Product {i}",
+                price=10.0 * (i + 1),
+                stock_quantity=10,
+            )
+            await product_repository.create(controller_session, product_data)
+        await controller_session.commit()
+        query_counter.reset()
+
+        response = client.get("/products?count=2")
+
+        assert response.status_code == HTTP_200_OK
+        assert response.json()["total"] == 3
+        selects = [
+            statement
+            for statement in query_counter.statements
+            if "FROM products" in statement
+        ]
+        assert len(selects) == 1
+        assert "OVER ()" in selects[0]
+
+    @pytest.mark.asyncio
+    async def test_get_all_products_total_modes(
+        self, client: TestClient, controller_session, product_repository: ProductRepository
+    ):
+        """Тест GET /products - режимы total_mode none и approximate."""
+        for i in range(3):
+            product_data = ProductCreate(
+                name=f"Product {i}",
+                price=10.0 * (i + 1),
+                stock_quantity=10,
+            )
+            await product_repository.create(controller_session, product_data)
+        await controller_session.commit()
+
+        response = client.get("/products?count=2&total_mode=none")
+        assert response.status_code == HTTP_200_OK
+        data = response.json()
+        assert data["total"] is None
+        assert len(data["products"]) == 2
+        assert data["next_cursor"] is not None
+
+        # Вне PostgreSQL оценка недоступна, используется точное значение
+        response = client.get("/products?total_mode=approximate")
+        assert response.status_code == HTTP_200_OK
+        assert response.json()["total"] == 3
+
+        response = client.get("/products?total_mode=unknown")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
     @pytest.mark.asyncio
     async def test_get_products_pagination(
         self, client: TestClient, controller_session, product_repository: ProductRepository
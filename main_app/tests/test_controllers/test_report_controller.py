@@ -1,8 +1,12 @@
 """Тесты для API эндпоинтов отчетов."""
 
+import csv
+import io
+import json
+
 import pytest
 from datetime import date
-from litestar.status_codes import HTTP_200_OK
+from litestar.status_codes import HTTP_200_OK, HTTP_400_BAD_REQUEST
 from litestar.testing import TestClient
 
 from app.models import Report, Order, User, Address, Product
@@ -136,3 +140,61 @@ class TestReportController:
         assert isinstance(data, list)
         assert len(data) == 0
 
+
+    @pytest.mark.asyncio
+    async def test_export_reports_ndjson(
+        self,
+        client: TestClient,
+        controller_session,
+        test_report: Report,
+    ):
+        """Тест GET /report/export - потоковая выгрузка NDJSON."""
+        today = date.today().isoformat()
+
+        response = client.get(
+            f"/report/export?start_date={today}&end_date={today}"
+        )
+
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "content-length" not in response.headers
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 1
+        assert lines[0]["id"] == test_report.id
+        assert lines[0]["order_id"] == test_report.order_id
+        assert lines[0]["count_product"] == 3
+        assert lines[0]["report_at"] == today
+
+    @pytest.mark.asyncio
+    async def test_export_reports_csv(
+        self,
+        client: TestClient,
+        controller_session,
+        test_report: Report,
+    ):
+        """Тест GET /report/export - потоковая выгрузка CSV с заголовком."""
+        today = date.today().isoformat()
+
+        response = client.get(
+            f"/report/export?start_date={today}&end_date={today}&format=csv"
+        )
+
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == ["id", "report_at", "order_id", "count_product", "created_at"]
+        assert rows[1][:4] == [
+            str(test_report.id),
+            today,
+            str(test_report.order_id),
+            "3",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_export_reports_invalid_range(self, client: TestClient):
+        """Тест GET /report/export - начальная дата позже конечной."""
+        response = client.get(
+            "/report/export?start_date=2024-02-01&end_date=2024-01-01"
+        )
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
@@ -65,6 +65,31 @@ class TestUserController:
         assert len(data["users"]) >= 3
         assert data["total"] >= 3
 
+    @pytest.mark.asyncio
+    async def test_get_all_users_with_filters(
+        self, client: TestClient, controller_session, user_repository: UserRepository
+    ):
+        """Тест GET /users - фильтрация по username и email."""
+        for i in range(3):
+            user_data = UserCreate(
+                email=f"filtered{i}@example.com",
+                username=f"filtered_{i}",
+            )
+            await user_repository.create(controller_session, user_data)
+        await controller_session.commit()
+
+        response = client.get("/users?username=filtered_1")
+        assert response.status_code == HTTP_200_OK
+        data = response.json()
+        assert [user["username"] for user in data["users"]] == ["filtered_1"]
+        assert data["total"] == 1
+
+        response = client.get("/users?email=FILTERED2@")
+        assert response.status_code == HTTP_200_OK
+        assert [user["email"] for user in response.json()["users"]] == [
+            "filtered2@example.com"
+        ]
+
     @pytest.mark.asyncio
     async def test_get_all_users_with_pagination(
         self, client: TestClient, controller_session, user_repository: UserRepository
@@ -91,6 +116,43 @@ class TestUserController:
         data = response.json()
         assert len(data["users"]) == 2
 
+    @pytest.mark.asyncio
+    async def test_get_all_users_with_cursor(
+        self, client: TestClient, controller_session, user_repository: UserRepository
+    ):
+        """Тест GET /users - keyset пагинация по курсору."""
+        for i in range(5):
+            user_data = UserCreate(
+                email=f"cursor{i}@example.com",
+                username=f"cursor_{i}",
+            )
+            await user_repository.create(controller_session, user_data)
+        await controller_session.commit()
+
+        response = client.get("/users?count=2")
+        assert response.status_code == HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 5
+        seen = [user["id"] for user in data["users"]]
+
+        while data["next_cursor"]:
+            response = client.get(f"/users?count=2&cursor={data['next_cursor']}")
+            assert response.status_code == HTTP_200_OK
+            data = response.json()
+            # Страницы по курсору по умолчанию не считают общее количество
+            assert data["total"] is None
+            seen.extend(user["id"] for user in data["users"])
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
+    @pytest.mark.asyncio
+    async def test_get_all_users_invalid_cursor(self, client: TestClient):
+        """Тест GET /users - поврежденный курсор."""
+        response = client.get("/users?cursor=not-a-cursor")
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
     @pytest.mark.asyncio
     async def test_create_user(self, client: TestClient):
         """Тест POST /users - создание пользователя."""
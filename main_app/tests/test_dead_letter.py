@@ -0,0 +1,183 @@
+from datetime import timedelta
+
+import pytest
+from aiormq.abc import DeliveredMessage
+from unittest.mock import AsyncMock, MagicMock
+from pydantic import BaseModel, ValidationError
+
+from app.dead_letter import (
+    ATTEMPTS_HEADER,
+    ERROR_HEADER,
+    DeadLetterMiddleware,
+    RetrySettings,
+    dead_letter,
+    declare_queues,
+    retry_later,
+    retry_queue,
+)
+
+
+def rabbit_message(**kwargs):
+    """Сообщение RabbitMQ с заголовками и свойствами для повторной публикации."""
+    defaults = dict(
+        body=b'{"id": 1}',
+        headers={"x-trace": "t-1"},
+        correlation_id="corr-1",
+        reply_to="replies",
+        content_type="application/json",
+        committed=None,
+    )
+    return AsyncMock(**{**defaults, **kwargs})
+
+
+class TestRetry:
+    """Тесты повтора обработки с экспоненциальной задержкой."""
+
+    def test_delay_grows_exponentially_up_to_max(self):
+        """Тест: задержка удваивается с каждой попыткой и ограничена сверху."""
+        settings = RetrySettings(max_attempts=10, base_delay_ms=100, max_delay_ms=500)
+
+        assert [settings.delay_ms(attempt) for attempt in range(1, 6)] == [
+            100,
+            200,
+            400,
+            500,
+            500,
+        ]
+
+    def test_retry_queue_dead_letters_to_source_queue(self):
+        """Тест: просроченные сообщения очереди повтора возвращаются в исходную."""
+        queue = retry_queue("order", 2)
+
+        assert queue.name == "order.retry.2"
+        assert queue.arguments["x-dead-letter-exchange"] == ""
+        assert queue.arguments["x-dead-letter-routing-key"] == "order"
+
+    @pytest.mark.asyncio
+    async def test_retry_republishes_with_attempt_and_expiration(self):
+        """Тест: копия публикуется в очередь попытки с TTL, исходное подтверждается."""
+        broker = AsyncMock()
+        message = rabbit_message(headers={"x-trace": "t-1", ATTEMPTS_HEADER: 1})
+        settings = RetrySettings(max_attempts=5, base_delay_ms=100)
+
+        await retry_later(broker, message, "order", ConnectionError("db"), settings)
+
+        body, queue = broker.publish.await_args.args
+        kwargs = broker.publish.await_args.kwargs
+        assert (body, queue) == (b'{"id": 1}', "order.retry.2")
+        assert kwargs["headers"] == {"x-trace": "t-1", ATTEMPTS_HEADER: 2}
+        assert kwargs["expiration"] == timedelta(milliseconds=200)
+        assert (kwargs["correlation_id"], kwargs["reply_to"]) == ("corr-1", "replies")
+        message.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_exhausted_attempts_are_quarantined(self):
+        """Тест: после max_attempts попыток сообщение помещается в карантин."""
+        broker = AsyncMock()
+        message = rabbit_message(headers={ATTEMPTS_HEADER: 2})
+
+        await retry_later(
+            broker, message, "order", ConnectionError("db"), RetrySettings(3)
+        )
+
+        assert broker.publish.await_args.args[1] == "order.dlq"
+        headers = broker.publish.await_args.kwargs["headers"]
+        assert headers[ERROR_HEADER] == "ConnectionError: db"
+        assert headers[ATTEMPTS_HEADER] == 2
+        message.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_requeues_message(self):
+        """Тест: если копию опубликовать не удалось, сообщение возвращается в очередь."""
+        broker = AsyncMock()
+        broker.publish.side_effect = ConnectionError("broker down")
+        message = rabbit_message()
+
+        await dead_letter(broker, message, "order", ValueError("bad"))
+
+        message.ack.assert_not_awaited()
+        message.nack.assert_awaited_once_with(requeue=True)
+
+    @pytest.mark.asyncio
+    async def test_unroutable_copy_requeues_message(self):
+        """Тест: копия, возвращенная брокером как немаршрутизируемая, не теряется."""
+        broker = AsyncMock()
+        broker.publish.return_value = MagicMock(spec=DeliveredMessage)
+        message = rabbit_message()
+
+        await retry_later(broker, message, "order", ConnectionError("db"))
+
+        assert broker.publish.await_args.kwargs["mandatory"] is True
+        message.ack.assert_not_awaited()
+        message.nack.assert_awaited_once_with(requeue=True)
+
+    @pytest.mark.asyncio
+    async def test_declare_queues(self):
+        """Тест: объявляются очереди повтора каждой попытки и очередь карантина."""
+        broker = AsyncMock()
+
+        await declare_queues(broker, ["order"], RetrySettings(max_attempts=3))
+
+        declared = [call.args[0].name for call in broker.declare_queue.await_args_list]
+        assert declared == ["order.retry.1", "order.retry.2", "order.dlq"]
+
+
+class TestDeadLetterMiddleware:
+    """Тесты карантина сообщений, не дошедших до обработчика."""
+
+    @staticmethod
+    def middleware(broker):
+        context = MagicMock()
+        context.get.return_value = broker
+        return DeadLetterMiddleware(None, context=context)
+
+    @staticmethod
+    def validation_error():
+        class Item(BaseModel):
+            id: int
+
+        try:
+            Item(id="x")
+        except ValidationError as e:
+            return e
+
+    @pytest.mark.asyncio
+    async def test_invalid_message_is_quarantined(self):
+        """Тест: сообщение с некорректными данными помещается в карантин."""
+        broker = AsyncMock()
+        message = rabbit_message()
+        message.raw_message.routing_key = "product"
+
+        await self.middleware(broker).consume_scope(
+            AsyncMock(side_effect=self.validation_error()), message
+        )
+
+        assert broker.publish.await_args.args[1] == "product.dlq"
+        message.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_is_retried(self):
+        """Тест: непредвиденная ошибка обработчика приводит к повтору."""
+        broker = AsyncMock()
+        message = rabbit_message()
+        message.raw_message.routing_key = "order"
+
+        await self.middleware(broker).consume_scope(
+            AsyncMock(side_effect=ConnectionError("broker down")), message
+        )
+
+        assert broker.publish.await_args.args[1] == "order.retry.1"
+
+    @pytest.mark.asyncio
+    async def test_settled_message_error_is_raised(self):
+        """Тест: ошибка после подтверждения сообщения не обрабатывается повторно."""
+        broker = AsyncMock()
+        message = rabbit_message(committed="ack")
+        message.raw_message.routing_key = "order"
+
+        with pytest.raises(ConnectionError):
+            await self.middleware(broker).consume_scope(
+                AsyncMock(side_effect=ConnectionError("down")), message
+            )
+
+        broker.publish.assert_not_awaited()
@@ -1,3 +1,5 @@
+from datetime import date, datetime
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -366,3 +368,34 @@ class TestOrderRepository:
             assert item.quantity == order_items[i].quantity
             assert item.price_at_order == test_products[i].price
 
+
+    @pytest.mark.asyncio
+    async def test_get_orders_by_date_boundaries(
+        self,
+        session: AsyncSession,
+        order_repository: OrderRepository,
+        test_user: User,
+        test_address: Address,
+    ):
+        """Тест выборки за дату по полуоткрытому диапазону [день, день + 1)."""
+        created = [
+            datetime(2024, 6, 1, 23, 59, 59, 999999),  # предыдущий день
+            datetime(2024, 6, 2, 0, 0),
+            datetime(2024, 6, 2, 23, 59, 59, 999999),
+            datetime(2024, 6, 3, 0, 0),  # следующий день
+        ]
+        orders = [
+            Order(
+                user_id=test_user.id,
+                delivery_address_id=test_address.id,
+                total_price=10.0,
+                created_at=created_at,
+            )
+            for created_at in created
+        ]
+        session.add_all(orders)
+        await session.flush()
+
+        result = await order_repository.get_orders_by_date(session, date(2024, 6, 2))
+
+        assert [order.id for order in result] == [orders[2].id, orders[1].id]
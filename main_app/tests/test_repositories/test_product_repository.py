@@ -1,7 +1,7 @@
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Product
+from app.models import Address, Order, OrderItem, Product, User
 from app.repositories.product_repository import ProductRepository
 from app.schemas.product_schema import ProductCreate, ProductUpdate
 
@@ -30,6 +30,166 @@ class TestProductRepository:
         assert product.price == 99.99
         assert product.stock_quantity == 10
 
+    @pytest.mark.asyncio
+    async def test_bulk_create_products(
+        self, session: AsyncSession, product_repository: ProductRepository
+    ):
+        """Тест создания нескольких продуктов многострочным INSERT ... RETURNING."""
+        products = await product_repository.bulk_create(
+            session,
+            [
+                ProductCreate(
+                    name=f"Bulk {i}", sku=f"BULK-{i}", price=1.0 + i, stock_quantity=i
+                )
+                for i in range(3)
+            ]
+            + [ProductCreate(name="Bulk no sku", price=9.0, stock_quantity=0)],
+        )
+
+        assert [product.name for product in products] == [
+            "Bulk 0",
+            "Bulk 1",
+            "Bulk 2",
+            "Bulk no sku",
+        ]
+        assert all(product.id is not None for product in products)
+        assert all(product.created_at is not None for product in products)
+        assert products[3].sku is None
+        assert await product_repository.bulk_create(session, []) == []
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_upsert_by_sku(
+        self, session: AsyncSession, product_repository: ProductRepository
+    ):
+        """Тест upsert по артикулу: существующий продукт обновляется, не дублируется."""
+        [existing] = await product_repository.bulk_create(
+            session,
+            [ProductCreate(name="Old", sku="UPS-1", price=1.0, stock_quantity=1)],
+        )
+
+        products = await product_repository.bulk_create(
+            session,
+            [
+                ProductCreate(name="New", sku="UPS-1", price=2.0, stock_quantity=5),
+                ProductCreate(name="Other", sku="UPS-2", price=3.0, stock_quantity=1),
+                ProductCreate(name="Newest", sku="UPS-1", price=4.0, stock_quantity=7),
+            ],
+            upsert=True,
+        )
+
+        assert len(products) == 2
+        updated = next(product for product in products if product.sku == "UPS-1")
+        assert updated.id == existing.id
+        assert (updated.name, updated.price, updated.stock_quantity) == (
+            "Newest",
+            4.0,
+            7,
+        )
+        assert await product_repository.count(session) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_many_products(
+        self, session: AsyncSession, product_repository: ProductRepository
+    ):
+        """Тест получения нескольких продуктов одним запросом."""
+        first = await product_repository.create(
+            session, ProductCreate(name="Many 1", price=1.0, stock_quantity=1)
+        )
+        second = await product_repository.create(
+            session, ProductCreate(name="Many 2", price=2.0, stock_quantity=2)
+        )
+        await session.flush()
+
+        products = await product_repository.get_many(
+            session, [first.id, second.id, first.id, 99999]
+        )
+
+        assert set(products) == {first.id, second.id}
+        assert products[second.id].name == "Many 2"
+        assert await product_repository.get_many(session, []) == {}
+
+    @pytest.mark.asyncio
+    async def test_get_most_ordered(
+        self, session: AsyncSession, product_repository: ProductRepository
+    ):
+        """Тест выбора самых заказываемых продуктов по сумме количества в заказах."""
+        user = User(username="top_buyer", email="top@example.com")
+        address = Address(
+            user=user,
+            street="Top Street",
+            city="Top City",
+            state="Top State",
+            zip_code="12345",
+            country="Top Country",
+        )
+        products = [
+            Product(name=f"Top {i}", price=1.0, stock_quantity=100) for i in range(4)
+        ]
+        session.add_all([user, address, *products])
+        await session.flush()
+        # Top 0: 1, Top 1: 5 + 2, Top 2: 4, Top 3 не заказывался
+        session.add_all(
+            Order(
+                user_id=user.id,
+                delivery_address_id=address.id,
+                total_price=1.0,
+                items=[
+                    OrderItem(
+                        product_id=products[index].id,
+                        quantity=quantity,
+                        price_at_order=1.0,
+                    )
+                    for index, quantity in items
+                ],
+            )
+            for items in [[(0, 1), (1, 5)], [(1, 2), (2, 4)]]
+        )
+        await session.flush()
+
+        top = await product_repository.get_most_ordered(session, 2)
+        everything = await product_repository.get_most_ordered(session, 10)
+
+        assert [product.name for product in top] == ["Top 1", "Top 2"]
+        assert [product.name for product in everything] == ["Top 1", "Top 2", "Top 0"]
+
+    @pytest.mark.asyncio
+    async def test_reserve_stock(
+        self, session: AsyncSession, product_repository: ProductRepository
+    ):
+        """Тест атомарного списания остатка одним UPDATE."""
+        first = await product_repository.create(
+            session, ProductCreate(name="Reserve 1", price=1.0, stock_quantity=5)
+        )
+        second = await product_repository.create(
+            session, ProductCreate(name="Reserve 2", price=2.0, stock_quantity=3)
+        )
+        await session.flush()
+
+        reserved = await product_repository.reserve_stock(
+            session, {first.id: 5, second.id: 1}
+        )
+
+        assert reserved[first.id].stock_quantity == 0
+        assert reserved[second.id].stock_quantity == 2
+
+    @pytest.mark.asyncio
+    async def test_reserve_stock_insufficient(
+        self, session: AsyncSession, product_repository: ProductRepository
+    ):
+        """Тест: позиции с недостаточным остатком не списываются."""
+        product = await product_repository.create(
+            session, ProductCreate(name="Reserve Short", price=1.0, stock_quantity=2)
+        )
+        await session.flush()
+
+        reserved = await product_repository.reserve_stock(
+            session, {product.id: 3, 99999: 1}
+        )
+
+        assert reserved == {}
+        found = await product_repository.get_by_id(session, product.id)
+        assert found.stock_quantity == 2
+
     @pytest.mark.asyncio
     async def test_get_product_by_id(
         self, session: AsyncSession, product_repository: ProductRepository
@@ -178,6 +338,46 @@ class TestProductRepository:
         page2 = await product_repository.get_by_filter(session, count=5, page=2)
         assert len(page2) == 5
 
+    @pytest.mark.asyncio
+    async def test_get_products_with_total(
+        self, session: AsyncSession, product_repository: ProductRepository
+    ):
+        """Тест получения страницы и общего количества одним запросом."""
+        for i in range(7):
+            product_data = ProductCreate(
+                name=f"Total Product {i}",
+                price=10.0 * (i + 1),
+                stock_quantity=10,
+            )
+            await product_repository.create(session, product_data)
+        await session.flush()
+
+        products, total = await product_repository.get_by_filter_with_total(
+            session, count=5, page=2
+        )
+        assert len(products) == 2
+        assert total == 7
+
+        products, total = await product_repository.get_by_filter_with_total(
+            session, count=5, page=1, min_price=50.0
+        )
+        assert len(products) == 3
+        assert total == 3
+
+        # Страница за пределами списка: общее количество считается отдельно
+        products, total = await product_repository.get_by_filter_with_total(
+            session, count=5, page=3
+        )
+        assert products == []
+        assert total == 7
+
+    @pytest.mark.asyncio
+    async def test_estimate_count_not_available_on_sqlite(
+        self, session: AsyncSession, product_repository: ProductRepository
+    ):
+        """Тест оценки количества: вне PostgreSQL оценка недоступна."""
+        assert await product_repository.estimate_count(session) is None
+
     @pytest.mark.asyncio
     async def test_get_products_with_filters(
         self, session: AsyncSession, product_repository: ProductRepository
@@ -1,10 +1,10 @@
 """Тесты для репозитория отчетов."""
 
 import pytest
-from datetime import date
+from datetime import date, datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Report, Order, User, Address, Product
+from app.models import Report, Order, OrderItem, User, Address, Product
 from app.repositories.report_repository import ReportRepository
 from app.repositories.order_repository import OrderRepository
 from app.repositories.user_repository import UserRepository
@@ -101,6 +101,124 @@ class TestReportRepository:
         assert report.count_product == 2
         assert report.created_at is not None
 
+    @pytest.mark.asyncio
+    async def test_upsert_reports_for_date(
+        self,
+        session: AsyncSession,
+        report_repository: ReportRepository,
+        test_user: User,
+        test_address: Address,
+        test_product: Product,
+    ):
+        """Тест формирования отчетов за дату одним INSERT ... SELECT."""
+        report_date = date(2024, 3, 10)
+        day_orders = [
+            Order(
+                user_id=test_user.id,
+                delivery_address_id=test_address.id,
+                total_price=10.0,
+                created_at=datetime(2024, 3, 10, hour),
+                items=[
+                    OrderItem(product_id=test_product.id, quantity=quantity, price_at_order=1.0)
+                    for quantity in quantities
+                ],
+            )
+            for hour, quantities in [(0, [2, 3]), (23, [4]), (12, [])]
+        ]
+        other_day_order = Order(
+            user_id=test_user.id,
+            delivery_address_id=test_address.id,
+            total_price=10.0,
+            created_at=datetime(2024, 3, 11, 0, 0),
+            items=[OrderItem(product_id=test_product.id, quantity=1, price_at_order=1.0)],
+        )
+        session.add_all([*day_orders, other_day_order])
+        await session.flush()
+
+        reports = await report_repository.upsert_reports_for_date(session, report_date)
+
+        counts = {report.order_id: report.count_product for report in reports}
+        assert counts == {
+            day_orders[0].id: 5,
+            day_orders[1].id: 4,
+            day_orders[2].id: 0,
+        }
+        assert all(report.id is not None for report in reports)
+        assert all(report.report_at == report_date for report in reports)
+        assert all(report.created_at is not None for report in reports)
+
+    @pytest.mark.asyncio
+    async def test_upsert_reports_is_idempotent(
+        self,
+        session: AsyncSession,
+        report_repository: ReportRepository,
+        test_order: Order,
+    ):
+        """Тест повторного формирования: отчеты обновляются, а не дублируются."""
+        report_date = test_order.created_at.date()
+
+        first = await report_repository.upsert_reports_for_date(session, report_date)
+        test_order.items[0].quantity = 7
+        await session.flush()
+        second = await report_repository.upsert_reports_for_date(session, report_date)
+
+        assert [report.id for report in second] == [report.id for report in first]
+        assert second[0].count_product == 7
+        stored = await report_repository.get_reports_by_date(session, report_date)
+        assert len(stored) == 1
+
+    @pytest.mark.asyncio
+    async def test_upsert_reports_changed_since(
+        self,
+        session: AsyncSession,
+        report_repository: ReportRepository,
+        test_user: User,
+        test_address: Address,
+    ):
+        """Тест инкрементального режима: учитываются только измененные заказы."""
+        report_date = date(2024, 3, 10)
+        old_order = Order(
+            user_id=test_user.id,
+            delivery_address_id=test_address.id,
+            total_price=10.0,
+            created_at=datetime(2024, 3, 10, 9),
+            updated_at=datetime(2024, 3, 10, 9),
+        )
+        new_order = Order(
+            user_id=test_user.id,
+            delivery_address_id=test_address.id,
+            total_price=10.0,
+            created_at=datetime(2024, 3, 10, 15),
+            updated_at=datetime(2024, 3, 10, 15),
+        )
+        session.add_all([old_order, new_order])
+        await session.flush()
+
+        reports = await report_repository.upsert_reports_for_date(
+            session, report_date, changed_since=datetime(2024, 3, 10, 12)
+        )
+
+        assert [report.order_id for report in reports] == [new_order.id]
+
+    @pytest.mark.asyncio
+    async def test_watermark(
+        self, session: AsyncSession, report_repository: ReportRepository
+    ):
+        """Тест сохранения и обновления отметки формирования отчетов."""
+        report_date = date(2024, 3, 10)
+        assert await report_repository.get_watermark(session, report_date) is None
+
+        await report_repository.set_watermark(
+            session, report_date, datetime(2024, 3, 10, 12)
+        )
+        await report_repository.set_watermark(
+            session, report_date, datetime(2024, 3, 10, 13)
+        )
+
+        assert await report_repository.get_watermark(
+            session, report_date
+        ) == datetime(2024, 3, 10, 13)
+
     @pytest.mark.asyncio
     async def test_get_reports_by_date(
         self,
@@ -110,6 +228,14 @@ class TestReportRepository:
     ):
         """Тест получения отчетов по дате."""
         report_date = date.today()
+        # Отчет уникален по (report_at, order_id), поэтому нужен второй заказ
+        second_order = Order(
+            user_id=test_order.user_id,
+            delivery_address_id=test_order.delivery_address_id,
+            total_price=10.0,
+        )
+        session.add(second_order)
+        await session.flush()
         
         # Создаем несколько отчетов
         report1 = await report_repository.create_report(
@@ -121,7 +247,7 @@ class TestReportRepository:
         report2 = await report_repository.create_report(
             session=session,
             report_at=report_date,
-            order_id=test_order.id,
+            order_id=second_order.id,
             count_product=3,
         )
         await session.flush()
@@ -133,6 +259,34 @@ class TestReportRepository:
         assert report1.id in [r.id for r in reports]
         assert report2.id in [r.id for r in reports]
 
+    @pytest.mark.asyncio
+    async def test_stream_reports_between(
+        self,
+        session: AsyncSession,
+        report_repository: ReportRepository,
+        test_order: Order,
+    ):
+        """Тест потокового чтения отчетов за диапазон дат порциями."""
+        for day in (1, 2, 3, 5):
+            await report_repository.create_report(
+                session=session,
+                report_at=date(2024, 5, day),
+                order_id=test_order.id,
+                count_product=day,
+            )
+        await session.flush()
+
+        chunks = [
+            chunk
+            async for chunk in report_repository.stream_reports_between(
+                session, date(2024, 5, 1), date(2024, 5, 3), chunk_size=2
+            )
+        ]
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        rows = [row for chunk in chunks for row in chunk]
+        assert [row["count_product"] for row in rows] == [1, 2, 3]
+
     @pytest.mark.asyncio
     async def test_get_reports_by_date_empty(
         self,
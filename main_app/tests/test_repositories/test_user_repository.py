@@ -1,3 +1,5 @@
+from datetime import datetime
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -188,6 +190,36 @@ class TestUserRepository:
         page2_ids = {user.id for user in page2}
         assert page1_ids.isdisjoint(page2_ids)
 
+    @pytest.mark.asyncio
+    async def test_get_users_by_cursor(
+        self, session: AsyncSession, user_repository: UserRepository
+    ):
+        """Тест keyset пагинации: одинаковый created_at, порядок по id."""
+        created_at = datetime(2025, 1, 1, 12, 0, 0)
+        for i in range(5):
+            session.add(
+                User(
+                    email=f"cursor{i}@example.com",
+                    username=f"cursor_{i}",
+                    created_at=created_at,
+                )
+            )
+        await session.flush()
+
+        page1 = await user_repository.get_by_cursor(session, count=2)
+        last = page1[-1]
+        page2 = await user_repository.get_by_cursor(
+            session, count=2, after=(last.created_at, last.id)
+        )
+        last = page2[-1]
+        page3 = await user_repository.get_by_cursor(
+            session, count=2, after=(last.created_at, last.id)
+        )
+
+        ids = [user.id for user in page1 + page2 + page3]
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 5
+
     @pytest.mark.asyncio
     async def test_get_users_with_filter(
         self, session: AsyncSession, user_repository: UserRepository
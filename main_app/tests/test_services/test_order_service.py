@@ -1,8 +1,13 @@
+import asyncio
+import os
+from uuid import uuid4
+
 import pytest
 from unittest.mock import AsyncMock, Mock
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.models import Order, Product, User, Address, OrderItem
+from app.models import Base, Order, Product, User, Address, OrderItem
 from app.services.order_service import OrderService
 from app.repositories.order_repository import OrderRepository
 from app.repositories.product_repository import ProductRepository
@@ -103,7 +108,10 @@ class TestOrderService:
 
         mock_session.execute = AsyncMock(side_effect=mock_execute)
 
-        mock_product_repository.get_by_id.side_effect = [mock_product1, mock_product2]
+        mock_product_repository.reserve_stock.return_value = {
+            1: mock_product1,
+            2: mock_product2,
+        }
         mock_order_repository.create.return_value = mock_order
         order_data = OrderCreate(
             user_id=1,
@@ -121,18 +129,16 @@ class TestOrderService:
         assert result.total_price == 250.0
         assert len(result.items) == 2
 
-        assert mock_product_repository.get_by_id.call_count == 2
-        mock_product_repository.get_by_id.assert_any_call(mock_session, 1)
-        mock_product_repository.get_by_id.assert_any_call(mock_session, 2)
+        mock_product_repository.reserve_stock.assert_called_once_with(
+            mock_session, {1: 2, 2: 1}
+        )
+        mock_product_repository.get_by_id.assert_not_called()
 
         mock_order_repository.create.assert_called_once()
         call_args = mock_order_repository.create.call_args
         assert call_args[0][1] == order_data
         assert call_args[0][2] == 250.0
-
-        assert mock_product1.stock_quantity == 8
-        assert mock_product2.stock_quantity == 4
-        assert mock_session.add.call_count == 2
+        assert call_args.kwargs["products"] == {1: mock_product1, 2: mock_product2}
 
         mock_session.commit.assert_called_once()
 
@@ -169,7 +175,8 @@ class TestOrderService:
             return result_mock
 
         mock_session.execute = AsyncMock(side_effect=mock_execute)
-        mock_product_repository.get_by_id.return_value = mock_product
+        mock_product_repository.reserve_stock.return_value = {}
+        mock_product_repository.get_many.return_value = {1: mock_product}
 
         order_data = OrderCreate(
             user_id=1,
@@ -185,6 +192,7 @@ class TestOrderService:
 
         mock_order_repository.create.assert_not_called()
         mock_session.commit.assert_not_called()
+        mock_session.rollback.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_create_order_invalid_product(
@@ -213,7 +221,8 @@ class TestOrderService:
             return result_mock
 
         mock_session.execute = AsyncMock(side_effect=mock_execute)
-        mock_product_repository.get_by_id.return_value = None
+        mock_product_repository.reserve_stock.return_value = {}
+        mock_product_repository.get_many.return_value = {}
 
         order_data = OrderCreate(
             user_id=1,
@@ -376,11 +385,11 @@ class TestOrderService:
             return result_mock
 
         mock_session.execute = AsyncMock(side_effect=mock_execute)
-        mock_product_repository.get_by_id.side_effect = [
-            mock_product1,
-            mock_product2,
-            mock_product3,
-        ]
+        mock_product_repository.reserve_stock.return_value = {
+            1: mock_product1,
+            2: mock_product2,
+            3: mock_product3,
+        }
         mock_order_repository.create.return_value = mock_order
 
         order_data = OrderCreate(
@@ -455,12 +464,14 @@ class TestOrderService:
         """Тест обновления несуществующего заказа."""
         update_data = OrderUpdate(status="completed")
 
-        mock_order_repository.get_by_id.return_value = None
+        mock_order_repository.update.side_effect = ValueError(
+            "Order with ID 999 not found"
+        )
 
         with pytest.raises(ValueError, match="Order with ID 999 not found"):
             await order_service.update(mock_session, 999, update_data)
 
-        mock_order_repository.update.assert_not_called()
+        mock_session.commit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_delete_order_success(
@@ -477,3 +488,162 @@ class TestOrderService:
         mock_order_repository.delete.assert_called_once_with(mock_session, 1)
         mock_session.commit.assert_called_once()
 
+
+
+class TestOrderServiceQueryCount:
+    """Регрессионные тесты количества SQL-запросов при создании заказа."""
+
+    @pytest.fixture
+    async def order_setup(
+        self, controller_session, user_repository, product_repository
+    ):
+        """Создает пользователя, адрес и 50 продуктов."""
+        from app.schemas.product_schema import ProductCreate
+        from app.schemas.user_schema import UserCreate
+
+        user = await user_repository.create(
+            controller_session, UserCreate(email="qc@example.com", username="qc_user")
+        )
+        address = Address(
+            user_id=user.id,
+            street="1 Query St",
+            city="City",
+            state="State",
+            zip_code="00000",
+            country="Country",
+        )
+        controller_session.add(address)
+        products = []
+        for i in range(50):
+            products.append(
+                await product_repository.create(
+                    controller_session,
+                    ProductCreate(name=f"QC {i}", price=1.0 + i, stock_quantity=100),
+                )
+            )
+        await controller_session.commit()
+        return user, address, products
+
+    async def _count_create_queries(
+        self, session, query_counter, order_service, user, address, products
+    ) -> int:
+        order_data = OrderCreate(
+            user_id=user.id,
+            delivery_address_id=address.id,
+            items=[
+                OrderItemCreate(product_id=product.id, quantity=1)
+                for product in products
+            ],
+        )
+        query_counter.reset()
+        await order_service.create(session, order_data)
+        return query_counter.count
+
+    @pytest.mark.asyncio
+    async def test_create_order_query_count_is_constant(
+        self,
+        controller_session,
+        query_counter,
+        order_setup,
+        order_repository,
+        product_repository,
+    ):
+        """Тест: число запросов не зависит от количества позиций заказа."""
+        user, address, products = order_setup
+        order_service = OrderService(order_repository, product_repository)
+
+        single_item = await self._count_create_queries(
+            controller_session,
+            query_counter,
+            order_service,
+            user,
+            address,
+            products[:1],
+        )
+        fifty_items = await self._count_create_queries(
+            controller_session, query_counter, order_service, user, address, products
+        )
+
+        assert fifty_items == single_item
+        product_queries = [
+            statement
+            for statement in query_counter.statements
+            if "products" in statement and "order_items" not in statement
+        ]
+        assert len(product_queries) == 1
+        assert product_queries[0].lstrip().upper().startswith("UPDATE")
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_POSTGRES_URL"),
+    reason="Нагрузочный тест требует PostgreSQL (переменная TEST_POSTGRES_URL)",
+)
+class TestStockReservationConcurrency:
+    """Нагрузочный тест конкурентного резервирования товара (PostgreSQL)."""
+
+    STOCK = 100
+    PARALLEL_ORDERS = 500
+
+    @pytest.fixture
+    async def pg_session_factory(self):
+        """Создает фабрику сессий для PostgreSQL из TEST_POSTGRES_URL."""
+        pg_engine = create_async_engine(
+            os.environ["TEST_POSTGRES_URL"], pool_size=50, max_overflow=50
+        )
+        async with pg_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+        await pg_engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_no_oversell_under_parallel_orders(self, pg_session_factory):
+        """Тест: 500 параллельных заказов не уводят остаток в минус."""
+        async with pg_session_factory() as session:
+            user = User(username=f"stress_{uuid4().hex}", email=f"{uuid4().hex}@ex.com")
+            session.add(user)
+            await session.flush()
+            address = Address(
+                user_id=user.id,
+                street="1 Stress St",
+                city="City",
+                state="State",
+                zip_code="00000",
+                country="Country",
+            )
+            product = Product(name="Hot product", price=10.0, stock_quantity=self.STOCK)
+            session.add_all([address, product])
+            await session.commit()
+            user_id, address_id, product_id = user.id, address.id, product.id
+
+        order_data = OrderCreate(
+            user_id=user_id,
+            delivery_address_id=address_id,
+            items=[OrderItemCreate(product_id=product_id, quantity=1)],
+        )
+
+        async def place_order() -> bool:
+            service = OrderService(OrderRepository(), ProductRepository())
+            async with pg_session_factory() as session:
+                try:
+                    await service.create(session, order_data)
+                    return True
+                except ValueError:
+                    return False
+
+        results = await asyncio.gather(
+            *(place_order() for _ in range(self.PARALLEL_ORDERS))
+        )
+
+        async with pg_session_factory() as session:
+            stock = await session.scalar(
+                select(Product.stock_quantity).where(Product.id == product_id)
+            )
+            sold = await session.scalar(
+                select(func.coalesce(func.sum(OrderItem.quantity), 0)).where(
+                    OrderItem.product_id == product_id
+                )
+            )
+
+        assert sum(results) == self.STOCK
+        assert stock == 0
+        assert sold == self.STOCK
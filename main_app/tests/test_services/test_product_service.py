@@ -1,8 +1,19 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+
 import pytest
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.codec import decode, encode
+from app.cache.settings import CacheSettings
 from app.models import Product
+from app.pagination import TotalMode, encode_cursor
+from app.read_models import ProductView
 from app.services.product_service import ProductService
 from app.repositories.product_repository import ProductRepository
 from app.schemas.product_schema import ProductCreate, ProductUpdate
@@ -47,6 +58,451 @@ class TestProductService:
         assert result.name == "Test Product"
         mock_product_repository.get_by_id.assert_called_once_with(mock_session, 1)
 
+    @pytest.fixture
+    def mock_redis(self):
+        """Создает мок клиента Redis с MGET и конвейером."""
+        client = AsyncMock(spec=aioredis.Redis)
+        client.mget = AsyncMock(return_value=[])
+        client.publish = AsyncMock(return_value=0)
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.execute = AsyncMock(return_value=[])
+        client.pipeline = Mock(return_value=pipe)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_get_many_fills_misses_from_one_query(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест get_many: попадания из MGET, промахи одним запросом к БД."""
+        created_at = datetime(2025, 1, 1, 12, 0)
+        mock_redis.mget.return_value = [
+            encode(
+                {
+                    "id": 1,
+                    "name": "Cached",
+                    "description": None,
+                    "price": 10.0,
+                    "stock_quantity": 3,
+                    "created_at": created_at.isoformat(),
+                    "updated_at": None,
+                }
+            ),
+            None,
+            None,
+        ]
+        mock_product_repository.get_many.return_value = {
+            2: Product(
+                id=2,
+                name="Loaded",
+                price=20.0,
+                stock_quantity=5,
+                created_at=created_at,
+            )
+        }
+        service = ProductService(mock_product_repository, mock_redis)
+
+        result = await service.get_many(mock_session, [1, 2, 3])
+
+        assert set(result) == {1, 2}
+        assert result[1].name == "Cached"
+        assert result[1].created_at == created_at
+        assert result[2].name == "Loaded"
+        mock_redis.mget.assert_awaited_once_with(["product:1", "product:2", "product:3"])
+        mock_product_repository.get_many.assert_awaited_once_with(mock_session, {2, 3})
+        pipe = mock_redis.pipeline.return_value
+        pipe.setex.assert_called_once()
+        assert pipe.setex.call_args.args[0] == "product:2"
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_many_all_cached_skips_db(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест get_many: при полном попадании в кэш БД не запрашивается."""
+        mock_redis.mget.return_value = [
+            encode(
+                {
+                    "id": 1,
+                    "name": "Cached",
+                    "price": 10.0,
+                    "stock_quantity": 3,
+                    "created_at": "2025-01-01T12:00:00",
+                }
+            )
+        ]
+        service = ProductService(mock_product_repository, mock_redis)
+
+        result = await service.get_many(mock_session, [1, 1])
+
+        assert list(result) == [1]
+        mock_product_repository.get_many.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_many_without_redis(
+        self, product_service: ProductService, mock_session, mock_product_repository
+    ):
+        """Тест get_many без Redis: один запрос к репозиторию."""
+        mock_product_repository.get_many.return_value = {}
+
+        result = await product_service.get_many(mock_session, [5, 6])
+
+        assert result == {}
+        mock_product_repository.get_many.assert_awaited_once_with(mock_session, {5, 6})
+
+    @pytest.mark.asyncio
+    async def test_get_page_cache_hit_skips_db(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест get_page: страница из кэша списков, БД не запрашивается."""
+        mock_redis.get = AsyncMock(
+            side_effect=[
+                "2",
+                encode(
+                    {
+                        "items": [
+                            {
+                                "id": 1,
+                                "name": "Cached",
+                                "price": 10.0,
+                                "stock_quantity": 3,
+                                "created_at": "2025-01-01T12:00:00",
+                            }
+                        ],
+                        "total": 1,
+                        "next_cursor": None,
+                    }
+                ),
+            ]
+        )
+        service = ProductService(mock_product_repository, mock_redis)
+
+        items, total, next_cursor = await service.get_page(
+            mock_session, 10, 1, name="cach"
+        )
+
+        assert [item.name for item in items] == ["Cached"]
+        assert (total, next_cursor) == (1, None)
+        mock_product_repository.get_by_filter_with_total.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_page_cache_miss_stores_page(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест get_page: промах читается из БД и сохраняется под текущей версией."""
+        mock_redis.get = AsyncMock(side_effect=["2", None])
+        mock_redis.setex = AsyncMock(return_value=True)
+        product = Product(
+            id=1,
+            name="Loaded",
+            price=20.0,
+            stock_quantity=5,
+            created_at=datetime(2025, 1, 1, 12, 0),
+        )
+        mock_product_repository.get_by_filter_with_total.return_value = ([product], 3)
+        service = ProductService(mock_product_repository, mock_redis)
+
+        items, total, next_cursor = await service.get_page(mock_session, 1, 1)
+
+        assert items == [product]
+        assert total == 3
+        assert next_cursor is not None
+        key, ttl, json_data = mock_redis.setex.await_args.args
+        assert key.startswith("products:list:v2:")
+        assert decode(json_data)["items"][0]["name"] == "Loaded"
+
+    @pytest.mark.asyncio
+    async def test_get_page_cursor_skips_count_by_default(
+        self, mock_session, mock_product_repository
+    ):
+        """Тест get_page: страница по курсору не выполняет COUNT, если total не запрошен."""
+        mock_product_repository.get_by_cursor.return_value = []
+        mock_product_repository.count.return_value = 7
+        service = ProductService(mock_product_repository)
+        cursor = encode_cursor(datetime(2025, 1, 1), 5)
+
+        _, total, _ = await service.get_page(mock_session, 10, cursor=cursor)
+        assert total is None
+        mock_product_repository.count.assert_not_awaited()
+
+        _, total, _ = await service.get_page(
+            mock_session, 10, cursor=cursor, total_mode=TotalMode.EXACT
+        )
+        assert total == 7
+
+    @pytest.mark.asyncio
+    async def test_mutation_invalidates_list_cache(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест инвалидации кэша списков при создании и удалении продукта."""
+        mock_redis.incr = AsyncMock(return_value=1)
+        mock_redis.delete = AsyncMock(return_value=1)
+        service = ProductService(mock_product_repository, mock_redis)
+
+        await service.create(
+            mock_session, ProductCreate(name="New", price=1.0, stock_quantity=1)
+        )
+        await service.delete(mock_session, 1)
+
+        assert mock_redis.incr.await_count == 2
+        mock_redis.incr.assert_awaited_with("products:list:version")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stampede_lock", [False, True])
+    async def test_get_by_id_thundering_herd_single_query(
+        self, mock_session, mock_product_repository, mock_redis, stampede_lock
+    ):
+        """Нагрузочный тест: 500 одновременных промахов по ключу дают один запрос к БД."""
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.setex = AsyncMock(return_value=True)
+        mock_redis.set = AsyncMock(return_value=True)
+        mock_redis.eval = AsyncMock(return_value=1)
+
+        async def slow_get_by_id(session, product_id):
+            await asyncio.sleep(0.05)
+            return Product(
+                id=product_id,
+                name="Hot",
+                price=1.0,
+                stock_quantity=1,
+                created_at=datetime(2025, 1, 1),
+            )
+
+        mock_product_repository.get_by_id.side_effect = slow_get_by_id
+        service = ProductService(
+            mock_product_repository,
+            mock_redis,
+            CacheSettings(stampede_lock=stampede_lock),
+        )
+
+        results = await asyncio.gather(
+            *(service.get_by_id(mock_session, 7) for _ in range(500))
+        )
+
+        assert all(result.id == 7 and result.name == "Hot" for result in results)
+        mock_product_repository.get_by_id.assert_awaited_once()
+        mock_redis.setex.assert_awaited_once()
+        assert mock_redis.set.await_count == (1 if stampede_lock else 0)
+
+    @pytest.mark.asyncio
+    async def test_get_by_id_survives_cancelled_first_caller(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест: отмена первого запроса не прерывает общую загрузку для остальных."""
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.setex = AsyncMock(return_value=True)
+        open_sessions = []
+        started, release = asyncio.Event(), asyncio.Event()
+
+        @asynccontextmanager
+        async def session_factory():
+            loader_session = AsyncMock(spec=AsyncSession)
+            open_sessions.append(loader_session)
+            try:
+                yield loader_session
+            finally:
+                open_sessions.remove(loader_session)
+
+        async def blocking_get_by_id(session, product_id):
+            started.set()
+            await release.wait()
+            # Загрузка идет в собственной сессии, открытой до конца запроса
+            assert session is not mock_session
+            assert session in open_sessions
+            return Product(
+                id=product_id,
+                name="Hot",
+                price=1.0,
+                stock_quantity=1,
+                created_at=datetime(2025, 1, 1),
+            )
+
+        mock_product_repository.get_by_id.side_effect = blocking_get_by_id
+        service = ProductService(
+            mock_product_repository, mock_redis, session_factory=session_factory
+        )
+
+        first = asyncio.create_task(service.get_by_id(mock_session, 7))
+        await started.wait()
+        second = asyncio.create_task(service.get_by_id(mock_session, 7))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+
+        assert (await second).name == "Hot"
+        mock_product_repository.get_by_id.assert_awaited_once()
+        assert open_sessions == []
+
+    @pytest.mark.asyncio
+    async def test_get_by_id_not_found_with_redis(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест get_by_id с Redis: отсутствующий продукт не кэшируется."""
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.setex = AsyncMock(return_value=True)
+        mock_product_repository.get_by_id.return_value = None
+        service = ProductService(mock_product_repository, mock_redis)
+
+        assert await service.get_by_id(mock_session, 404) is None
+        mock_redis.setex.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_orm_construction(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест попадания в кэш: ProductView вместо ORM-объекта, JSON без разбора."""
+        raw = encode(
+            {
+                "id": 3,
+                "name": "Cached",
+                "description": None,
+                "price": 10.0,
+                "stock_quantity": 3,
+                "created_at": datetime(2025, 1, 1, 12, 0),
+                "updated_at": None,
+            }
+        )
+        mock_redis.get = AsyncMock(return_value=raw)
+        service = ProductService(mock_product_repository, mock_redis)
+
+        product = await service.get_by_id(mock_session, 3)
+        body = await service.get_json_by_id(mock_session, 3)
+
+        assert isinstance(product, ProductView)
+        assert product.created_at == datetime(2025, 1, 1, 12, 0)
+        assert body == raw[1:]
+        mock_product_repository.get_by_id.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_json_by_id_miss_and_without_redis(
+        self, product_service, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест get_json_by_id: промах загружается из БД, отсутствие дает None."""
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.setex = AsyncMock(return_value=True)
+        mock_product_repository.get_by_id.return_value = Product(
+            id=4,
+            name="Loaded",
+            price=20.0,
+            stock_quantity=5,
+            created_at=datetime(2025, 1, 1, 12, 0),
+        )
+        service = ProductService(mock_product_repository, mock_redis)
+
+        body = await service.get_json_by_id(mock_session, 4)
+        plain_body = await product_service.get_json_by_id(mock_session, 4)
+
+        assert json.loads(body)["created_at"] == "2025-01-01T12:00:00"
+        assert json.loads(plain_body) == json.loads(body)
+        mock_redis.setex.assert_awaited_once()
+
+        mock_product_repository.get_by_id.return_value = None
+        assert await product_service.get_json_by_id(mock_session, 404) is None
+
+    @pytest.mark.asyncio
+    async def test_warm_up_cache_pipelines_top_products(
+        self, product_service, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест прогрева: отсутствующие ключи заполняются одним конвейером SET NX."""
+        mock_product_repository.get_most_ordered.return_value = [
+            Product(
+                id=product_id,
+                name=f"Top {product_id}",
+                price=1.0,
+                stock_quantity=1,
+                created_at=datetime(2025, 1, 1),
+            )
+            for product_id in (3, 1)
+        ]
+        service = ProductService(mock_product_repository, mock_redis)
+
+        count = await service.warm_up_cache(mock_session, 2)
+
+        assert count == 2
+        mock_product_repository.get_most_ordered.assert_awaited_once_with(
+            mock_session, 2
+        )
+        pipe = mock_redis.pipeline.return_value
+        assert [call.args[0] for call in pipe.set.call_args_list] == [
+            "product:3",
+            "product:1",
+        ]
+        assert pipe.set.call_args.kwargs == {"ex": 600, "nx": True}
+        pipe.setex.assert_not_called()
+        pipe.execute.assert_awaited_once()
+        assert await product_service.warm_up_cache(mock_session, 2) == 0
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_upsert_invalidates_cache(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест загрузки с upsert: ключи продуктов удаляются одним конвейером."""
+        mock_redis.incr = AsyncMock(return_value=1)
+        mock_product_repository.bulk_create.return_value = [
+            Product(id=product_id, name=f"Bulk {product_id}", price=1.0)
+            for product_id in (4, 5)
+        ]
+        products_data = [
+            ProductCreate(name="Bulk 4", sku="SKU-4", price=1.0, stock_quantity=1),
+            ProductCreate(name="Bulk 5", sku="SKU-5", price=1.0, stock_quantity=1),
+        ]
+        service = ProductService(mock_product_repository, mock_redis)
+
+        products = await service.bulk_create(mock_session, products_data, upsert=True)
+
+        assert len(products) == 2
+        mock_product_repository.bulk_create.assert_awaited_once_with(
+            mock_session, products_data, True
+        )
+        mock_session.commit.assert_awaited_once()
+        pipe = mock_redis.pipeline.return_value
+        assert sorted(call.args[0] for call in pipe.delete.call_args_list) == [
+            "product:4",
+            "product:5",
+        ]
+        mock_redis.setex.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_invalid_data(
+        self, product_service: ProductService, mock_session, mock_product_repository
+    ):
+        """Тест загрузки: невалидный продукт отклоняет весь массив."""
+        products_data = [
+            ProductCreate(name="Ok", price=1.0, stock_quantity=1),
+            ProductCreate.model_construct(name="Bad", price=0.0, stock_quantity=1),
+        ]
+
+        with pytest.raises(ValueError, match="Price must be greater than 0"):
+            await product_service.bulk_create(mock_session, products_data)
+
+        mock_product_repository.bulk_create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_populates_cache(
+        self, mock_session, mock_product_repository, mock_redis
+    ):
+        """Тест write-through: созданная продукция сразу доступна в кэше."""
+        mock_redis.incr = AsyncMock(return_value=1)
+        mock_redis.setex = AsyncMock(return_value=True)
+        mock_product_repository.create.return_value = Product(
+            id=8,
+            name="Fresh",
+            price=5.0,
+            stock_quantity=1,
+            created_at=datetime(2025, 1, 1, 12, 0),
+        )
+        service = ProductService(mock_product_repository, mock_redis)
+
+        await service.create(
+            mock_session, ProductCreate(name="Fresh", price=5.0, stock_quantity=1)
+        )
+
+        key, ttl, payload = mock_redis.setex.await_args.args
+        assert (key, ttl) == ("product:8", 600)
+        assert decode(payload)["name"] == "Fresh"
+
     @pytest.mark.asyncio
     async def test_create_product_success(
         self, product_service: ProductService, mock_session, mock_product_repository
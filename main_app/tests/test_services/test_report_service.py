@@ -1,12 +1,11 @@
 """Тесты для сервиса отчетов."""
 
 import pytest
-from datetime import date
+from datetime import date, datetime
 from unittest.mock import AsyncMock, Mock
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Order, OrderItem
-from app.services.report_service import ReportService
+from app.services.report_service import WATERMARK_OVERLAP, ReportService
 from app.repositories.order_repository import OrderRepository
 from app.repositories.report_repository import ReportRepository
 
@@ -45,30 +44,9 @@ class TestReportService:
         mock_order_repository,
         mock_report_repository,
     ):
-        """Тест успешного формирования отчета."""
+        """Тест успешного формирования отчета одним запросом в репозиторий."""
         report_date = date(2024, 1, 15)
 
-        # Создаем моки заказов с элементами
-        mock_item1 = Mock(spec=OrderItem)
-        mock_item1.quantity = 2
-
-        mock_item2 = Mock(spec=OrderItem)
-        mock_item2.quantity = 3
-
-        mock_order1 = Mock(spec=Order)
-        mock_order1.id = 1
-        mock_order1.items = [mock_item1]
-
-        mock_order2 = Mock(spec=Order)
-        mock_order2.id = 2
-        mock_order2.items = [mock_item2]
-
-        # Настраиваем моки
-        mock_order_repository.get_orders_by_date.return_value = [
-            mock_order1,
-            mock_order2,
-        ]
-
         mock_report1 = Mock()
         mock_report1.id = 1
         mock_report1.report_at = report_date
@@ -81,7 +59,10 @@ class TestReportService:
         mock_report2.order_id = 2
         mock_report2.count_product = 3
 
-        mock_report_repository.create_report.side_effect = [mock_report1, mock_report2]
+        mock_report_repository.upsert_reports_for_date.return_value = [
+            mock_report1,
+            mock_report2,
+        ]
 
         # Выполняем тест
         reports = await report_service.generate_report(mock_session, report_date)
@@ -93,13 +74,14 @@ class TestReportService:
         assert reports[1].id == 2
         assert reports[1].count_product == 3
 
-        # Проверяем вызовы
-        mock_order_repository.get_orders_by_date.assert_called_once_with(
-            mock_session, report_date
+        # Проверяем вызовы: заказы не загружаются, отчеты не перечитываются
+        mock_report_repository.upsert_reports_for_date.assert_called_once_with(
+            mock_session, report_date, None
         )
-        assert mock_report_repository.create_report.call_count == 2
+        mock_order_repository.get_orders_by_date.assert_not_called()
+        mock_report_repository.create_report.assert_not_called()
         mock_session.commit.assert_called_once()
-        assert mock_session.refresh.call_count == 2
+        mock_session.refresh.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_generate_report_no_orders(
@@ -112,17 +94,60 @@ class TestReportService:
         """Тест формирования отчета, когда нет заказов."""
         report_date = date(2024, 1, 15)
 
-        mock_order_repository.get_orders_by_date.return_value = []
+        mock_report_repository.upsert_reports_for_date.return_value = []
 
         reports = await report_service.generate_report(mock_session, report_date)
 
         assert len(reports) == 0
-        mock_order_repository.get_orders_by_date.assert_called_once_with(
-            mock_session, report_date
+        mock_report_repository.upsert_reports_for_date.assert_called_once_with(
+            mock_session, report_date, None
         )
-        mock_report_repository.create_report.assert_not_called()
         mock_session.commit.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_generate_report_incremental(
+        self,
+        report_service: ReportService,
+        mock_session,
+        mock_report_repository,
+    ):
+        """Тест инкрементального формирования отчета от сохраненной отметки."""
+        report_date = date(2024, 1, 15)
+        watermark = datetime(2024, 1, 15, 12, 0)
+        mock_report_repository.get_watermark.return_value = watermark
+        mock_report_repository.upsert_reports_for_date.return_value = []
+
+        await report_service.generate_report(
+            mock_session, report_date, incremental=True
+        )
+
+        mock_report_repository.upsert_reports_for_date.assert_called_once_with(
+            mock_session, report_date, watermark - WATERMARK_OVERLAP
+        )
+        mock_report_repository.set_watermark.assert_called_once()
+        assert mock_report_repository.set_watermark.call_args.args[2] > watermark
+        mock_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_generate_report_incremental_without_watermark(
+        self,
+        report_service: ReportService,
+        mock_session,
+        mock_report_repository,
+    ):
+        """Тест первого инкрементального запуска: полный пересчет за дату."""
+        report_date = date(2024, 1, 15)
+        mock_report_repository.get_watermark.return_value = None
+        mock_report_repository.upsert_reports_for_date.return_value = []
+
+        await report_service.generate_report(
+            mock_session, report_date, incremental=True
+        )
+
+        mock_report_repository.upsert_reports_for_date.assert_called_once_with(
+            mock_session, report_date, None
+        )
+
     @pytest.mark.asyncio
     async def test_get_report_by_date(
         self,
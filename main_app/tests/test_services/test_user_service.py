@@ -1,8 +1,19 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+
 import pytest
 from unittest.mock import AsyncMock, Mock
+
+import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.codec import decode, encode
+from app.cache.settings import CacheSettings, WritePolicy
+from app.cache.write_policy import wait_for_pending_writes
 from app.models import User
+from app.read_models import UserView
 from app.services.user_service import UserService
 from app.repositories.user_repository import UserRepository
 from app.schemas.user_schema import UserCreate, UserUpdate
@@ -279,3 +290,162 @@ class TestUserService:
         assert result == 5
         mock_user_repository.count.assert_called_once_with(mock_session, username="test")
 
+    @pytest.mark.asyncio
+    async def test_user_mutations_invalidate_list_cache(
+        self, mock_session, mock_user_repository
+    ):
+        """Тест инвалидации кэша списков пользователей при изменениях."""
+        mock_redis = AsyncMock(spec=aioredis.Redis)
+        mock_redis.incr = AsyncMock(return_value=1)
+        mock_redis.delete = AsyncMock(return_value=1)
+        mock_redis.publish = AsyncMock(return_value=0)
+        mock_session.execute = AsyncMock(
+            return_value=Mock(scalar_one_or_none=Mock(return_value=None))
+        )
+        service = UserService(mock_user_repository, mock_redis)
+
+        await service.create(
+            mock_session, UserCreate(email="new@example.com", username="new_user")
+        )
+        await service.delete(mock_session, 1)
+
+        assert mock_redis.incr.await_count == 2
+        mock_redis.incr.assert_awaited_with("users:list:version")
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_returns_user_view(self, mock_session, mock_user_repository):
+        """Тест попадания в кэш: UserView вместо ORM-объекта, JSON без разбора."""
+        cached = {
+            "id": 5,
+            "username": "cached",
+            "email": "cached@example.com",
+            "description": None,
+            "created_at": datetime(2025, 1, 1, 12, 0),
+            "updated_at": None,
+        }
+        mock_redis = AsyncMock(spec=aioredis.Redis)
+        mock_redis.get = AsyncMock(return_value=encode(cached))
+        service = UserService(mock_user_repository, mock_redis)
+
+        user = await service.get_by_id(mock_session, 5)
+        body = await service.get_json_by_id(mock_session, 5)
+
+        assert isinstance(user, UserView)
+        assert user.username == "cached"
+        assert json.loads(body)["created_at"] == "2025-01-01T12:00:00"
+        mock_user_repository.get_by_id.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_by_id_survives_cancelled_first_caller(
+        self, mock_session, mock_user_repository
+    ):
+        """Тест: отмена первого запроса не прерывает общую загрузку для остальных."""
+        mock_redis = AsyncMock(spec=aioredis.Redis)
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.setex = AsyncMock(return_value=True)
+        open_sessions = []
+        started, release = asyncio.Event(), asyncio.Event()
+
+        @asynccontextmanager
+        async def session_factory():
+            loader_session = AsyncMock(spec=AsyncSession)
+            open_sessions.append(loader_session)
+            try:
+                yield loader_session
+            finally:
+                open_sessions.remove(loader_session)
+
+        async def blocking_get_by_id(session, user_id):
+            started.set()
+            await release.wait()
+            # Загрузка идет в собственной сессии, открытой до конца запроса
+            assert session is not mock_session
+            assert session in open_sessions
+            return User(
+                id=user_id,
+                username="hot",
+                email="hot@example.com",
+                created_at=datetime(2025, 1, 1),
+            )
+
+        mock_user_repository.get_by_id.side_effect = blocking_get_by_id
+        service = UserService(
+            mock_user_repository, mock_redis, session_factory=session_factory
+        )
+
+        first = asyncio.create_task(service.get_json_by_id(mock_session, 5))
+        await started.wait()
+        second = asyncio.create_task(service.get_by_id(mock_session, 5))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+
+        assert (await second).username == "hot"
+        mock_user_repository.get_by_id.assert_awaited_once()
+        assert open_sessions == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "policy", [WritePolicy.WRITE_THROUGH, WritePolicy.WRITE_BEHIND]
+    )
+    async def test_create_and_update_write_to_cache(
+        self, mock_session, mock_user_repository, policy
+    ):
+        """Тест write-through/write-behind: созданный и измененный пользователь в кэше."""
+        user = User(
+            id=7,
+            username="fresh",
+            email="fresh@example.com",
+            created_at=datetime(2025, 1, 1, 12, 0),
+        )
+        mock_user_repository.create.return_value = user
+        mock_user_repository.get_by_id.return_value = user
+        mock_user_repository.update.return_value = user
+        mock_session.execute = AsyncMock(
+            return_value=Mock(scalar_one_or_none=Mock(return_value=None))
+        )
+        mock_redis = AsyncMock(spec=aioredis.Redis)
+        mock_redis.incr = AsyncMock(return_value=1)
+        mock_redis.setex = AsyncMock(return_value=True)
+        mock_redis.delete = AsyncMock(return_value=1)
+        service = UserService(
+            mock_user_repository, mock_redis, CacheSettings(user_write_policy=policy)
+        )
+
+        await service.create(
+            mock_session, UserCreate(email="fresh@example.com", username="fresh")
+        )
+        await service.update(mock_session, 7, UserUpdate(description="updated"))
+        await wait_for_pending_writes()
+
+        assert mock_redis.setex.await_count == 2
+        key, ttl, payload = mock_redis.setex.await_args.args
+        assert (key, ttl) == ("user:7", 3600)
+        assert decode(payload)["username"] == "fresh"
+        mock_redis.delete.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_update_with_invalidate_policy_deletes_key(
+        self, mock_session, mock_user_repository
+    ):
+        """Тест политики invalidate: изменение удаляет ключ пользователя."""
+        user = Mock(spec=User)
+        user.id = 7
+        mock_user_repository.get_by_id.return_value = user
+        mock_user_repository.update.return_value = user
+        mock_redis = AsyncMock(spec=aioredis.Redis)
+        mock_redis.incr = AsyncMock(return_value=1)
+        mock_redis.setex = AsyncMock(return_value=True)
+        mock_redis.delete = AsyncMock(return_value=1)
+        service = UserService(
+            mock_user_repository,
+            mock_redis,
+            CacheSettings(user_write_policy=WritePolicy.INVALIDATE),
+        )
+
+        await service.update(mock_session, 7, UserUpdate(description="updated"))
+
+        mock_redis.delete.assert_awaited_once_with("user:7")
+        mock_redis.setex.assert_not_awaited()
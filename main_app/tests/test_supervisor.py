@@ -0,0 +1,135 @@
+import signal
+import time
+
+import pytest
+
+from app.supervisor import Supervisor, SupervisorSettings
+
+
+def draining_worker(ready):
+    """Процесс worker: сигнализирует о готовности и завершается по SIGTERM."""
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    ready.set()
+    while not stopping:
+        time.sleep(0.01)
+
+
+def stuck_worker(ready):
+    """Процесс worker, не реагирующий на SIGTERM."""
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    ready.set()
+    while True:
+        time.sleep(0.01)
+
+
+def failing_worker(ready):
+    """Процесс worker, завершающийся до подключения к брокеру."""
+    raise SystemExit(1)
+
+
+@pytest.fixture
+def make_supervisor():
+    """Фабрика супервизоров; процессы останавливаются после теста."""
+    supervisors = []
+
+    def make(target, **settings):
+        supervisor = Supervisor(
+            target,
+            SupervisorSettings(
+                **{"workers": 2, "stop_timeout_ms": 5000, "restart_delay_ms": 0}
+                | settings
+            ),
+        )
+        supervisors.append(supervisor)
+        return supervisor
+
+    yield make
+    for supervisor in supervisors:
+        supervisor.stop()
+
+
+def wait_ready(supervisor):
+    for worker in supervisor.workers:
+        assert worker.ready.wait(10)
+
+
+class TestSupervisor:
+    """Тесты супервизора процессов RabbitMQ worker."""
+
+    def test_stop_drains_workers(self, make_supervisor):
+        """Тест: процессы завершаются сами после SIGTERM."""
+        supervisor = make_supervisor(draining_worker)
+        supervisor.start()
+        wait_ready(supervisor)
+        processes = [worker.process for worker in supervisor.workers]
+
+        supervisor.stop()
+
+        assert [process.exitcode for process in processes] == [0, 0]
+        assert supervisor.workers == []
+
+    def test_stop_kills_stuck_worker(self, make_supervisor):
+        """Тест: процесс, не завершившийся за таймаут, останавливается SIGKILL."""
+        supervisor = make_supervisor(stuck_worker, workers=1, stop_timeout_ms=200)
+        supervisor.start()
+        wait_ready(supervisor)
+        process = supervisor.workers[0].process
+
+        supervisor.stop()
+
+        assert process.exitcode == -signal.SIGKILL
+
+    def test_rolling_restart_replaces_every_worker(self, make_supervisor):
+        """Тест: каждый процесс заменяется, старые завершаются после SIGTERM."""
+        supervisor = make_supervisor(draining_worker)
+        supervisor.start()
+        wait_ready(supervisor)
+        old = [worker.process for worker in supervisor.workers]
+
+        assert supervisor.rolling_restart()
+
+        assert [process.exitcode for process in old] == [0, 0]
+        assert all(worker.process.is_alive() for worker in supervisor.workers)
+        assert not {worker.process.pid for worker in supervisor.workers} & {
+            process.pid for process in old
+        }
+
+    def test_rolling_restart_aborts_when_replacement_fails(self, make_supervisor):
+        """Тест: если замена не запустилась, работающие процессы не останавливаются."""
+        supervisor = make_supervisor(draining_worker, workers=1)
+        supervisor.start()
+        wait_ready(supervisor)
+        old = supervisor.workers[0].process
+        supervisor.target = failing_worker
+
+        assert not supervisor.rolling_restart()
+
+        assert supervisor.workers[0].process is old
+        assert old.is_alive()
+
+    def test_exited_worker_is_replaced(self, make_supervisor):
+        """Тест: неожиданно завершившийся процесс перезапускается."""
+        supervisor = make_supervisor(draining_worker)
+        supervisor.start()
+        wait_ready(supervisor)
+        crashed = supervisor.workers[0].process
+        crashed.kill()
+        crashed.join()
+
+        supervisor.replace_exited()
+
+        assert supervisor.workers[0].process is not crashed
+        assert supervisor.workers[0].ready.wait(10)
+        assert supervisor.workers[1].process.is_alive()
+
+    def test_settings_from_env(self, monkeypatch):
+        """Тест: количество процессов по умолчанию равно числу ядер."""
+        monkeypatch.delenv("RABBITMQ_WORKERS", raising=False)
+        monkeypatch.setattr("os.cpu_count", lambda: 6)
+        assert SupervisorSettings.from_env().workers == 6
+
+        monkeypatch.setenv("RABBITMQ_WORKERS", "3")
+        monkeypatch.setenv("RABBITMQ_WORKER_STOP_TIMEOUT_MS", "1500")
+        settings = SupervisorSettings.from_env()
+        assert (settings.workers, settings.stop_timeout_ms) == (3, 1500)